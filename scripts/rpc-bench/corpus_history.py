@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
+# SPDX-License-Identifier: LGPL-3.0-only
+
+"""Keep staged corpus results in a local SQLite history and find where a series moved.
+
+A PR comment compares one PR with one master run, so a regression that lands as 0.5% per PR
+never crosses its noise band. `ingest` files every number of a staged tree under (series label,
+commit, image, snapshot block, corpus, rate slot, arch); `report` walks each series in run order,
+splits it at change points (a shift in mean) and tests the stretch since the last one for a
+steady drift. A label keeps runs of different lines apart (master, one PR), so a PR head never
+reads as a step in master's series.
+
+Only staged files are read and only numbers are stored, so the store is as aggregate-only as the
+artifact it came from.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import json
+import math
+import re
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from latency_histogram import LatencyHistogram
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    commit_sha TEXT NOT NULL,
+    image TEXT NOT NULL,
+    head INTEGER NOT NULL,
+    corpus TEXT NOT NULL,
+    slot TEXT NOT NULL,
+    arch TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    label TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (label, commit_sha, image, head, corpus, slot, arch, metric)
+)
+"""
+LABEL_PATTERN = re.compile(r"[A-Za-z0-9._-]+")
+COMMIT_PATTERN = re.compile(r"[0-9a-f]{7,64}")
+IMAGE_PATTERN = re.compile(r"[A-Za-z0-9._/:@-]+")
+# summary.json field -> stored metric; latencies keep the names the PR comment uses.
+SUMMARY_METRICS = (("http_req_duration", "avg", "avg"), ("http_req_duration", "med", "median"),
+                   ("http_req_duration", "p(90)", "p90"), ("http_req_duration", "p(95)", "p95"),
+                   ("http_req_duration", "p(99)", "p99"), ("http_req_duration", "max", "max"),
+                   ("http_reqs", "count", "requests"), ("http_reqs", "rate", "rps"),
+                   ("http_req_failed", "rate", "failure_rate"))
+TIMINGS_PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+# Label-level files have no rate slot; they are filed under these instead.
+PARITY_SLOT = "parity"
+TIMINGS_SLOT = "timings"
+# A split is a change point when the two sides' mean log values differ by this many standard
+# errors. Binary segmentation tries every split, so this is set well above a one-test cut-off.
+CHANGE_POINT_T = 5.0
+MIN_SEGMENT = 3
+# A drift is reported when the slope since the last change point is this many standard errors
+# from zero over at least MIN_TREND_POINTS runs.
+DRIFT_T = 3.0
+MIN_TREND_POINTS = 6
+
+
+class CorpusHistoryError(Exception):
+    """Raised with a content-free message when a tree cannot be ingested or a store read."""
+
+
+def _number(value: Any, label: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(float(value)):
+        raise CorpusHistoryError(f"{label} is not a finite number")
+    return float(value)
+
+
+def _load(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError) as error:
+        raise CorpusHistoryError(f"{path.name}: unreadable ({error.__class__.__name__})") from None
+
+
+def _label_measurements(root: Path, label: str) -> Iterator[tuple[str, str, str, float]]:
+    """(corpus, slot, metric, value) for every staged number of one client label."""
+    for label_dir in sorted(root.glob(f"corpus/*/{label}")):
+        corpus = label_dir.parent.name
+        if not LABEL_PATTERN.fullmatch(corpus):
+            raise CorpusHistoryError("corpus directory name is not a plain label")
+        for cell in sorted(path for path in label_dir.iterdir() if path.is_dir()):
+            if not LABEL_PATTERN.fullmatch(cell.name):
+                continue
+            if (cell / "summary.json").is_file():
+                metrics = _load(cell / "summary.json").get("metrics", {})
+                for group, field, metric in SUMMARY_METRICS:
+                    value = metrics.get(group, {}).get("values", {}).get(field)
+                    yield corpus, cell.name, metric, _number(value, f"{group}.{field}")
+            if (cell / "resources.json").is_file():
+                for key, value in sorted(_load(cell / "resources.json").items()):
+                    if value is not None and LABEL_PATTERN.fullmatch(key):
+                        yield corpus, cell.name, key, _number(value, key)
+        if (label_dir / "parity.json").is_file():
+            report = _load(label_dir / "parity.json")
+            total, matched = _number(report.get("total"), "total"), _number(report.get("matched"), "matched")
+            agree = matched + _number(report.get("both_rpc_errors", 0), "both_rpc_errors")
+            yield from ((corpus, PARITY_SLOT, metric, value) for metric, value in
+                        (("total", total), ("matched", matched), ("diverged", total - agree)))
+        if (label_dir / "timings.meta.json").is_file():
+            meta = _load(label_dir / "timings.meta.json")
+            for key in ("requests", "achieved_rps"):
+                yield corpus, TIMINGS_SLOT, key, _number(meta.get(key), key)
+        if (label_dir / "timings.hist.json").is_file():
+            try:
+                ok = LatencyHistogram.from_json(_load(label_dir / "timings.hist.json")["histograms"]["ok"])
+            except (KeyError, TypeError, ValueError):
+                raise CorpusHistoryError("timings.hist.json has no usable ok histogram") from None
+            if ok.total:
+                yield from ((corpus, TIMINGS_SLOT, name, ok.percentile(share)) for name, share in TIMINGS_PERCENTILES)
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(db_path)
+    connection.execute(SCHEMA)
+    return connection
+
+
+def ingest(stage_root: str, db_path: str, label: str, commit: str, image: str, head: int, arch: str,
+           recorded_at: str | None = None, client: str | None = None) -> int:
+    """File one client's staged numbers under this run's key; a re-ingested run replaces itself.
+
+    client is the staged client label to read (default: label); label is the series they are
+    filed under.
+    """
+    root = Path(stage_root)
+    client = client or label
+    if not root.is_dir():
+        raise CorpusHistoryError("stage root does not exist")
+    if not all(LABEL_PATTERN.fullmatch(name) for name in (label, client, arch)):
+        raise CorpusHistoryError("label, client or arch is not a plain name")
+    if not COMMIT_PATTERN.fullmatch(commit) or not IMAGE_PATTERN.fullmatch(image):
+        raise CorpusHistoryError("commit is not a hex sha or image is not an image reference")
+    recorded_at = recorded_at or datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    rows = [(commit, image, head, corpus, slot, arch, metric, label, recorded_at, value)
+            for corpus, slot, metric, value in _label_measurements(root, client)]
+    if not rows:
+        raise CorpusHistoryError("no staged results for that client")
+    with contextlib.closing(_connect(db_path)) as connection, connection:
+        connection.executemany("INSERT OR REPLACE INTO measurements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    print(f"ingested {len(rows)} measurement(s) for {client} at {commit[:12]} as {label}")
+    return len(rows)
+
+
+def _select(db_path: str, filters: dict[str, str | None]) -> list[sqlite3.Row]:
+    if not Path(db_path).is_file():
+        raise CorpusHistoryError("history store does not exist")
+    clauses = [f"{column} = ?" for column, value in filters.items() if value is not None]
+    with contextlib.closing(_connect(db_path)) as connection:
+        connection.row_factory = sqlite3.Row
+        return connection.execute(
+            "SELECT * FROM measurements" + (" WHERE " + " AND ".join(clauses) if clauses else "")
+            + " ORDER BY corpus, label, slot, arch, head, metric, recorded_at, commit_sha",
+            [value for value in filters.values() if value is not None]).fetchall()
+
+
+def query(db_path: str, out: Any, **filters: str | None) -> None:
+    """Write the matching measurements as CSV, one row per (run, metric), in run order."""
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["recorded_at", "commit", "image", "head", "corpus", "label", "slot", "arch", "metric", "value"])
+    for row in _select(db_path, filters):
+        writer.writerow([row["recorded_at"], row["commit_sha"], row["image"], row["head"], row["corpus"],
+                         row["label"], row["slot"], row["arch"], row["metric"], row["value"]])
+
+
+def _step_t(values: Sequence[float], k: int) -> float:
+    """t statistic of a level shift at k in a fit of values to a line plus that shift.
+
+    Both the values and the step indicator are first reduced to their residuals from a straight
+    line (Frisch-Waugh), so the shift is measured net of any slope: a steady drift has no step in
+    it, while a real step stands out of the line whatever the drift around it.
+    """
+    indicator = _detrended([0.0] * k + [1.0] * (len(values) - k))
+    residual = _detrended(values)
+    scale = sum(d * d for d in indicator)
+    shift = sum(d * y for d, y in zip(indicator, residual)) / scale
+    spread = sum((y - shift * d) ** 2 for d, y in zip(indicator, residual))
+    if spread == 0:
+        return 0.0 if shift == 0 else math.inf
+    return abs(shift) / math.sqrt(spread / (len(values) - 3) / scale)
+
+
+def change_points(values: Sequence[float], threshold: float = CHANGE_POINT_T,
+                  min_segment: int = MIN_SEGMENT) -> list[int]:
+    """Indexes where a new mean level starts, by binary segmentation on the t statistic.
+
+    Each segment is split at its strongest split if that clears the threshold, and both halves
+    are searched again, so a series with several steps reports each of them. A steady drift is
+    no step at all (see _step_t) and is left for drift() to report.
+    """
+    found: list[int] = []
+    pending = [(0, len(values))]
+    while pending:
+        low, high = pending.pop()
+        if high - low < 2 * min_segment:
+            continue
+        segment = values[low:high]
+        t, k = max((_step_t(segment, k), k) for k in range(min_segment, len(segment) - min_segment + 1))
+        if t >= threshold:
+            found.append(low + k)
+            pending += [(low, low + k), (low + k, high)]
+    return sorted(found)
+
+
+def _line(values: Sequence[float]) -> tuple[float, float, float]:
+    """(mean run index, mean value, slope) of a least-squares line through values in run order."""
+    mean_x, mean_y = (len(values) - 1) / 2, sum(values) / len(values)
+    sxx = sum((x - mean_x) ** 2 for x in range(len(values)))
+    return mean_x, mean_y, sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values)) / sxx
+
+
+def _detrended(values: Sequence[float]) -> list[float]:
+    mean_x, mean_y, slope = _line(values)
+    return [y - mean_y - slope * (x - mean_x) for x, y in enumerate(values)]
+
+
+def drift(values: Sequence[float]) -> tuple[float, float]:
+    """(slope per run, t statistic) of a least-squares line through values in run order."""
+    n = len(values)
+    mean_x, _, slope = _line(values)
+    sxx = sum((x - mean_x) ** 2 for x in range(n))
+    residual = sum(y ** 2 for y in _detrended(values))
+    if residual == 0:
+        return slope, 0.0 if slope == 0 else math.copysign(math.inf, slope)
+    return slope, slope / math.sqrt(residual / (n - 2) / sxx)
+
+
+def analyse(db_path: str, threshold: float = CHANGE_POINT_T, drift_t: float = DRIFT_T,
+            **filters: str | None) -> list[dict[str, Any]]:
+    """Change points and drift per series; a series is one metric of one corpus/label/slot/arch/head.
+
+    Both work on log values, so a step or a slope reads as a ratio whatever the metric's scale.
+    A non-positive value (a zero failure rate, say) has no log and leaves its series unanalysed.
+    """
+    series: dict[tuple, list[sqlite3.Row]] = {}
+    for row in _select(db_path, filters):
+        key = (row["corpus"], row["label"], row["slot"], row["arch"], row["head"], row["metric"])
+        series.setdefault(key, []).append(row)
+    findings = []
+    for (corpus, label, slot, arch, head, metric), rows in series.items():
+        if any(row["value"] <= 0 for row in rows):
+            continue
+        logs = [math.log(row["value"]) for row in rows]
+        points = change_points(logs, threshold)
+        steps = [{"commit": rows[i]["commit_sha"], "recorded_at": rows[i]["recorded_at"],
+                  "change_pct": (math.exp(sum(logs[i:j]) / (j - i) - sum(logs[h:i]) / (i - h)) - 1) * 100}
+                 for h, i, j in _bounds(points, len(logs))]
+        # Drift is judged since the last step only: a step alone also tilts a line fitted across it.
+        tail = logs[points[-1] if points else 0:]
+        slope, t = drift(tail) if len(tail) >= MIN_TREND_POINTS else (0.0, 0.0)
+        findings.append({
+            "corpus": corpus, "label": label, "slot": slot, "arch": arch, "head": head, "metric": metric,
+            "runs": len(rows), "latest": rows[-1]["value"], "change_points": steps,
+            "drift_runs": len(tail) if len(tail) >= MIN_TREND_POINTS else 0,
+            "drift_pct_per_run": (math.exp(slope) - 1) * 100, "drift_t": t,
+            "drifting": abs(t) >= drift_t})
+    return findings
+
+
+def _bounds(points: list[int], length: int) -> list[tuple[int, int, int]]:
+    """(previous start, change point, next start) for every change point."""
+    edges = [0, *points, length]
+    return [(edges[i - 1], edges[i], edges[i + 1]) for i in range(1, len(edges) - 1)]
+
+
+def report(findings: list[dict[str, Any]]) -> str:
+    flagged = [f for f in findings if f["change_points"] or f["drifting"]]
+    lines = [f"### Corpus history — {len(findings)} series, {len(flagged)} with a change point or drift", ""]
+    if not flagged:
+        lines.append("No change points and no drift since the last one.")
+        return "\n".join(lines)
+    lines += ["| corpus | label | slot | arch | head | metric | runs | change points | drift since last |",
+              "|---|---|---|---|---|---|---|---|---|"]
+    for f in sorted(flagged, key=lambda f: (f["corpus"], f["label"], f["slot"], f["arch"], f["head"], f["metric"])):
+        steps = ", ".join(f"{step['change_pct']:+.1f}% at {step['commit'][:12]}" for step in f["change_points"]) or "—"
+        trend = (f"{f['drift_pct_per_run']:+.2f}%/run over {f['drift_runs']} runs "
+                 f"({(1 + f['drift_pct_per_run'] / 100) ** (f['drift_runs'] - 1) * 100 - 100:+.1f}%)"
+                 if f["drifting"] else "—")
+        lines.append(f"| {f['corpus']} | {f['label']} | {f['slot']} | {f['arch']} | {f['head']} | {f['metric']} | "
+                     f"{f['runs']} | {steps} | {trend} |")
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="file one client's staged results into the store")
+    ingest_parser.add_argument("stage_root")
+    ingest_parser.add_argument("--db", required=True)
+    ingest_parser.add_argument("--label", required=True, help="series to file the run under (e.g. master, pr-123)")
+    ingest_parser.add_argument("--client", default=None, help="client label whose cells to ingest (default: --label)")
+    ingest_parser.add_argument("--commit", required=True, help="commit the label's image was built from")
+    ingest_parser.add_argument("--image", required=True)
+    ingest_parser.add_argument("--head", type=int, required=True, help="snapshot block the run was pinned to")
+    ingest_parser.add_argument("--arch", required=True)
+    ingest_parser.add_argument("--recorded-at", default=None, help="run time, ISO 8601 UTC (default: now)")
+
+    for name, help_text in (("query", "print matching measurements as CSV"),
+                            ("report", "find change points and drift per series")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--db", required=True)
+        for key in ("corpus", "label", "slot", "arch", "metric"):
+            sub.add_argument(f"--{key}", default=None)
+    report_parser = subparsers.choices["report"]
+    report_parser.add_argument("--threshold", type=float, default=CHANGE_POINT_T,
+                               help="t statistic a split must reach to be a change point")
+    report_parser.add_argument("--drift-t", type=float, default=DRIFT_T,
+                               help="t statistic the slope since the last change point must reach")
+    report_parser.add_argument("--json", default=None, help="also write the findings as JSON")
+
+    arguments = parser.parse_args(argv)
+    try:
+        if arguments.command == "ingest":
+            ingest(arguments.stage_root, arguments.db, arguments.label, arguments.commit, arguments.image,
+                   arguments.head, arguments.arch, arguments.recorded_at, arguments.client)
+            return 0
+        filters = {key: getattr(arguments, key) for key in ("corpus", "label", "slot", "arch", "metric")}
+        if arguments.command == "query":
+            query(arguments.db, sys.stdout, **filters)
+        else:
+            findings = analyse(arguments.db, arguments.threshold, arguments.drift_t, **filters)
+            if arguments.json:
+                Path(arguments.json).write_text(json.dumps(findings, sort_keys=True), encoding="utf-8")
+            print(report(findings))
+    except (CorpusHistoryError, sqlite3.Error) as error:
+        message = error if isinstance(error, CorpusHistoryError) else f"history store error ({error.__class__.__name__})"
+        print(f"error: {message}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,27 +6,41 @@
 
 Privacy contract: request and response contents never appear in output — errors and
 reports carry only record indexes, counts, and category names. The baseline state file
-(response hex strings) is written to VM-local scratch and must not be artifacted.
+(raw response bytes) is written to VM-local scratch and must not be artifacted.
 """
 
 from __future__ import annotations
 
 import argparse
-import concurrent.futures
+import array
+import asyncio
+import binascii
 import csv
+import fcntl
+import functools
 import gzip
-import http.client
+import hashlib
 import json
+import math
+import mmap
+import multiprocessing
+import multiprocessing.connection
 import os
+import re
+import shutil
+import struct
 import sys
-import threading
+import tempfile
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
 import zlib
 from pathlib import Path
-from typing import Sequence
+from typing import Any, Callable, Iterable, Sequence
+
+from corpus_transport import HTTP_SCHEMES, IPC_SCHEME, WS_SCHEMES, Pool, open_pool
+from latency_histogram import SUB_BUCKETS, UNIT, LatencyHistogram
 
 
 def _env_int(name: str, default: int) -> int:
@@ -42,12 +56,14 @@ def _env_int(name: str, default: int) -> int:
     return value if value > 0 else default
 
 
-# Guard rail, not a hard limit: the replay holds every record's params in memory, so a large
-# capture needs a deliberate raise (and a runner with the RAM for it) rather than discovering the
-# cost mid-sweep. Override with RPC_BENCH_MAX_CORPUS_RECORDS.
-MAX_CORPUS_RECORDS = _env_int("RPC_BENCH_MAX_CORPUS_RECORDS", 10000)
+# Guard rail, not a memory limit: records are read on demand from a memory-mapped file, so replay
+# memory no longer grows with the corpus. The cap only stops a wrong file (a multi-GB dump picked up
+# by corpus_glob) from being indexed and replayed for hours. Override with RPC_BENCH_MAX_CORPUS_RECORDS.
+MAX_CORPUS_RECORDS = _env_int("RPC_BENCH_MAX_CORPUS_RECORDS", 10_000_000)
 MAX_RESPONSE_BYTES = 16 * 1024 * 1024
 REQUEST_TIMEOUT_SECONDS = 120
+# WebSocket connections per replay; each carries many requests at once, matched by id.
+WS_CONNECTIONS = _env_int("RPC_BENCH_WS_CONNECTIONS", 4)
 
 # Fixed numeric report schema; corpus_results.stage validates staged reports against this.
 # "matched" = identical result bytes; "both_rpc_errors" = both clients reject the call (also
@@ -72,42 +88,116 @@ PARITY_LABEL_FIELDS = ("baseline_client", "candidate_client")
 # OWNER can look the calls up in their copy — an index is positional metadata, not content.
 MAX_DIVERGENCE_INDEXES = _env_int("RPC_BENCH_MAX_DIVERGENCE_INDEXES", 200)
 
-# Baseline outcome marker for a call the baseline client rejected with a JSON-RPC error.
-# Deliberately not valid hex so it can never collide with a result string; the error
-# content itself is never stored.
-ERROR_MARKER = "!rpc_error"
-
 
 class CorpusParityError(Exception):
     """Raised with a content-free message when a replay cannot produce a trustworthy result."""
 
 
+# Compiled corpus cached beside the source: a header binding it to the exact source file, then one
+# (start, end) pair per record into a data file holding each record's request body, already
+# serialized. Built and validated once; every later run maps it instead of re-parsing the file, and
+# the replay sends the mapped bytes instead of re-serializing params on every request of every pass.
+INDEX_MAGIC = b"NMCIDX02"
+INDEX_HEADER = struct.Struct("<8sQQQ")  # magic, source size, source mtime_ns, record count
+INDEX_ENTRY = struct.Struct("<QQ")
+# A compiled body is the envelope up to the id; the id and closing brace are appended at send time,
+# so one compiled record serves every pass and retry regardless of the id it is sent with.
+BODY_PREFIX = b'{"jsonrpc":"2.0","method":"eth_call","params":'
+BODY_ID = b',"id":'
+
+
+class Corpus:
+    """Read-only view of a compiled corpus: each record's request body, by position."""
+
+    def __init__(self, data_path: Path, index_path: Path) -> None:
+        # Kept so a replay worker process can map the same compiled files for itself.
+        self.paths = (data_path, index_path)
+        self._data = _map(data_path)
+        self._index = _map(index_path)
+        _, size, mtime_ns, self._count = INDEX_HEADER.unpack_from(self._index)
+        # Identifies the source file this compilation came from, for keying resumable work.
+        self.source = (size, mtime_ns)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def body(self, position: int) -> memoryview:
+        """Compiled request body of one record (0-based position), up to and including `"id":`.
+
+        A view into the mapping, not a copy: send it and drop it, since close() fails while a
+        view is still referenced.
+        """
+        if not 0 <= position < self._count:
+            raise IndexError(position)
+        start, end = INDEX_ENTRY.unpack_from(self._index, INDEX_HEADER.size + position * INDEX_ENTRY.size)
+        return memoryview(self._data)[start:end]
+
+    def params(self, position: int) -> list:
+        with self.body(position) as body:
+            return json.loads(bytes(body) + b"0}")["params"]
+
+    def close(self) -> None:
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> Corpus:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _map(path: Path) -> mmap.mmap:
+    with path.open("rb") as handle:
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
 def _reject_non_json_constant(value: str) -> None:
     raise ValueError(f"invalid JSON constant {value!r}")
 
 
-def load_corpus(path: str | Path) -> list[list]:
-    """Return the params of each corpus record, in file order."""
-    path = Path(path)
-    load_started = time.perf_counter()
-    # The latency cells convert the same file with prepare-eth-call-corpus.py, which requires one
-    # of these suffixes. Enforcing it here too keeps both readers agreeing on what a legal corpus
-    # is, so a bad corpus_glob fails at validation rather than inside the first cell.
-    if not (path.name.endswith(".jsonl") or path.name.endswith(".jsonl.gz")):
-        raise CorpusParityError("corpus must have a .jsonl or .jsonl.gz extension")
+def _cache_dir(path: Path) -> tuple[Path, bool]:
+    """Where the index (and a gzip corpus's decompressed copy) lives, and whether it persists.
+
+    Beside the corpus, so it shares the corpus's access boundary and is reused by every later run.
+    A read-only corpus directory falls back to a private temporary directory removed at exit.
+    """
+    cache = path.with_name(f".{path.name}.cache")
+    try:
+        cache.mkdir(exist_ok=True)
+        if os.access(cache, os.W_OK):
+            return cache, True
+    except OSError:
+        pass
+    return Path(tempfile.mkdtemp(prefix="corpus-cache-")), False
+
+
+def _compile(params: list) -> bytes:
+    return BODY_PREFIX + json.dumps(params, separators=(",", ":")).encode() + BODY_ID
+
+
+def _build_index(path: Path, data_path: Path, index_path: Path, stat: os.stat_result) -> None:
+    """Validate every record and write the compiled bodies and their offset index."""
     opener = gzip.open if path.name.endswith(".gz") else open
-    params: list[list] = []
+    index_tmp = index_path.with_name(index_path.name + ".tmp")
+    data_tmp = data_path.with_name(data_path.name + ".tmp")
+    count = 0
+    offset = 0
+    data = None
     try:
-        with opener(path, "rt", encoding="utf-8") as source:
+        with opener(path, "rb") as source, index_tmp.open("wb") as index:
+            data = data_tmp.open("wb")
+            index.write(INDEX_HEADER.pack(INDEX_MAGIC, 0, 0, 0))
             for number, line in enumerate(source, start=1):
                 if not line.strip():
                     continue
-                if len(params) >= MAX_CORPUS_RECORDS:
+                if count >= MAX_CORPUS_RECORDS:
                     raise CorpusParityError(f"corpus exceeds {MAX_CORPUS_RECORDS} records")
+                text = line.decode("utf-8")
                 try:
                     # Match the converter: NaN/Infinity are not JSON, and accepting them here
                     # would validate a corpus that then fails conversion in the first cell.
-                    record = json.loads(line, parse_constant=_reject_non_json_constant)
+                    record = json.loads(text, parse_constant=_reject_non_json_constant)
                 # JSONDecodeError is a ValueError; so is the rejection above. Catch both so a
                 # malformed corpus reports a line number instead of a traceback.
                 except (ValueError, RecursionError):
@@ -115,22 +205,88 @@ def load_corpus(path: str | Path) -> list[list]:
                 if not isinstance(record, dict) or record.get("method") != "eth_call" \
                         or not isinstance(record.get("params"), list):
                     raise CorpusParityError(f"corpus line {number}: not an eth_call record")
-                params.append(record["params"])
+                compiled = _compile(record["params"])
+                data.write(compiled)
+                index.write(INDEX_ENTRY.pack(offset, offset + len(compiled)))
+                offset += len(compiled)
+                count += 1
+            if not count:
+                raise CorpusParityError("corpus contains no records")
+            index.seek(0)
+            index.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, count))
+        data.close()
     # EOFError/zlib.error (truncated or corrupt gzip) and UnicodeError (invalid UTF-8) are not
     # OSError, so they previously escaped as tracebacks — which print the offending corpus bytes.
     except (OSError, EOFError, UnicodeError, zlib.error) as error:
+        _discard(data, index_tmp, data_tmp)
+        raise CorpusParityError(f"cannot read corpus: {error.__class__.__name__}") from None
+    except BaseException:
+        _discard(data, index_tmp, data_tmp)
+        raise
+    os.replace(data_tmp, data_path)
+    os.replace(index_tmp, index_path)
+
+
+def _discard(handle, *paths: Path) -> None:
+    if handle is not None:
+        handle.close()
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def _index_is_current(index_path: Path, stat: os.stat_result) -> bool:
+    try:
+        with index_path.open("rb") as handle:
+            magic, size, mtime_ns, count = INDEX_HEADER.unpack(handle.read(INDEX_HEADER.size))
+    except (OSError, struct.error):
+        return False
+    return (magic, size, mtime_ns) == (INDEX_MAGIC, stat.st_size, stat.st_mtime_ns) \
+        and 0 < count <= MAX_CORPUS_RECORDS
+
+
+def load_corpus(path: str | Path) -> Corpus:
+    """Return a lazy view of the corpus records, in file order.
+
+    The first load validates every record and caches the compiled bodies beside the corpus; later
+    loads of the same unchanged file only map them, so memory stays flat however large the capture.
+    """
+    path = Path(path)
+    load_started = time.perf_counter()
+    # The latency cells convert the same file with prepare-eth-call-corpus.py, which requires one
+    # of these suffixes. Enforcing it here too keeps both readers agreeing on what a legal corpus
+    # is, so a bad corpus_glob fails at validation rather than inside the first cell.
+    if not (path.name.endswith(".jsonl") or path.name.endswith(".jsonl.gz")):
+        raise CorpusParityError("corpus must have a .jsonl or .jsonl.gz extension")
+    try:
+        stat = path.stat()
+    except OSError as error:
+        raise CorpusParityError(f"cannot read corpus: {error.__class__.__name__}") from None
+    cache, persistent = _cache_dir(path)
+    index_path = cache / "records.idx"
+    data_path = cache / "records.bin"
+    built = False
+    if not (persistent and _index_is_current(index_path, stat) and data_path.is_file()):
+        _build_index(path, data_path, index_path, stat)
+        built = True
+    try:
+        corpus = Corpus(data_path, index_path)
+    except (OSError, ValueError) as error:
         raise CorpusParityError(f"cannot read corpus: {error.__class__.__name__}") from None
-    if not params:
-        raise CorpusParityError("corpus contains no records")
-    # Decompressing and parsing a large corpus takes minutes; say so rather than looking hung.
+    finally:
+        if not persistent:
+            # The maps stay valid after unlink; nothing uncached outlives this process.
+            shutil.rmtree(cache, ignore_errors=True)
+    # Indexing a large corpus takes minutes; say so rather than looking hung.
     took = time.perf_counter() - load_started
-    if took > 5:
-        print(f"  loaded {len(params)} records in {took:.0f}s", flush=True)
-    return params
+    if built and took > 5:
+        print(f"  compiled {len(corpus)} records in {took:.0f}s", flush=True)
+    return corpus
 
 
 def _rpc(url: str, method: str, params: list):
     body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params}).encode()
+    if urllib.parse.urlsplit(url).scheme not in HTTP_SCHEMES:
+        return _rpc_pooled(url, method, body)
     request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
     try:
         with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:
@@ -139,6 +295,22 @@ def _rpc(url: str, method: str, params: list):
         raise CorpusParityError(f"cannot read {method} from the node") from None
 
 
+def _rpc_pooled(url: str, method: str, body: bytes):
+    """_rpc over the replay transports, for the schemes urllib does not speak."""
+    async def exchange() -> tuple[int, bytes] | None:
+        pool = _open_pool(url)
+        try:
+            return await pool.fetch(body, ids=(1,))
+        finally:
+            await pool.close()
+
+    try:
+        fetched = asyncio.run(exchange())
+        return json.loads(fetched[1])["result"]
+    except (ValueError, KeyError, TypeError):
+        raise CorpusParityError(f"cannot read {method} from the node") from None
+
+
 def _node_identity(url: str) -> tuple[int, int, str]:
     """Return (head block number, chain id, head block hash).
 
@@ -152,69 +324,71 @@ def _node_identity(url: str) -> tuple[int, int, str]:
         head = int(header["number"], 16)
         block_hash = str(header["hash"]).lower()
         int(chain_id, 16)
+        if len(bytes.fromhex(block_hash.removeprefix("0x"))) != 32:
+            raise ValueError
     except (KeyError, TypeError, ValueError, AttributeError):
         raise CorpusParityError("node returned an unusable head header") from None
     return head, int(chain_id, 16), block_hash
 
 
-# One keep-alive connection per worker thread. A fresh TCP connection per call folds connect
-# cost into every measurement and churns ephemeral ports across a 100k-request replay.
-_CONNECTIONS = threading.local()
+def _client_version(url: str) -> str:
+    """web3_clientVersion, or "" when the node does not serve it; only ever hashed into a key."""
+    try:
+        version = _rpc(url, "web3_clientVersion", [])
+    except CorpusParityError:
+        return ""
+    return version if isinstance(version, str) else ""
+
+
+def _shard_urls(rpc_url: str) -> list[str]:
+    """Endpoints of one logical node: a comma-separated list shards the corpus across them."""
+    urls = [url.strip() for url in rpc_url.split(",") if url.strip()]
+    if not urls:
+        raise CorpusParityError("no RPC endpoint given")
+    return urls
+
+
+def _shared_identity(rpc_url: str) -> tuple[int, int, str]:
+    """Node identity of every shard endpoint, which must agree: shards of one replay have to be the
+    same snapshot on the same client build, or the merged state would mix two nodes' answers."""
+    urls = _shard_urls(rpc_url)
+    identities = {_node_identity(url) for url in urls}
+    if len(identities) > 1:
+        raise CorpusParityError(
+            f"{len(urls)} shard endpoints report {len(identities)} different node identities "
+            f"(head/chain/hash) — shard only across nodes serving one snapshot"
+        )
+    if len(urls) > 1 and len({_client_version(url) for url in urls}) > 1:
+        raise CorpusParityError("shard endpoints run different client builds")
+    return identities.pop()
 
 
-def _release_connection() -> None:
-    entry = getattr(_CONNECTIONS, "entry", None)
-    if entry is not None:
-        try:
-            entry[1].close()
-        except Exception:  # noqa: BLE001 — a failed close must not mask the caller's outcome
-            pass
-        _CONNECTIONS.entry = None
+def _checkpoint_key(records: Corpus, rpc_url: str, *extra: object) -> bytes:
+    """Digest binding resumable work to the corpus file, the node's client build, and extra.
 
+    Node identity (head, chain, block hash) is checked separately; this catches what it cannot —
+    a replaced corpus file or a different client binary serving the same snapshot.
+    """
+    return _digest(json.dumps([*records.source, _client_version(_shard_urls(rpc_url)[0]), *extra]).encode())
 
-def _fetch(url: str, body: bytes) -> tuple[int, bytes] | None:
-    """POST body and return (status, raw), or None on transport failure.
 
-    Retries once: a pooled connection can be closed by the peer between requests, which is
-    indistinguishable from a real failure on the first attempt.
-    """
-    parsed = urllib.parse.urlsplit(url)
-    key = (parsed.scheme, parsed.hostname, parsed.port)
-    path = parsed.path or "/"
-    for attempt in (0, 1):
-        entry = getattr(_CONNECTIONS, "entry", None)
-        if entry is None or entry[0] != key:
-            _release_connection()
-            factory = (http.client.HTTPSConnection if parsed.scheme == "https"
-                       else http.client.HTTPConnection)
-            _CONNECTIONS.entry = (key, factory(parsed.hostname, parsed.port,
-                                               timeout=REQUEST_TIMEOUT_SECONDS))
-        conn = _CONNECTIONS.entry[1]
-        try:
-            conn.request("POST", path, body=body, headers={"Content-Type": "application/json"})
-            response = conn.getresponse()
-            raw = response.read(MAX_RESPONSE_BYTES + 1)
-            # An over-long body leaves unread bytes on the socket, so the connection cannot be
-            # reused; drop it rather than corrupting the next request on this thread.
-            if len(raw) > MAX_RESPONSE_BYTES:
-                _release_connection()
-            return response.status, raw
-        except (http.client.HTTPException, OSError, ValueError):
-            _release_connection()
-            if attempt:
-                return None
-    return None
-
-
-def _post(url: str, index: int, params: list) -> tuple[str | None, str]:
-    """POST one eth_call; return (category, result_hex). category is None on success."""
-    body = json.dumps(
-        {"jsonrpc": "2.0", "id": index, "method": "eth_call", "params": params},
-        separators=(",", ":"),
-    ).encode()
-    fetched = _fetch(url, body)
+def _transport(url: str) -> str:
+    if url.startswith(IPC_SCHEME):
+        return "ipc"
+    return "ws" if urllib.parse.urlsplit(url).scheme in WS_SCHEMES else "http"
+
+
+def _open_pool(url: str, batch_size: int = 1) -> Pool:
+    try:
+        return open_pool(url, MAX_RESPONSE_BYTES * batch_size, REQUEST_TIMEOUT_SECONDS, WS_CONNECTIONS)
+    except ValueError:
+        raise CorpusParityError("RPC URL must be http(s)://, ws(s):// or ipc://<socket path>") from None
+
+
+def _classify(index: int, fetched: tuple[int, bytes] | None) -> tuple[str | None, bytes]:
+    """Turn one raw exchange into (category, result bytes). category is None on success."""
     if fetched is None:
-        return "transport_failure", ""
+        return "transport_failure", b""
     status, raw = fetched
     if status >= 400:
         # Some clients/proxies answer JSON-RPC errors with a non-200 status — that is a
@@ -222,115 +396,852 @@ def _post(url: str, index: int, params: list) -> tuple[str | None, str]:
         try:
             envelope = json.loads(raw)
         except ValueError:
-            return "transport_failure", ""
+            return "transport_failure", b""
         if isinstance(envelope, dict) and "error" in envelope and envelope.get("id") in (index, None):
-            return "rpc_error", ""
-        return "transport_failure", ""
+            return "rpc_error", b""
+        return "transport_failure", b""
     if len(raw) > MAX_RESPONSE_BYTES:
-        return "transport_failure", ""
+        return "transport_failure", b""
+    result = _fast_result(index, raw)
+    if result is not None:
+        return None, result
     try:
         envelope = json.loads(raw)
     except (json.JSONDecodeError, UnicodeDecodeError):
-        return "invalid_response", ""
+        return "invalid_response", b""
+    return _classify_envelope(index, envelope)
+
+
+# Zero-parse fast path for success envelopes. Decoding a multi-megabyte result through json.loads
+# builds it as a str, slices it, and only then decodes the hex. Instead, the result value is found
+# in the raw body and unhexlify validates and decodes it in one pass, straight from a memoryview.
+# The rest of the envelope — a few dozen bytes — is still parsed in full, with the value replaced
+# by a NaN placeholder: the decode stands only if that placeholder is the top-level "result"
+# and there is no "error", so anything the full parse would read differently takes that path.
+RESULT_MEMBER = re.compile(rb'[{,]\s*"result"\s*:\s*"0x')
+
+
+def _fast_result(index: int, raw: bytes) -> bytes | None:
+    """Result bytes of a plain success envelope for `index`, or None to fall back to the full parse."""
+    member = RESULT_MEMBER.search(raw)
+    if member is None:
+        return None
+    start = member.end()
+    end = raw.find(b'"', start)
+    if end < 0:
+        return None
+    placeholders: list[object] = []
+    try:
+        members = json.loads(raw[:start - 3] + b"NaN" + raw[end + 1:], object_pairs_hook=tuple,
+                             parse_constant=lambda _: placeholders.append(object()) or placeholders[-1])
+    except (ValueError, RecursionError):
+        return None
+    if not isinstance(members, tuple) or len(placeholders) != 1:
+        return None
+    envelope = dict(members)
+    if "error" in envelope or envelope.get("result") is not placeholders[0] or envelope.get("id") != index:
+        return None
+    try:
+        return binascii.unhexlify(memoryview(raw)[start:end])
+    except binascii.Error:
+        return None
+
+
+def _classify_envelope(index: int, envelope) -> tuple[str | None, bytes]:
     if not isinstance(envelope, dict) or envelope.get("id") != index:
-        return "invalid_response", ""
+        return "invalid_response", b""
     if "error" in envelope:
         error = envelope["error"]
         code = error.get("code") if isinstance(error, dict) else None
         # The code is a protocol-level integer, never call content — recording it is what
         # distinguishes "this call legitimately reverts" from "the node is shedding load".
-        return (f"rpc_error:{code}" if isinstance(code, int) else "rpc_error"), ""
+        return (f"rpc_error:{code}" if isinstance(code, int) else "rpc_error"), b""
     result = envelope.get("result")
     if not isinstance(result, str) or not result.startswith("0x") or len(result) % 2 != 0:
-        return "invalid_response", ""
+        return "invalid_response", b""
     try:
-        bytes.fromhex(result[2:])
+        return None, bytes.fromhex(result[2:])
     except ValueError:
-        return "invalid_response", ""
-    return None, result.lower()
+        return "invalid_response", b""
+
+
+def _classify_batch(indexes: list[int], fetched: tuple[int, bytes] | None) -> list[tuple[str | None, bytes]]:
+    """Demultiplex one batch exchange by id into a (category, result bytes) per index, in order.
+
+    A failure of the exchange as a whole — transport, HTTP status, an unparsable or non-array
+    body — is charged to every call in it; a call whose id is missing from the array is invalid.
+    """
+    if fetched is None:
+        return [("transport_failure", b"")] * len(indexes)
+    status, raw = fetched
+    # A batch-level rejection (too many calls, a proxy limit) says nothing about any one call.
+    if status >= 400 or len(raw) > MAX_RESPONSE_BYTES * len(indexes):
+        return [("transport_failure", b"")] * len(indexes)
+    try:
+        envelopes = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        envelopes = None
+    if not isinstance(envelopes, list):
+        return [("invalid_response", b"")] * len(indexes)
+    by_id = {envelope["id"]: envelope for envelope in envelopes
+             if isinstance(envelope, dict) and type(envelope.get("id")) is int}
+    return [_classify_envelope(index, by_id.get(index)) for index in indexes]
+
+
+async def _post(pool: Pool, index: int, body: memoryview) -> tuple[str | None, bytes]:
+    """POST one compiled eth_call as `index`; return (category, result bytes), category None on success."""
+    return _classify(index, await pool.fetch(body, b"%d}" % index, ids=(index,)))
+
+
+async def _post_batch(pool: Pool, records: Corpus, positions: Sequence[int]) -> list[tuple[str | None, bytes]]:
+    """POST the given records as one JSON-RPC batch, each with id position + 1; outcomes in order."""
+    parts: list[bytes | memoryview] = [b"["]
+    for position in positions:
+        parts += (records.body(position), b"%d}," % (position + 1))
+    parts[-1] = parts[-1][:-1] + b"]"
+    indexes = [position + 1 for position in positions]
+    return _classify_batch(indexes, await pool.fetch(*parts, ids=indexes))
+
+
+async def _send(pool: Pool, records: Corpus, positions: Sequence[int], batched: bool) -> list[Outcome]:
+    """Send records as single calls (one position) or as one batch; outcomes in position order."""
+    if batched:
+        return await _post_batch(pool, records, positions)
+    return [await _post(pool, positions[0] + 1, records.body(positions[0]))]
 
 
 # eth_call is read-only and deterministic against a parked head, so replaying concurrently cannot
 # change what any record returns - only how fast the whole set is collected. Results are stored by
 # index, so completion order is irrelevant. Serial replay left the node ~99% idle: at 50k records
-# that is ~17 minutes of wall clock to do a few seconds of work.
+# that is ~17 minutes of wall clock to do a few seconds of work. Requests are coroutines on one
+# event loop, so this can go into the thousands without the client becoming the bottleneck.
 REPLAY_CONCURRENCY = _env_int("RPC_BENCH_PARITY_CONCURRENCY", 16)
 # Outcomes that indicate the transport or the node struggled, not that the call has an answer.
 # rpc_error is excluded: a captured corpus legitimately contains calls that fail at the head.
 RETRYABLE_CATEGORIES = frozenset({"transport_failure", "invalid_response"})
 
 
-def _replay(rpc_url: str, params_list: list[list], what: str) -> list[tuple[str | None, str]]:
-    """Replay every record and return (category, result) per record, in corpus order."""
-    outcomes: list[tuple[str | None, str] | None] = [None] * len(params_list)
-    started = time.perf_counter()
-    done = 0
-    lock = threading.Lock()
+Outcome = tuple[str | None, bytes]
+# Observes one exchange of a replay: its positions, elapsed ms, and outcome per record ("ok" on success).
+Timed = Callable[[Sequence[int], float, list[str]], None]
+# What an adaptive replay's AIMD limit did: the in-flight limit it settled at, its lowest and highest.
+Limits = tuple[int, int, int]
+
+# Adaptive mode (AIMD): start at REPLAY_CONCURRENCY, add ADAPTIVE_INCREASE in-flight exchanges after
+# every healthy window, halve after an unhealthy one. A window is one limit's worth of completed
+# exchanges — about one round trip of the whole pipeline. Healthy means no retryable failure and a
+# median latency within ADAPTIVE_LATENCY_TOLERANCE of the best window median seen: a rising
+# median means requests are queueing in the node, which only adds latency, not throughput.
+ADAPTIVE_MAX_CONCURRENCY = _env_int("RPC_BENCH_PARITY_MAX_CONCURRENCY", 1024)
+ADAPTIVE_INCREASE = 8
+ADAPTIVE_LATENCY_TOLERANCE = 2.0
+
+
+class _AimdLimit:
+    """In-flight limit for adaptive replays: acquire before an exchange, release with its result."""
+
+    def __init__(self, start: int, ceiling: int) -> None:
+        self.limit = max(1, min(start, ceiling))
+        self.ceiling = ceiling
+        self.history: list[int] = [self.limit]
+        self._in_flight = 0
+        self._changed = asyncio.Condition()
+        self._latencies: list[float] = []
+        self._failed = False
+        self._best: float | None = None
+
+    async def acquire(self) -> None:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self, elapsed: float | None, failed: bool = False) -> None:
+        """elapsed None returns a slot that never carried an exchange."""
+        async with self._changed:
+            self._in_flight -= 1
+            if elapsed is None:
+                self._changed.notify_all()
+                return
+            self._latencies.append(elapsed)
+            self._failed = self._failed or failed
+            if len(self._latencies) >= max(16, self.limit):
+                self._settle()
+            self._changed.notify_all()
+
+    def _settle(self) -> None:
+        median = sorted(self._latencies)[len(self._latencies) // 2]
+        self._best = median if self._best is None else min(self._best, median)
+        if self._failed or median > self._best * ADAPTIVE_LATENCY_TOLERANCE:
+            self.limit = max(1, self.limit // 2)
+        else:
+            self.limit = min(self.ceiling, self.limit + ADAPTIVE_INCREASE)
+        self.history.append(self.limit)
+        self._latencies.clear()
+        self._failed = False
+
+    def settled(self) -> int:
+        """The limit the controller oscillated around once it stopped climbing: the median of
+        the later half of its windows."""
+        tail = sorted(self.history[len(self.history) // 2:])
+        return tail[len(tail) // 2]
+
 
-    def one(position: int) -> None:
+async def _serially(pool: Pool, records: Corpus, positions: list[int], batched: bool = False) -> list[Outcome]:
+    """Re-run the given records one at a time, unloaded, in the order given.
+
+    In batch mode each record goes out as a batch of one, so a retry still takes the node's batch
+    path: settling a dispute over the single-call path would hide a batch-only divergence.
+    """
+    return [(await _send(pool, records, (position,), batched))[0] for position in positions]
+
+
+def _rerun(rpc_url: str, records: Corpus, positions: list[int], batched: bool = False) -> list[Outcome]:
+    async def run() -> list[Outcome]:
+        # Serial and rare: the first shard endpoint is as good as any.
+        pool = _open_pool(_shard_urls(rpc_url)[0])
+        try:
+            return await _serially(pool, records, positions, batched)
+        finally:
+            await pool.close()
+
+    return asyncio.run(run())
+
+
+def _batches(span: range, batch_size: int, finished: Callable[[int], bool] | None):
+    """Positions of span still to replay, batch_size at a time, in corpus order."""
+    batch: list[int] = []
+    for position in span:
+        if finished is not None and finished(position):
+            continue
+        batch.append(position)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _replay_async(rpc_url: str, records: Corpus, what: str,
+                        consume: Callable[[int, Outcome], None], batch_size: int,
+                        finished: Callable[[int], bool] | None, adaptive: bool, span: range,
+                        concurrency: int, ceiling: int, timed: Timed | None = None) -> Limits | None:
+    """Replay span with `concurrency` exchanges in flight; adaptive, the AIMD limit starts there and
+    never exceeds `ceiling`. Returns the limit's Limits when adaptive."""
+    done = 0 if finished is None else sum(map(finished, span))
+    if done:
+        print(f"  {what}: resuming, {done}/{len(span)} records already settled", flush=True)
+    started = time.perf_counter()
+    batched = batch_size > 1
+    pool = _open_pool(rpc_url, batch_size)
+    # Workers share one iterator; next() never yields to the loop, so no record is taken twice.
+    pending = _batches(span, batch_size, finished)
+    suspect: list[int] = []
+    limit = _AimdLimit(concurrency, ceiling) if adaptive else None
+
+    async def worker() -> None:
         nonlocal done
-        outcomes[position] = _post(rpc_url, position + 1, params_list[position])
-        with lock:
-            done += 1
-            _progress(done, len(params_list), started, what)
-
-    workers = max(1, min(REPLAY_CONCURRENCY, len(params_list)))
-    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
-        for _ in pool.map(one, range(len(params_list))):
+        while True:
+            if limit is not None:
+                await limit.acquire()
+            positions = next(pending, None)
+            if positions is None:
+                if limit is not None:
+                    await limit.release(None)
+                return
+            sent = time.perf_counter()
+            outcomes = await _send(pool, records, positions, batched)
+            if timed is not None:
+                timed(positions, (time.perf_counter() - sent) * 1000.0, [category or "ok" for category, _ in outcomes])
+            if limit is not None:
+                await limit.release(time.perf_counter() - sent, any(
+                    _base_category(category) in RETRYABLE_CATEGORIES for category, _ in outcomes))
+            for position, outcome in zip(positions, outcomes):
+                if _base_category(outcome[0]) in RETRYABLE_CATEGORIES:
+                    suspect.append(position)
+                else:
+                    consume(position, outcome)
+                done += 1
+                _progress(done, len(span), started, what)
+
+    try:
+        workers = max(1, min(limit.ceiling if limit is not None else concurrency, -(-(len(span) - done) // batch_size)))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        if limit is not None:
+            print(f"  {what}: adaptive concurrency settled at {limit.settled()} in flight "
+                  f"(range {min(limit.history)}-{max(limit.history)} over {len(limit.history)} windows)",
+                  flush=True)
+
+        # A node under concurrent load can drop or truncate a response, which would otherwise be
+        # indistinguishable from a real defect. Re-run those records one at a time, unloaded: a
+        # record that only fails under concurrency is a load artifact, not a divergence.
+        if suspect:
+            suspect.sort()
+            print(f"  {what}: re-running {len(suspect)} non-clean record(s) serially", flush=True)
+            recovered = 0
+            for position, retried in zip(suspect, await _serially(pool, records, suspect, batched)):
+                if _base_category(retried[0]) not in RETRYABLE_CATEGORIES:
+                    recovered += 1
+                consume(position, retried)
+            if recovered:
+                print(f"  {what}: {recovered} recovered on retry (concurrency artifacts, not defects)", flush=True)
+    finally:
+        await pool.close()
+    return (limit.settled(), min(limit.history), max(limit.history)) if limit is not None else None
+
+
+def _replay(rpc_url: str, records: Corpus, what: str, consume: Callable[[int, Outcome], None],
+            batch_size: int = 1, finished: Callable[[int], bool] | None = None,
+            adaptive: bool = False, processes: int = 1, timed: Timed | None = None) -> list[Limits]:
+    """Replay every record, handing each settled (category, result) to consume as it arrives.
+
+    Outcomes arrive in completion order, not corpus order; consume receives the 0-based position.
+    Nothing is retained here, so memory does not grow with the corpus or the response sizes. With
+    batch_size > 1, consecutive records go out batch_size to a JSON-RPC batch. Records for which
+    finished(position) is true were settled by an interrupted earlier run and are skipped. With
+    adaptive, the number of exchanges in flight follows an AIMD controller instead of staying at
+    REPLAY_CONCURRENCY (see _AimdLimit).
+
+    A comma-separated rpc_url shards the corpus: each endpoint replays one contiguous slice of the
+    index range, all at once. Callers check the endpoints agree (_shared_identity) beforehand;
+    outcomes still reach consume by corpus position, so what it builds is in corpus order.
+
+    With processes > 1, each endpoint's slice is split again across that many worker processes
+    (see _replay_processes), so response parsing is not bound to one core.
+
+    timed, if given, sees every concurrent exchange as it completes (see _TimingsMatrix.observe).
+    The serial retries of suspect records are not timed: unloaded, they measure something else.
+
+    Returns the Limits of every adaptive controller the replay ran (one per shard and worker
+    process); none without adaptive.
+    """
+    return _replay_each(records, [(rpc_url, what, consume, finished, timed)], batch_size, adaptive, processes)[0]
+
+
+def _replay_each(records: Corpus,
+                 replays: Sequence[tuple[str, str, Callable[[int, Outcome], None], Callable[[int], bool] | None,
+                                         Timed | None]],
+                 batch_size: int = 1, adaptive: bool = False, processes: int = 1) -> list[list[Limits]]:
+    """_replay for several (rpc_url, what, consume, finished, timed) at once, on one event loop, so
+    replays against different nodes — and the shards of each — overlap instead of running back
+    to back. Returns each replay's Limits, as _replay does."""
+    if batch_size < 1:
+        raise CorpusParityError("batch size must be >= 1")
+    if processes < 1:
+        raise CorpusParityError("processes must be >= 1")
+    total = len(records)
+    shards = []
+    owners: list[int] = []
+    for replay, (rpc_url, what, consume, finished, timed) in enumerate(replays):
+        urls = _shard_urls(rpc_url)
+        for number, url in enumerate(urls):
+            span = range(total * number // len(urls), total * (number + 1) // len(urls))
+            label = what if len(urls) == 1 else f"{what} shard {number + 1}/{len(urls)}"
+            shards.append((url, label, consume, finished, timed, span))
+            owners.append(replay)
+    if processes > 1:
+        per_shard = _replay_processes(records, shards, batch_size, adaptive, processes)
+    else:
+        async def run() -> list[Limits | None]:
+            return await asyncio.gather(*(
+                _replay_async(url, records, label, consume, batch_size, finished, adaptive, span,
+                              REPLAY_CONCURRENCY, ADAPTIVE_MAX_CONCURRENCY, timed)
+                for url, label, consume, finished, timed, span in shards))
+
+        per_shard = [[limits] for limits in asyncio.run(run())]
+    found: list[list[Limits]] = [[] for _ in replays]
+    for owner, shard_limits in zip(owners, per_shard):
+        found[owner].extend(limits for limits in shard_limits if limits is not None)
+    return found
+
+
+# Process-pool replay. Classifying a response (JSON parsing, hex decoding) is CPU work on up to
+# MAX_RESPONSE_BYTES per record, and on one event loop it all queues behind the GIL. Worker
+# processes each replay a contiguous span with their own connection pool and classifier, and ship
+# settled outcomes back over a pipe in frames of packed entries — the journal's dispute framing,
+# (position, category length, result length) then the bytes — so the parent only writes state.
+# A replay that is timed also ships a frame of timed exchanges: (elapsed ms, calls), then
+# (position, outcome length) and the outcome per call. Workers are spawned, not forked: the
+# parent may hold threads and an event loop's fds.
+WORKER_FRAME_BYTES = 1 << 20
+WORKER_OUTCOMES = b"o"
+WORKER_TIMINGS = b"t"
+WORKER_EXCHANGE = struct.Struct("<dI")  # elapsed ms, calls
+WORKER_CALL = struct.Struct("<QH")  # position, outcome length
+# An adaptive worker's last frame before the end marker: its Limits.
+WORKER_LIMITS = b"c"
+WORKER_LIMITS_ENTRY = struct.Struct("<III")
+
+
+def _replay_worker(paths: tuple[Path, Path], rpc_url: str, what: str, span: range, settled: bytes,
+                   batch_size: int, adaptive: bool, concurrency: int, ceiling: int, timed: bool,
+                   connection: multiprocessing.connection.Connection) -> None:
+    frames = {WORKER_OUTCOMES: bytearray(WORKER_OUTCOMES), WORKER_TIMINGS: bytearray(WORKER_TIMINGS)}
+
+    def flush(least: int) -> None:
+        for frame in frames.values():
+            if len(frame) > least:
+                connection.send_bytes(frame)
+                del frame[1:]
+
+    def consume(position: int, outcome: Outcome) -> None:
+        category = (outcome[0] or "").encode("ascii")
+        frame = frames[WORKER_OUTCOMES]
+        frame.extend(JOURNAL_DISPUTE.pack(position, len(category), len(outcome[1])))
+        frame.extend(category)
+        frame.extend(outcome[1])
+        if len(frame) >= WORKER_FRAME_BYTES:
+            flush(WORKER_FRAME_BYTES)
+
+    def observe(positions: Sequence[int], elapsed: float, results: list[str]) -> None:
+        frame = frames[WORKER_TIMINGS]
+        frame.extend(WORKER_EXCHANGE.pack(elapsed, len(positions)))
+        for position, result in zip(positions, results):
+            frame.extend(WORKER_CALL.pack(position, len(result)))
+            frame.extend(result.encode("ascii"))
+        if len(frame) >= WORKER_FRAME_BYTES:
+            flush(WORKER_FRAME_BYTES)
+
+    finished = (lambda position: settled[position - span.start] != 0) if settled.count(0) < len(span) else None
+    with Corpus(*paths) as records:
+        limits = asyncio.run(_replay_async(rpc_url, records, what, consume, batch_size, finished, adaptive, span,
+                                           concurrency, ceiling, observe if timed else None))
+    flush(1)
+    if limits is not None:
+        connection.send_bytes(WORKER_LIMITS + WORKER_LIMITS_ENTRY.pack(*limits))
+    # An empty frame marks a worker that finished its span, as opposed to one that died.
+    connection.send_bytes(b"")
+    connection.close()
+
+
+def _unpack_frame(frame: bytes, consume: Callable[[int, Outcome], None], timed: Timed | None) -> None:
+    offset = 1
+    if frame[:1] == WORKER_OUTCOMES:
+        while offset < len(frame):
+            position, category_length, result_length = JOURNAL_DISPUTE.unpack_from(frame, offset)
+            offset += JOURNAL_DISPUTE.size
+            category = frame[offset:offset + category_length].decode("ascii") or None
+            offset += category_length
+            consume(position, (category, frame[offset:offset + result_length]))
+            offset += result_length
+        return
+    while offset < len(frame) and timed is not None:
+        elapsed, calls = WORKER_EXCHANGE.unpack_from(frame, offset)
+        offset += WORKER_EXCHANGE.size
+        positions, results = [], []
+        for _ in range(calls):
+            position, length = WORKER_CALL.unpack_from(frame, offset)
+            offset += WORKER_CALL.size
+            positions.append(position)
+            results.append(frame[offset:offset + length].decode("ascii"))
+            offset += length
+        timed(positions, elapsed, results)
+
+
+def _replay_processes(records: Corpus,
+                      shards: Sequence[tuple[str, str, Callable[[int, Outcome], None],
+                                             Callable[[int], bool] | None, Timed | None, range]],
+                      batch_size: int, adaptive: bool, processes: int) -> list[list[Limits]]:
+    """Run each (url, label, consume, finished, timed, span) split across `processes` worker processes.
+
+    REPLAY_CONCURRENCY, and in adaptive mode ADAPTIVE_MAX_CONCURRENCY, are divided between a shard's
+    workers, so the node sees about the same number of exchanges in flight as from one process and
+    never more than the adaptive ceiling. Returns, per shard, the Limits its adaptive workers reported.
+    """
+    context = multiprocessing.get_context("spawn")
+    concurrency = max(1, -(-REPLAY_CONCURRENCY // processes))
+    ceiling = max(1, ADAPTIVE_MAX_CONCURRENCY // processes)
+    workers: list[multiprocessing.process.BaseProcess] = []
+    live: dict[multiprocessing.connection.Connection, tuple[Callable[[int, Outcome], None], Timed | None]] = {}
+    owner: dict[multiprocessing.connection.Connection, int] = {}
+    found: list[list[Limits]] = [[] for _ in shards]
+    try:
+        for shard, (url, label, consume, finished, timed, span) in enumerate(shards):
+            for number in range(processes):
+                part = span[len(span) * number // processes:len(span) * (number + 1) // processes]
+                if not part:
+                    continue
+                settled = bytes(len(part)) if finished is None else bytes(map(finished, part))
+                receiver, sender = context.Pipe(duplex=False)
+                worker = context.Process(
+                    target=_replay_worker, daemon=True,
+                    args=(records.paths, url, f"{label} worker {number + 1}/{processes}", part, settled,
+                          batch_size, adaptive, concurrency, ceiling, timed is not None, sender))
+                worker.start()
+                sender.close()
+                workers.append(worker)
+                live[receiver] = (consume, timed)
+                owner[receiver] = shard
+        while live:
+            for receiver in multiprocessing.connection.wait(list(live)):
+                try:
+                    frame = receiver.recv_bytes()
+                except EOFError:
+                    raise CorpusParityError("a replay worker process exited before finishing its records") from None
+                if frame[:1] == WORKER_LIMITS:
+                    found[owner[receiver]].append(WORKER_LIMITS_ENTRY.unpack_from(frame, 1))
+                elif frame:
+                    _unpack_frame(frame, *live[receiver])
+                else:
+                    receiver.close()
+                    del live[receiver]
+    finally:
+        for receiver in live:
+            receiver.close()
+        for worker in workers:
+            if live:
+                worker.terminate()
+            worker.join()
+    return found
+
+
+# Binary baseline state: a fixed header carrying the node identity, one (offset, length) entry per
+# record, then the raw result bytes. Half the size of hex, memory-mapped by compare instead of
+# parsed, and written as outcomes arrive instead of being held until the end — so an interrupted
+# capture's .partial file is its own checkpoint journal, and a rerun keyed the same resumes it.
+STATE_MAGIC = b"NMPBST02"
+# magic, mode flags, head, chain_id, block_hash, total, checkpoint key (see _checkpoint_key)
+STATE_HEADER = struct.Struct("<8sQQQ32sQ16s")
+STATE_ENTRY = struct.Struct("<QQ")  # data offset, flags | result length
+# Mode flag: the data section holds a fixed-width digest per record instead of the result bytes.
+# Most parity runs only need to know whether the bytes match, and a digest state is orders of
+# magnitude smaller — and holds far less response-derived data on scratch.
+STATE_DIGEST_ONLY = 1
+DIGEST_BYTES = 16
+# The baseline client rejected the call with a JSON-RPC error. The error content is never stored.
+STATE_RPC_ERROR = 1 << 63
+# Set on every written entry, so a state file missing records is detected rather than read as
+# empty results.
+STATE_PRESENT = 1 << 62
+STATE_LENGTH_MASK = STATE_PRESENT - 1
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=DIGEST_BYTES).digest()
+
+
+class BaselineWriter:
+    """Write a baseline state file record by record, in any order; published only on commit.
+
+    An existing .partial with an identical header (same node identity, corpus, client build, mode
+    and record count) is reopened rather than truncated: every record it already holds is kept.
+    """
+
+    def __init__(self, path: str | Path, total: int, identity: tuple[int, int, str],
+                 digest_only: bool = False, key: bytes = bytes(DIGEST_BYTES)) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.digest_only = digest_only
+        self._partial = self.path.with_name(self.path.name + ".partial")
+        head, chain_id, block_hash = identity
+        header = STATE_HEADER.pack(STATE_MAGIC, STATE_DIGEST_ONLY if digest_only else 0,
+                                   head, chain_id, bytes.fromhex(block_hash.removeprefix("0x")), total, key)
+        self._table_end = STATE_HEADER.size + total * STATE_ENTRY.size
+        try:
+            self._handle = self._partial.open("r+b")
+            if self._handle.read(STATE_HEADER.size) == header:
+                self._end = os.fstat(self._handle.fileno()).st_size
+                if self._end >= self._table_end:
+                    return
+            self._handle.close()
+        except FileNotFoundError:
             pass
-    settled = [o if o is not None else ("transport_failure", "") for o in outcomes]
-
-    # A node under concurrent load can drop or truncate a response, which would otherwise be
-    # indistinguishable from a real defect. Re-run those records one at a time, unloaded: a
-    # record that only fails under concurrency is a load artifact, not a divergence.
-    suspect = [i for i, (category, _) in enumerate(settled) if _base_category(category) in RETRYABLE_CATEGORIES]
-    if suspect:
-        print(f"  {what}: re-running {len(suspect)} non-clean record(s) serially", flush=True)
-        recovered = 0
-        for position in suspect:
-            retried = _post(rpc_url, position + 1, params_list[position])
-            if _base_category(retried[0]) not in RETRYABLE_CATEGORIES:
-                recovered += 1
-            settled[position] = retried
-        if recovered:
-            print(f"  {what}: {recovered} recovered on retry (concurrency artifacts, not defects)", flush=True)
-    return settled
-
-
-def baseline(corpus: str, rpc_url: str, state_path: str) -> None:
-    """Replay the whole corpus and store each outcome: result hex, or an error marker.
+        self._handle = self._partial.open("w+b")
+        self._handle.write(header)
+        self._end = self._table_end
+        self._handle.truncate(self._end)
+        self._handle.flush()
+
+    def written(self, position: int) -> bool:
+        """Whether this record's outcome is already stored (by this run or a resumed one)."""
+        entry = os.pread(self._handle.fileno(), STATE_ENTRY.size, STATE_HEADER.size + position * STATE_ENTRY.size)
+        return bool(STATE_ENTRY.unpack(entry)[1] & STATE_PRESENT)
+
+    def rejected(self) -> list[int]:
+        """Positions stored as JSON-RPC errors, in corpus order."""
+        with mmap.mmap(self._handle.fileno(), self._table_end, access=mmap.ACCESS_READ) as table, \
+                memoryview(table) as view:
+            return [position for position, (_, word) in
+                    enumerate(STATE_ENTRY.iter_unpack(view[STATE_HEADER.size:self._table_end]))
+                    if word & STATE_RPC_ERROR]
+
+    def put(self, position: int, result: bytes | None) -> tuple[int, bytes]:
+        """Store one record's result bytes, or None for a JSON-RPC error; returns (word, payload)."""
+        flags = STATE_PRESENT
+        if result is None:
+            flags |= STATE_RPC_ERROR
+            result = b""
+        # The entry keeps the true length in both modes; only the payload differs.
+        payload = _digest(result) if self.digest_only else result
+        self.put_entry(position, flags | len(result), payload)
+        return flags | len(result), payload
+
+    def put_entry(self, position: int, word: int, payload: bytes) -> None:
+        """Store an entry exactly as put() encoded it — e.g. one held by the result cache."""
+        fd = self._handle.fileno()
+        os.pwrite(fd, payload, self._end)
+        os.pwrite(fd, STATE_ENTRY.pack(self._end, word), STATE_HEADER.size + position * STATE_ENTRY.size)
+        self._end += len(payload)
+
+    def commit(self) -> None:
+        self._handle.close()
+        os.replace(self._partial, self.path)
+
+    def close(self) -> None:
+        """Stop writing without publishing; the .partial stays behind for a resume."""
+        self._handle.close()
+
+
+class BaselineState:
+    """Memory-mapped read access to a committed baseline state file."""
+
+    def __init__(self, path: str | Path) -> None:
+        try:
+            self._map = _map(Path(path))
+            magic, mode, self.head, self.chain_id, block_hash, self.total, _ = STATE_HEADER.unpack_from(self._map)
+        except (OSError, ValueError, struct.error):
+            raise CorpusParityError("baseline state is missing or unreadable") from None
+        if magic != STATE_MAGIC or len(self._map) < STATE_HEADER.size + self.total * STATE_ENTRY.size:
+            self._map.close()
+            raise CorpusParityError("baseline state is missing or unreadable")
+        self.digest_only = bool(mode & STATE_DIGEST_ONLY)
+        self.block_hash = "0x" + block_hash.hex()
+
+    def _entry(self, position: int) -> tuple[int, int]:
+        offset, word = STATE_ENTRY.unpack_from(self._map, STATE_HEADER.size + position * STATE_ENTRY.size)
+        if not word & STATE_PRESENT:
+            raise CorpusParityError(f"baseline state has no outcome for record {position + 1}")
+        return offset, word
+
+    def rejected(self, position: int) -> bool:
+        """True when the baseline client answered this record (0-based) with a JSON-RPC error."""
+        return bool(self._entry(position)[1] & STATE_RPC_ERROR)
+
+    def length(self, position: int) -> int:
+        return self._entry(position)[1] & STATE_LENGTH_MASK
+
+    def result(self, position: int) -> bytes | None:
+        """Result bytes of one record, or None when the baseline client rejected it."""
+        if self.digest_only:
+            raise CorpusParityError("baseline state holds digests only, not result bytes")
+        offset, word = self._entry(position)
+        if word & STATE_RPC_ERROR:
+            return None
+        return self._map[offset:offset + (word & STATE_LENGTH_MASK)]
+
+    def matches(self, position: int, actual: bytes) -> bool:
+        """Whether a candidate result is byte-identical to the baseline's (never for a rejection)."""
+        offset, word = self._entry(position)
+        if word & STATE_RPC_ERROR or len(actual) != word & STATE_LENGTH_MASK:
+            return False
+        if self.digest_only:
+            return self._map[offset:offset + DIGEST_BYTES] == _digest(actual)
+        return self._map[offset:offset + len(actual)] == actual
+
+    def is_prefix_of(self, position: int, actual: bytes) -> bool:
+        """Whether the baseline result is a strict prefix of the candidate's."""
+        length = self.length(position)
+        return length < len(actual) and self.matches(position, actual[:length])
+
+    def close(self) -> None:
+        self._map.close()
+
+
+# Runner-local cache of baseline results across runs, one append-only file per result identity
+# (chain, block hash, client build, caller-supplied identity such as the image digest, state mode)
+# holding (record digest, state entry word, payload) triples. Results are deterministic for that
+# identity, so a repeat baseline of the same corpus on the same snapshot and image reads them back
+# instead of replaying. It holds raw response bytes: VM-local scratch only, never artifacted.
+CACHE_MAGIC = b"NMPBRC01"
+CACHE_HEADER = struct.Struct("<8s16s")  # magic, result identity
+CACHE_ENTRY = struct.Struct("<16sQ")  # record digest, flags | result length
+CACHE_MAX_BYTES = _env_int("RPC_BENCH_BASELINE_CACHE_MAX_BYTES", 20 * 1024 ** 3)
+CACHE_MAX_AGE_DAYS = _env_int("RPC_BENCH_BASELINE_CACHE_MAX_AGE_DAYS", 30)
+
+
+class BaselineCache:
+    """One result identity's cache file, locked for the duration of a baseline.
+
+    Only successful results are cached: a JSON-RPC error may be the node's transient state (a
+    timeout, a resource limit) rather than the call's answer, so errored records always replay.
+    """
+
+    def __init__(self, directory: Path, identity: bytes, digest_only: bool) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self.digest_only = digest_only
+        self.path = directory / f"{identity.hex()}.cache"
+        header = CACHE_HEADER.pack(CACHE_MAGIC, identity)
+        self._handle = self.path.open("a+b")
+        try:
+            # A second baseline on the same identity (a parallel sweep) runs uncached, not torn.
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._handle.close()
+            raise
+        self._entries: dict[bytes, tuple[int, int]] = {}
+        fd = self._handle.fileno()
+        end = os.fstat(fd).st_size
+        if os.pread(fd, CACHE_HEADER.size, 0) != header:
+            os.truncate(fd, 0)
+            os.write(fd, header)
+            end = CACHE_HEADER.size
+        offset = CACHE_HEADER.size
+        while offset + CACHE_ENTRY.size <= end:
+            record, word = CACHE_ENTRY.unpack(os.pread(fd, CACHE_ENTRY.size, offset))
+            size = self._size(word)
+            if offset + CACHE_ENTRY.size + size > end:
+                break
+            self._entries[record] = (word, offset + CACHE_ENTRY.size)
+            offset += CACHE_ENTRY.size + size
+        # Drop a torn tail so appends land after the last whole entry.
+        os.truncate(fd, offset)
+        self._end = offset
+        os.utime(self.path)
+
+    def _size(self, word: int) -> int:
+        return DIGEST_BYTES if self.digest_only else word & STATE_LENGTH_MASK
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, record: bytes) -> tuple[int, bytes] | None:
+        """(state entry word, payload) for a record digest, or None on a miss."""
+        found = self._entries.get(record)
+        if found is None:
+            return None
+        word, offset = found
+        return word, os.pread(self._handle.fileno(), self._size(word), offset)
+
+    def add(self, record: bytes, word: int, payload: bytes) -> None:
+        if word & STATE_RPC_ERROR or record in self._entries:
+            return
+        os.write(self._handle.fileno(), CACHE_ENTRY.pack(record, word) + payload)
+        self._entries[record] = (word, self._end + CACHE_ENTRY.size)
+        self._end += CACHE_ENTRY.size + len(payload)
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+def _evict_cache(directory: Path, keep: Path) -> None:
+    """Drop cache files unused for CACHE_MAX_AGE_DAYS, then least recently used ones until the
+    directory fits in CACHE_MAX_BYTES. `keep`, the file this run just used, always survives."""
+    files = []
+    for path in directory.glob("*.cache"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if path != keep and time.time() - stat.st_mtime > CACHE_MAX_AGE_DAYS * 86400:
+            path.unlink(missing_ok=True)
+        else:
+            files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= CACHE_MAX_BYTES:
+            break
+        if path != keep:
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def _open_cache(directory: str, rpc_url: str, identity: str, chain_id: int, block_hash: str,
+                digest_only: bool) -> BaselineCache | None:
+    version = _client_version(_shard_urls(rpc_url)[0])
+    if not version and not identity:
+        print("  baseline: the node does not report a client version and no cache identity was given "
+              "— not using the result cache", flush=True)
+        return None
+    key = _digest(json.dumps([chain_id, block_hash, version, identity, digest_only]).encode())
+    try:
+        return BaselineCache(Path(directory), key, digest_only)
+    except BlockingIOError:
+        print("  baseline: the result cache is in use by another run — not using it", flush=True)
+        return None
+
+
+def baseline(corpus: str, rpc_url: str, state_path: str, digest_only: bool = False,
+             batch_size: int = 1, adaptive: bool = False, cache_dir: str | None = None,
+             cache_identity: str = "", processes: int = 1, timings_path: str | None = None,
+             warmup_seconds: int = 0) -> None:
+    """Replay the whole corpus and store each outcome: result bytes, or an error flag.
 
     JSON-RPC errors are recorded (not fatal) — a captured corpus legitimately contains
     calls that fail at the pinned head, and both clients rejecting a call is agreement.
     Transport/invalid responses still abort: they indicate node trouble, not call content.
+    With digest_only, each result is stored as a fixed-width digest plus its length.
+
+    A failed or interrupted capture leaves its .partial state behind; rerunning against the same
+    corpus and node resumes it, replaying only the records it does not yet hold.
+
+    A comma-separated rpc_url shards the replay across identical nodes (same snapshot and client
+    build, verified up front); the state is the same as from one node.
+
+    With cache_dir, successful results are also kept in a runner-local cache keyed by chain, block
+    hash, client version, cache_identity (e.g. the image digest and node flags) and a digest of
+    each record's request; a later baseline with the same key takes them from there instead of
+    replaying. The cache is evicted by age and total size after every run.
+
+    With processes > 1, responses are fetched and classified in that many worker processes.
+
+    With timings_path, the replay's per-record latencies are written there in the `timings`
+    schema (see _write_replay_timings); warmup_seconds is recorded in its meta.
     """
-    params_list = load_corpus(corpus)
-    head, chain_id, block_hash = _node_identity(rpc_url)
-    results: list[str] = []
-    failures: dict[str, int] = {}
-    error_count = 0
-    for category, result in _replay(rpc_url, params_list, "baseline"):
-        if _base_category(category) == "rpc_error":
-            error_count += 1
-            results.append(ERROR_MARKER)
-            continue
-        if category is not None:
-            failures[category] = failures.get(category, 0) + 1
-        results.append(result)
-    if failures:
-        summary = " ".join(f"{key}={value}" for key, value in sorted(failures.items()))
-        raise CorpusParityError(
-            f"baseline replay had failures over {len(params_list)} records: {summary}"
-        )
-    state = Path(state_path)
-    state.parent.mkdir(parents=True, exist_ok=True)
-    with gzip.open(state, "wt", encoding="utf-8") as output:
-        json.dump({"total": len(results), "head": head, "chain_id": chain_id,
-                   "block_hash": block_hash, "results": results}, output)
-    print(f"baseline captured: {len(results)} outcomes ({error_count} rpc_error) at head {head}")
-    if error_count:
-        error_indexes = [str(i) for i, r in enumerate(results, start=1) if r == ERROR_MARKER]
-        print(f"baseline rpc_error indexes (first {min(len(error_indexes), 40)}): {' '.join(error_indexes[:40])}")
+    with load_corpus(corpus) as records:
+        head, chain_id, block_hash = _shared_identity(rpc_url)
+        writer = BaselineWriter(state_path, len(records), (head, chain_id, block_hash), digest_only,
+                                _checkpoint_key(records, rpc_url))
+        cache = (_open_cache(cache_dir, rpc_url, cache_identity, chain_id, block_hash, digest_only)
+                 if cache_dir else None)
+        matrix = _TimingsMatrix(len(records), 1, batch_size > 1) if timings_path else None
+        failures: dict[str, int] = {}
+
+        def consume(position: int, outcome: Outcome) -> None:
+            category, result = outcome
+            if _base_category(category) == "rpc_error":
+                writer.put(position, None)
+            elif category is not None:
+                failures[category] = failures.get(category, 0) + 1
+            else:
+                entry = writer.put(position, result)
+                if cache is not None:
+                    cache.add(_digest(records.body(position)), *entry)
+
+        try:
+            if cache is not None and len(cache):
+                hits = 0
+                for position in range(len(records)):
+                    if not writer.written(position):
+                        entry = cache.get(_digest(records.body(position)))
+                        if entry is not None:
+                            writer.put_entry(position, *entry)
+                            hits += 1
+                print(f"  baseline: {hits}/{len(records)} records from the result cache", flush=True)
+            started = time.perf_counter()
+            limits = _replay(rpc_url, records, "baseline", consume, batch_size, writer.written, adaptive, processes,
+                             functools.partial(matrix.observe, 0) if matrix is not None else None)
+            if matrix is not None:
+                _write_replay_timings(matrix, timings_path, "baseline", (head, chain_id, block_hash), rpc_url,
+                                      batch_size, adaptive, limits, warmup_seconds, time.perf_counter() - started)
+            if failures:
+                summary = " ".join(f"{key}={value}" for key, value in sorted(failures.items()))
+                raise CorpusParityError(
+                    f"baseline replay had failures over {len(records)} records: {summary}"
+                )
+            error_positions = writer.rejected()
+        except BaseException:
+            # Kept, not discarded: every record the .partial holds is a settled outcome to resume from.
+            writer.close()
+            raise
+        finally:
+            if cache is not None:
+                cache.close()
+                _evict_cache(cache.path.parent, cache.path)
+        writer.commit()
+        print(f"baseline captured: {len(records)} outcomes ({len(error_positions)} rpc_error) at head {head}"
+              + (" (digests only)" if digest_only else ""))
+        if error_positions:
+            error_indexes = [str(i + 1) for i in error_positions]
+            print(f"baseline rpc_error indexes (first {min(len(error_indexes), 40)}): {' '.join(error_indexes[:40])}")
 
 
 # Opt-in: characterise each divergence word by word. This derives from response bytes, so it is
@@ -375,129 +1286,331 @@ def _describe_divergence(index: int, expected: str, actual: str) -> dict:
     return entry
 
 
-def compare(corpus: str, rpc_url: str, state_path: str, report_path: str,
-            baseline_client: str, candidate_client: str, diffs_path: str | None = None) -> bool:
-    """Replay the corpus against a candidate node and diff against the stored baseline."""
-    params_list = load_corpus(corpus)
-    try:
-        with gzip.open(state_path, "rt", encoding="utf-8") as source:
-            state = json.load(source)
-        baseline_results = state["results"]
-        baseline_head, baseline_chain = state["head"], state["chain_id"]
-        baseline_hash = state.get("block_hash")
-    except (OSError, json.JSONDecodeError, KeyError, TypeError):
-        raise CorpusParityError("baseline state is missing or unreadable") from None
-    if not isinstance(baseline_results, list) or len(baseline_results) != len(params_list):
-        raise CorpusParityError(
-            f"baseline state has {len(baseline_results)} results but the corpus has {len(params_list)}"
-        )
+def _check_identity(rpc_url: str, state: BaselineState, role: str) -> None:
     # A snapshot at a different head/chain would mismatch on every record — report it as the
-    # fixture problem it is, not as client divergence.
-    head, chain_id, block_hash = _node_identity(rpc_url)
-    if (head, chain_id) != (baseline_head, baseline_chain) or (
-            baseline_hash is not None and block_hash != baseline_hash):
+    # fixture problem it is, not as client divergence. Every shard endpoint must match.
+    head, chain_id, block_hash = _shared_identity(rpc_url)
+    if (head, chain_id, block_hash) != (state.head, state.chain_id, state.block_hash):
         raise CorpusParityError(
-            f"node identity mismatch: baseline head={baseline_head} chain={baseline_chain} "
-            f"hash={baseline_hash} vs candidate head={head} chain={chain_id} hash={block_hash} "
+            f"node identity mismatch: baseline head={state.head} chain={state.chain_id} "
+            f"hash={state.block_hash} vs {role} head={head} chain={chain_id} hash={block_hash} "
             f"— align the snapshots before comparing"
         )
 
-    report = {field: 0 for field in PARITY_COUNTER_FIELDS}
-    report["total"] = len(params_list)
-    divergences: list[dict[str, int | str]] = []
-
-    diff_records: list[dict] = []
-
-    def diverge(index: int, kind: str) -> None:
-        if len(divergences) < MAX_DIVERGENCE_INDEXES:
-            divergences.append({"index": index, "kind": kind})
-
-    replayed = _replay(rpc_url, params_list, "compare")
-
-    # Second gate: anything that disagrees with the baseline is re-run unloaded before it is
-    # counted. A real semantic divergence reproduces; a load artifact does not. Cheap because
-    # disagreements are rare, and it keeps the concurrent replay from inventing defects.
-    disputed = [
-        i for i, (category, actual) in enumerate(replayed)
-        if not (category is None and actual == baseline_results[i])
-        and not (_base_category(category) == "rpc_error" and baseline_results[i] == ERROR_MARKER)
-    ]
-    if disputed:
-        print(f"  compare: re-verifying {len(disputed)} disagreement(s) serially", flush=True)
-        settled = 0
-        for position in disputed:
-            retried = _post(rpc_url, position + 1, params_list[position])
-            if retried != replayed[position]:
-                settled += 1
-            replayed[position] = retried
-        if settled:
-            print(f"  compare: {settled} disagreement(s) changed outcome on retry", flush=True)
-
-    for index, (category, actual) in enumerate(replayed, start=1):
-        expected = baseline_results[index - 1]
-        if _base_category(category) == "transport_failure":
-            report["candidate_transport_failures"] += 1
-            diverge(index, "candidate_transport_failure")
-        elif _base_category(category) == "invalid_response":
-            report["candidate_invalid_responses"] += 1
-            diverge(index, "candidate_invalid_response")
-        elif _base_category(category) == "rpc_error":
-            if expected == ERROR_MARKER:
-                report["both_rpc_errors"] += 1
-            else:
-                report["candidate_rpc_errors"] += 1
-                diverge(index, "candidate_rpc_error")
-        elif expected == ERROR_MARKER:
-            report["baseline_rpc_errors"] += 1
-            diverge(index, "baseline_rpc_error")
-        elif actual == expected:
-            report["matched"] += 1
-        elif len(actual) != len(expected):
-            if len(expected) < len(actual) and actual.startswith(expected):
-                report["baseline_shorter"] += 1
-                diverge(index, "baseline_shorter")
-            elif len(actual) < len(expected) and expected.startswith(actual):
-                report["candidate_shorter"] += 1
-                diverge(index, "candidate_shorter")
-            else:
-                report["length_mismatches"] += 1
-                diverge(index, "length_mismatch")
+
+def _refetch_baseline(rpc_url: str, records: Corpus, state: BaselineState,
+                      positions: list[int]) -> dict[int, bytes]:
+    """Full baseline bytes for disputed records of a digest-only state, from the baseline node.
+
+    Only bytes that hash to the stored digest are returned: a baseline node that no longer
+    reproduces its own answer cannot characterise anything.
+    """
+    _check_identity(rpc_url, state, "baseline node")
+    fetched: dict[int, bytes] = {}
+    for position, (category, result) in zip(positions, _rerun(rpc_url, records, positions)):
+        if category is None and state.matches(position, result):
+            fetched[position] = result
+    if len(fetched) < len(positions):
+        print(f"  compare: baseline node did not reproduce {len(positions) - len(fetched)} "
+              f"record(s); those are counted but not characterised", flush=True)
+    return fetched
+
+
+# Compare checkpoint journal, beside the baseline state: a header carrying the checkpoint key, one
+# status byte per record, then an append-only log of disputed outcomes (position, category, result
+# bytes). Matches and both-error agreements are only counted, so a byte each is all they need.
+JOURNAL_MAGIC = b"NMPCJR01"
+JOURNAL_HEADER = struct.Struct("<8s16sQ")  # magic, checkpoint key, total
+JOURNAL_DISPUTE = struct.Struct("<QHQ")  # position, category length, result length
+JOURNAL_PENDING, JOURNAL_MATCHED, JOURNAL_BOTH_RPC_ERRORS, JOURNAL_DISPUTED = range(4)
+
+
+class CompareJournal:
+    """Per-record compare outcomes on disk, so an interrupted compare resumes where it stopped.
+
+    A dispute's log entry is written before its status byte, so a status read as disputed always
+    has its outcome in the log; a torn tail entry has no status and is simply replayed.
+    """
+
+    def __init__(self, path: Path, total: int, key: bytes) -> None:
+        self.path = path
+        header = JOURNAL_HEADER.pack(JOURNAL_MAGIC, key, total)
+        self._log_start = JOURNAL_HEADER.size + total
+        try:
+            self._handle = path.open("r+b")
+            if self._handle.read(JOURNAL_HEADER.size) == header:
+                self._end = os.fstat(self._handle.fileno()).st_size
+                if self._end >= self._log_start:
+                    self._status = mmap.mmap(self._handle.fileno(), self._log_start)
+                    return
+            self._handle.close()
+        except FileNotFoundError:
+            pass
+        self._handle = path.open("w+b")
+        self._handle.write(header)
+        self._handle.truncate(self._log_start)
+        self._handle.flush()
+        self._end = self._log_start
+        self._status = mmap.mmap(self._handle.fileno(), self._log_start)
+
+    def settled(self, position: int) -> bool:
+        return self._status[JOURNAL_HEADER.size + position] != JOURNAL_PENDING
+
+    def count(self, status: int) -> int:
+        marker = bytes((status,))
+        return sum(self._status[start:start + (1 << 20)].count(marker)
+                   for start in range(JOURNAL_HEADER.size, self._log_start, 1 << 20))
+
+    def record(self, position: int, status: int, outcome: Outcome | None = None) -> None:
+        if outcome is not None:
+            category = (outcome[0] or "").encode("ascii")
+            entry = JOURNAL_DISPUTE.pack(position, len(category), len(outcome[1])) + category + outcome[1]
+            os.pwrite(self._handle.fileno(), entry, self._end)
+            self._end += len(entry)
+        self._status[JOURNAL_HEADER.size + position] = status
+
+    def disputes(self) -> dict[int, Outcome]:
+        """Disputed outcomes recorded by earlier runs, by position."""
+        found: dict[int, Outcome] = {}
+        offset = self._log_start
+        while offset + JOURNAL_DISPUTE.size <= self._end:
+            position, category_length, result_length = JOURNAL_DISPUTE.unpack(
+                os.pread(self._handle.fileno(), JOURNAL_DISPUTE.size, offset))
+            body = os.pread(self._handle.fileno(), category_length + result_length, offset + JOURNAL_DISPUTE.size)
+            if len(body) < category_length + result_length:
+                break
+            if position < len(self._status) - JOURNAL_HEADER.size \
+                    and self._status[JOURNAL_HEADER.size + position] == JOURNAL_DISPUTED:
+                found[position] = (body[:category_length].decode("ascii") or None, body[category_length:])
+            offset += JOURNAL_DISPUTE.size + len(body)
+        # Drop the torn tail, if any, so later entries do not land after garbage.
+        self._end = offset
+        return found
+
+    def close(self) -> None:
+        self._status.close()
+        self._handle.close()
+
+
+class _Candidate:
+    """One candidate's side of a compare: its journal, counters and disputed outcomes."""
+
+    def __init__(self, records: Corpus, state: BaselineState, state_path: str, rpc_url: str,
+                 client: str, report_path: str, diffs_path: str | None) -> None:
+        self.records, self.state, self.rpc_url = records, state, rpc_url
+        self.client, self.report_path, self.diffs_path = client, report_path, diffs_path
+        self.report = {field: 0 for field in PARITY_COUNTER_FIELDS}
+        self.report["total"] = len(records)
+        state_stat = Path(state_path).stat()
+        # One journal per (state, report): repeats of one image under distinct labels never share one.
+        self.journal = CompareJournal(
+            Path(state_path).with_name(f"{Path(state_path).name}.{_digest(str(Path(report_path).resolve()).encode()).hex()}.journal"),
+            len(records), _checkpoint_key(records, rpc_url, state_stat.st_size, state_stat.st_mtime_ns),
+        )
+        self.disputed = self.journal.disputes()
+        self.report["matched"] = self.journal.count(JOURNAL_MATCHED)
+        self.report["both_rpc_errors"] = self.journal.count(JOURNAL_BOTH_RPC_ERRORS)
+
+    def consume(self, position: int, outcome: Outcome) -> None:
+        category, actual = outcome
+        if category is None and self.state.matches(position, actual):
+            self.report["matched"] += 1
+            self.journal.record(position, JOURNAL_MATCHED)
+        elif _base_category(category) == "rpc_error" and self.state.rejected(position):
+            self.report["both_rpc_errors"] += 1
+            self.journal.record(position, JOURNAL_BOTH_RPC_ERRORS)
         else:
-            report["content_mismatches"] += 1
-            diverge(index, "content_mismatch")
-            if diffs_path:
-                diff_records.append(_describe_divergence(index, expected, actual))
-
-    if diffs_path and diff_records:
-        diffs_target = Path(diffs_path)
-        diffs_target.parent.mkdir(parents=True, exist_ok=True)
-        with diffs_target.open("w", encoding="utf-8") as handle:
-            json.dump({"baseline_client": baseline_client, "candidate_client": candidate_client,
-                       "total_divergences": report["content_mismatches"],
-                       "recorded": len(diff_records), "diffs": diff_records}, handle)
-        print(f"  wrote {len(diff_records)} divergence characterisations to {diffs_target.name}")
-
-    document = {"baseline_client": baseline_client, "candidate_client": candidate_client,
-                "divergences": divergences, **report}
-    target = Path(report_path)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("w", encoding="utf-8") as output:
-        json.dump(document, output, sort_keys=True, separators=(",", ":"))
-        output.write("\n")
-    clean = report["matched"] + report["both_rpc_errors"] == report["total"]
-    defects = " ".join(
-        f"{key}={value}" for key, value in report.items()
-        if value and key not in ("total", "matched", "both_rpc_errors")
-    )
-    agreement = f"{report['matched']}/{report['total']} matched"
-    if report["both_rpc_errors"]:
-        agreement += f" + {report['both_rpc_errors']} both-error"
-    print(f"parity {candidate_client} vs {baseline_client}: {agreement}"
-          + (f" ({defects})" if defects else ""))
-    if divergences:
-        preview = " ".join(str(d["index"]) for d in divergences[:40])
-        print(f"divergent corpus indexes (first {min(len(divergences), 40)}): {preview}")
-    return clean
+            self.disputed[position] = outcome
+            self.journal.record(position, JOURNAL_DISPUTED, outcome)
+
+    def settle(self, baseline_client: str, baseline_rpc_url: str | None, batch_size: int) -> bool:
+        """Re-verify the disputes, classify them and write the report; True when clean."""
+        records, state, report, disputed = self.records, self.state, self.report, self.disputed
+        candidate_client, diffs_path = self.client, self.diffs_path
+        divergences: list[dict[str, int | str]] = []
+        diff_records: list[dict] = []
+
+        def diverge(index: int, kind: str) -> None:
+            if len(divergences) < MAX_DIVERGENCE_INDEXES:
+                divergences.append({"index": index, "kind": kind})
+
+        # Second gate: anything that disagrees with the baseline is re-run unloaded before it is
+        # counted. A real semantic divergence reproduces; a load artifact does not. Cheap because
+        # disagreements are rare, and it keeps the concurrent replay from inventing defects.
+        positions = sorted(disputed)
+        if positions:
+            print(f"  compare {candidate_client}: re-verifying {len(positions)} disagreement(s) serially",
+                  flush=True)
+            settled = 0
+            for position, retried in zip(positions, _rerun(self.rpc_url, records, positions, batch_size > 1)):
+                if retried != disputed[position]:
+                    settled += 1
+                disputed[position] = retried
+            if settled:
+                print(f"  compare {candidate_client}: {settled} disagreement(s) changed outcome on retry",
+                      flush=True)
+
+        baseline_bytes: dict[int, bytes] = {}
+        if diffs_path and state.digest_only:
+            content = [p for p in positions if disputed[p][0] is None and not state.rejected(p)
+                       and not state.matches(p, disputed[p][1]) and state.length(p) == len(disputed[p][1])]
+            if content:
+                baseline_bytes = _refetch_baseline(baseline_rpc_url, records, state, content)
+
+        for position in positions:
+            index = position + 1
+            category, actual = disputed[position]
+            if _base_category(category) == "transport_failure":
+                report["candidate_transport_failures"] += 1
+                diverge(index, "candidate_transport_failure")
+            elif _base_category(category) == "invalid_response":
+                report["candidate_invalid_responses"] += 1
+                diverge(index, "candidate_invalid_response")
+            elif _base_category(category) == "rpc_error":
+                if state.rejected(position):
+                    report["both_rpc_errors"] += 1
+                else:
+                    report["candidate_rpc_errors"] += 1
+                    diverge(index, "candidate_rpc_error")
+            elif state.rejected(position):
+                report["baseline_rpc_errors"] += 1
+                diverge(index, "baseline_rpc_error")
+            elif state.matches(position, actual):
+                report["matched"] += 1
+            elif state.length(position) != len(actual):
+                if state.is_prefix_of(position, actual):
+                    report["baseline_shorter"] += 1
+                    diverge(index, "baseline_shorter")
+                elif not state.digest_only and len(actual) < state.length(position) \
+                        and state.result(position).startswith(actual):
+                    report["candidate_shorter"] += 1
+                    diverge(index, "candidate_shorter")
+                else:
+                    report["length_mismatches"] += 1
+                    diverge(index, "length_mismatch")
+            else:
+                report["content_mismatches"] += 1
+                diverge(index, "content_mismatch")
+                expected = baseline_bytes.get(position) if state.digest_only else state.result(position)
+                if diffs_path and expected is not None:
+                    diff_records.append(_describe_divergence(index, "0x" + expected.hex(), "0x" + actual.hex()))
+
+        if diffs_path and diff_records:
+            diffs_target = Path(diffs_path)
+            diffs_target.parent.mkdir(parents=True, exist_ok=True)
+            with diffs_target.open("w", encoding="utf-8") as handle:
+                json.dump({"baseline_client": baseline_client, "candidate_client": candidate_client,
+                           "total_divergences": report["content_mismatches"],
+                           "recorded": len(diff_records), "diffs": diff_records}, handle)
+            print(f"  wrote {len(diff_records)} divergence characterisations to {diffs_target.name}")
+
+        document = {"baseline_client": baseline_client, "candidate_client": candidate_client,
+                    "divergences": divergences, **report}
+        target = Path(self.report_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8") as output:
+            json.dump(document, output, sort_keys=True, separators=(",", ":"))
+            output.write("\n")
+        # The report now holds everything the journal did.
+        self.journal.path.unlink(missing_ok=True)
+        clean = report["matched"] + report["both_rpc_errors"] == report["total"]
+        defects = " ".join(
+            f"{key}={value}" for key, value in report.items()
+            if value and key not in ("total", "matched", "both_rpc_errors")
+        )
+        agreement = f"{report['matched']}/{report['total']} matched"
+        if report["both_rpc_errors"]:
+            agreement += f" + {report['both_rpc_errors']} both-error"
+        print(f"parity {candidate_client} vs {baseline_client}: {agreement}"
+              + (f" ({defects})" if defects else ""))
+        if divergences:
+            preview = " ".join(str(d["index"]) for d in divergences[:40])
+            print(f"divergent corpus indexes (first {min(len(divergences), 40)}): {preview}")
+        return clean
+
+
+def compare_each(corpus: str, state_path: str, baseline_client: str,
+                 candidates: Sequence[tuple[str, str, str, str | None]],
+                 baseline_rpc_url: str | None = None, batch_size: int = 1,
+                 adaptive: bool = False, processes: int = 1,
+                 timings_paths: Sequence[str | None] | None = None, warmup_seconds: int = 0) -> list[bool]:
+    """Diff several candidate nodes against one stored baseline in a single concurrent replay.
+
+    candidates holds (rpc_url, client label, report path, diffs path or None) per candidate. Every
+    candidate replays the whole corpus at the same time on one event loop, each checked against
+    the same memory-mapped baseline and journaled on its own, so an N-way gate takes about the
+    wall time of its slowest candidate rather than the sum. Returns one clean flag per candidate.
+
+    Each response is checked against the memory-mapped baseline as it arrives and then dropped;
+    only disagreements are held, so memory stays constant however large the corpus.
+
+    Against a digest-only state a same-length disagreement is a content mismatch and a longer
+    candidate is checked for the baseline as its prefix; a shorter candidate cannot be told
+    apart from any other length mismatch. Full bytes are fetched from baseline_rpc_url only for
+    disputed records, and only to characterise them for a diffs path.
+
+    Outcomes are journaled beside the state as they settle; an interrupted compare rerun with the
+    same corpus, state, candidate build and report path resumes from the journal.
+
+    timings_paths, one per candidate (None to skip one), has each candidate's per-record latencies
+    written in the `timings` schema, as baseline's timings_path does.
+    """
+    if not candidates:
+        raise CorpusParityError("no candidates to compare")
+    timings_paths = list(timings_paths or [None] * len(candidates))
+    if len(timings_paths) != len(candidates):
+        raise CorpusParityError("give one timings path (or None) per candidate")
+    if len({client for _, client, _, _ in candidates}) < len(candidates) \
+            or len({str(Path(report).resolve()) for _, _, report, _ in candidates}) < len(candidates):
+        raise CorpusParityError("candidate labels and report paths must be distinct")
+    with load_corpus(corpus) as records:
+        state = BaselineState(state_path)
+        if state.total != len(records):
+            raise CorpusParityError(
+                f"baseline state has {state.total} results but the corpus has {len(records)}"
+            )
+        for rpc_url, client, _, _ in candidates:
+            _check_identity(rpc_url, state, f"candidate {client}" if len(candidates) > 1 else "candidate")
+        if state.digest_only and not baseline_rpc_url and any(diffs for _, _, _, diffs in candidates):
+            print("  compare: digest-only baseline and no --baseline-rpc-url — divergences are counted "
+                  "but not characterised", flush=True)
+            candidates = [(rpc_url, client, report, None) for rpc_url, client, report, _ in candidates]
+
+        sides: list[_Candidate] = []
+        try:
+            try:
+                for rpc_url, client, report_path, diffs_path in candidates:
+                    sides.append(_Candidate(records, state, state_path, rpc_url, client, report_path, diffs_path))
+                matrices = [_TimingsMatrix(len(records), 1, batch_size > 1) if path else None for path in timings_paths]
+                started = time.perf_counter()
+                limits = _replay_each(
+                    records, [(side.rpc_url, "compare" if len(sides) == 1 else f"compare {side.client}",
+                               side.consume, side.journal.settled,
+                               functools.partial(matrix.observe, 0) if matrix is not None else None)
+                              for side, matrix in zip(sides, matrices)],
+                    batch_size, adaptive, processes)
+                wall = time.perf_counter() - started
+                for side, matrix, path, side_limits in zip(sides, matrices, timings_paths, limits):
+                    if matrix is not None:
+                        _write_replay_timings(matrix, path, "compare" if len(sides) == 1 else f"compare {side.client}",
+                                              (state.head, state.chain_id, state.block_hash), side.rpc_url,
+                                              batch_size, adaptive, side_limits, warmup_seconds, wall)
+            finally:
+                for side in sides:
+                    side.journal.close()
+            return [side.settle(baseline_client, baseline_rpc_url, batch_size) for side in sides]
+        finally:
+            state.close()
+
+
+def compare(corpus: str, rpc_url: str, state_path: str, report_path: str,
+            baseline_client: str, candidate_client: str, diffs_path: str | None = None,
+            baseline_rpc_url: str | None = None, batch_size: int = 1, adaptive: bool = False,
+            processes: int = 1, timings_path: str | None = None, warmup_seconds: int = 0) -> bool:
+    """Replay the corpus against one candidate node and diff against the stored baseline."""
+    return compare_each(corpus, state_path, baseline_client,
+                        [(rpc_url, candidate_client, report_path, diffs_path)],
+                        baseline_rpc_url, batch_size, adaptive, processes, [timings_path], warmup_seconds)[0]
 
 
 # A 50k-record replay is a long silent stretch; emit progress often enough that an operator can
@@ -520,98 +1633,504 @@ def _base_category(category: str | None) -> str | None:
     return category.split(":", 1)[0] if category else category
 
 
-def _timed_post(url: str, index: int, params: list) -> tuple[float, str]:
-    """POST one eth_call and return (elapsed_ms, outcome). Never raises."""
+# A paced dispatch that leaves later than this while a concurrency slot was free means the client's
+# event loop, not the node, fell behind the schedule.
+GENERATOR_LAG_SECONDS = 0.010
+
+
+async def _timed_send(pool: Pool, records: Corpus, positions: Sequence[int],
+                      batched: bool) -> tuple[float, list[str]]:
+    """Send one call or batch and return (elapsed_ms, outcome per record). Never raises."""
     started = time.perf_counter()
     try:
-        category, _ = _post(url, index, params)
+        categories = [category for category, _ in await _send(pool, records, positions, batched)]
     except Exception:  # a replay must never lose the whole matrix to one bad record
-        category = "transport_failure"
-    return (time.perf_counter() - started) * 1000.0, category or "ok"
+        categories = ["transport_failure"] * len(positions)
+    return (time.perf_counter() - started) * 1000.0, [category or "ok" for category in categories]
 
 
-def timings(corpus: str, rpc_url: str, out_path: str, passes: int, rps: float, concurrency: int,
-            warmup_seconds: int = 0) -> None:
-    """Replay every record `passes` times and write a record x pass matrix of latencies.
+async def _paced_replay(rpc_url: str, records: Corpus, schedule: Iterable[tuple[int, Sequence[int], Any]],
+                        rps: float, concurrency: int, batch_size: int, started_at: float,
+                        observe: Callable[[Any, Sequence[int], float, list[str]], None],
+                        ) -> tuple[LatencyHistogram, set[int], float]:
+    """Send schedule's (call order, positions, tag) entries with at most `concurrency` in flight,
+    paced so call `order` is due `order / rps` seconds after started_at (rps 0 = unpaced), and
+    hand each completion to observe(tag, positions, elapsed_ms, outcomes).
 
-    Unlike the k6 cells, which sample the corpus uniformly with replacement and tag every request
-    identically, this walks the corpus in order so each row is attributable to one record. Output
-    carries record indexes and milliseconds only — no request or response content.
+    Returns a histogram of the dispatch lags in ms (a paced run holds one per call, so never a
+    list), the one-second intervals in which the client itself fell behind schedule, and the
+    perf_counter time of the last dispatch.
     """
-    params_list = load_corpus(corpus)
-    total_records = len(params_list)
-    if passes < 1:
-        raise CorpusParityError("passes must be >= 1")
-    head, chain_id, block_hash = _node_identity(rpc_url)
-
-    grid: list[list[float | None]] = [[None] * passes for _ in range(total_records)]
-    status: list[list[str]] = [[""] * passes for _ in range(total_records)]
-    outcomes: dict[str, int] = {}
-    lock = threading.Lock()
-    started_at = time.perf_counter()
-
-    def run_one(order: int, record: int, current_pass: int) -> None:
-        # Pace by submission order so the achieved rate matches --rps regardless of latency.
-        if rps > 0:
-            due = started_at + order / rps
-            delay = due - time.perf_counter()
-            if delay > 0:
-                time.sleep(delay)
-        elapsed, outcome = _timed_post(rpc_url, record + 1, params_list[record])
-        with lock:
-            grid[record][current_pass] = elapsed
-            status[record][current_pass] = outcome
-            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    lags = LatencyHistogram()
+    generator_bound: set[int] = set()
+    dispatched = started_at
+    batched = batch_size > 1
+    pool = _open_pool(rpc_url, batch_size)
+    slots = asyncio.Semaphore(max(1, concurrency))
+    in_flight: set[asyncio.Task] = set()
+
+    async def measure(intended: float, positions: Sequence[int], tag: Any) -> None:
+        try:
+            queued = max(0.0, time.perf_counter() - intended) * 1000.0
+            elapsed, results = await _timed_send(pool, records, positions, batched)
+        finally:
+            slots.release()
+        observe(tag, positions, elapsed + queued, results)
 
-    schedule = [(p * total_records + i, i, p) for p in range(passes) for i in range(total_records)]
-    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
-        for _ in pool.map(lambda a: run_one(*a), schedule):
-            pass
+    try:
+        # One dispatcher owns the schedule; requests run as tasks, so a slow response delays
+        # no other request's scheduled start — only a full set of slots can hold one back.
+        for order, positions, tag in schedule:
+            if rps > 0:
+                intended = started_at + order / rps
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if not slots.locked() and time.perf_counter() - intended > GENERATOR_LAG_SECONDS:
+                    generator_bound.add(int(intended - started_at))
+                await slots.acquire()
+                lags.record(max(0.0, time.perf_counter() - intended) * 1000.0)
+            else:
+                # Unpaced is closed-loop by definition: there is no schedule to lag behind.
+                await slots.acquire()
+                intended = time.perf_counter()
+            dispatched = time.perf_counter()
+            task = asyncio.create_task(measure(intended, positions, tag))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    finally:
+        for task in in_flight:
+            task.cancel()
+        await pool.close()
+    return lags, generator_bound, dispatched
+
+
+class _TimingsMatrix:
+    """Latency and outcome per record and pass, streamed into histograms as completions arrive.
+
+    write() produces timings.csv (unless grid is off), timings.hist.json, timings-batches.csv
+    for batched runs, and timings.meta.json — the same files whichever replay filled it.
+    """
 
-    wall = time.perf_counter() - started_at
-    issued = len(schedule)
-    target = Path(out_path)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    with target.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.writer(handle)
-        header = ["record_index"]
-        for p in range(passes):
-            header += [f"pass_{p + 1}_ms", f"pass_{p + 1}_status"]
-        writer.writerow(header)
-        for record in range(total_records):
-            row: list[str] = [str(record + 1)]
-            for p in range(passes):
-                value = grid[record][p]
-                row += ["" if value is None else f"{value:.3f}", status[record][p]]
-            writer.writerow(row)
-
-    achieved = issued / wall if wall > 0 else 0.0
+    def __init__(self, total_records: int, passes: int, batched: bool, grid: bool = True) -> None:
+        self.total_records, self.passes, self.batched, self.grid = total_records, passes, batched, grid
+        # Per pass, one unboxed double and one outcome code per record: a records x passes grid of
+        # Python floats and strings is tens of millions of objects at a million records.
+        self.latencies = [array.array("d", [math.nan]) * total_records for _ in range(passes)] if grid else []
+        self.codes = [array.array("H", [0]) * total_records for _ in range(passes)] if grid else []
+        self.names: list[str] = [""]
+        self.code_of: dict[str, int] = {}
+        self.histograms: dict[str, LatencyHistogram] = {"all": LatencyHistogram()}
+        self.batches: list[tuple[int, int, int, float, int]] = []
+        self.outcomes: dict[str, int] = {}
+
+    def observe(self, current_pass: int, positions: Sequence[int], elapsed: float, results: list[str]) -> None:
+        share = elapsed / len(positions)
+        for record, outcome in zip(positions, results):
+            if self.grid:
+                if outcome not in self.code_of:
+                    self.code_of[outcome] = len(self.names)
+                    self.names.append(outcome)
+                self.latencies[current_pass][record] = share
+                self.codes[current_pass][record] = self.code_of[outcome]
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            self.histograms["all"].record(share)
+            self.histograms.setdefault(outcome, LatencyHistogram()).record(share)
+        if self.batched:
+            self.batches.append((current_pass + 1, positions[0] + 1, len(positions), elapsed,
+                                 sum(outcome != "ok" for outcome in results)))
+
+    def write(self, target: Path, meta: dict[str, Any]) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if self.grid:
+            with target.open("w", encoding="utf-8", newline="") as handle:
+                writer = csv.writer(handle)
+                header = ["record_index"]
+                for p in range(self.passes):
+                    header += [f"pass_{p + 1}_ms", f"pass_{p + 1}_status"]
+                writer.writerow(header)
+                for record in range(self.total_records):
+                    row: list[str] = [str(record + 1)]
+                    for p in range(self.passes):
+                        value = self.latencies[p][record]
+                        row += ["" if math.isnan(value) else f"{value:.3f}", self.names[self.codes[p][record]]]
+                    writer.writerow(row)
+        with target.with_name("timings.hist.json").open("w", encoding="utf-8") as handle:
+            json.dump({"unit": UNIT, "sub_buckets": SUB_BUCKETS,
+                       "histograms": {name: histogram.to_json() for name, histogram in sorted(self.histograms.items())}},
+                      handle, sort_keys=True, separators=(",", ":"))
+        if self.batched:
+            with target.with_name("timings-batches.csv").open("w", encoding="utf-8", newline="") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(["pass", "first_record_index", "calls", "batch_ms", "failures"])
+                for current_pass, first, calls, elapsed, failures in sorted(self.batches):
+                    writer.writerow([current_pass, first, calls, f"{elapsed:.3f}", failures])
+        with target.with_name("timings.meta.json").open("w", encoding="utf-8") as handle:
+            json.dump(meta, handle, sort_keys=True, separators=(",", ":"))
+
+
+def _timings_meta(identity: tuple[int, int, str], rpc_url: str, total_records: int, passes: int, issued: int,
+                  rps: float, achieved: float, concurrency: int, batch_size: int, warmup_seconds: int,
+                  outcomes: dict[str, int]) -> dict[str, Any]:
+    head, chain_id, block_hash = identity
     # A matrix compared against one taken at a different head, rate or concurrency is meaningless,
     # and nothing in the CSV records those. Emit them beside it.
-    meta = {
+    return {
         "head": head, "chain_id": chain_id, "block_hash": block_hash,
         "records": total_records, "passes": passes, "requests": issued,
         "target_rps": rps, "achieved_rps": round(achieved, 2), "concurrency": concurrency,
+        "batch_size": batch_size,
+        # HTTP and IPC matrices differ by the transport's own cost; never compare across them.
+        "transport": _transport(_shard_urls(rpc_url)[0]),
+        # Where each latency is measured from: the scheduled start (paced, open-loop) or the send.
+        "latency_origin": "scheduled" if rps > 0 else "sent",
         # Seconds of discarded warm-up load applied before this matrix. 0 = measured cold; a cold
         # matrix is otherwise indistinguishable from a warm one, and the difference is ~60% on p99.
         "warmup_seconds": warmup_seconds,
         "outcomes": {k: v for k, v in sorted(outcomes.items())},
     }
-    meta_target = target.with_name("timings.meta.json")
-    with meta_target.open("w", encoding="utf-8") as handle:
-        json.dump(meta, handle, sort_keys=True, separators=(",", ":"))
-    summary = ", ".join(f"{k}={v}" for k, v in sorted(outcomes.items()))
-    print(f"timings: {total_records} records x {passes} passes = {issued} requests "
-          f"at head {head} chain {chain_id}")
-    print(f"  wall {wall:.1f}s, achieved {achieved:.1f} rps"
-          + (f" (target {rps:g})" if rps > 0 else " (unpaced)"))
-    print(f"  outcomes: {summary}")
-    failed = sum(v for k, v in outcomes.items() if k != "ok")
-    if failed:
-        share = failed / issued * 100
-        print(f"  WARNING: {failed}/{issued} ({share:.1f}%) did not return a result — "
-              f"latency percentiles over this matrix are NOT comparable to a clean run, "
-              f"because failures return early and pull every percentile down", flush=True)
+
+
+def _write_replay_timings(matrix: _TimingsMatrix, out_path: str, what: str, identity: tuple[int, int, str],
+                          rpc_url: str, batch_size: int, adaptive: bool, limits: Sequence[Limits],
+                          warmup_seconds: int, wall: float) -> None:
+    """Write the latencies a parity replay observed, as one pass of a `timings` matrix.
+
+    The replay is closed-loop at REPLAY_CONCURRENCY per endpoint, or adaptive, so its meta says
+    which replay produced it; an adaptive one records the in-flight limit its controllers settled
+    at per endpoint and the range they moved through. Records taken from the result cache or
+    settled by an interrupted earlier run were not replayed, and the serial retries were not
+    timed: their cells stay empty, and cells_skipped counts the records never exchanged.
+    """
+    timed = sum(matrix.outcomes.values())
+    concurrency = REPLAY_CONCURRENCY
+    endpoints = len(_shard_urls(rpc_url))
+    if adaptive and limits:
+        concurrency, lowest, highest = (round(sum(column) / endpoints) for column in zip(*limits))
+    meta = _timings_meta(identity, rpc_url, matrix.total_records, 1, timed, 0.0, timed / wall if wall > 0 else 0.0,
+                         concurrency, batch_size, warmup_seconds, matrix.outcomes)
+    meta["replay"] = what.split()[0]
+    meta["adaptive_concurrency"] = adaptive
+    if adaptive and limits:
+        meta["concurrency_min"], meta["concurrency_max"] = lowest, highest
+    meta["cells_skipped"] = matrix.total_records - timed
+    matrix.write(Path(out_path), meta)
+    overall = matrix.histograms["all"]
+    print(f"  {what}: timed {timed}/{matrix.total_records} records, p50 {overall.percentile(0.5):.2f} ms, "
+          f"p99 {overall.percentile(0.99):.2f} ms", flush=True)
+
+
+def timings(corpus: str, rpc_url: str, out_path: str, passes: int, rps: float, concurrency: int,
+            warmup_seconds: int = 0, batch_size: int = 1, grid: bool = True) -> None:
+    """Replay every record `passes` times and write a record x pass matrix of latencies.
+
+    Unlike the k6 cells, which sample the corpus uniformly with replacement and tag every request
+    identically, this walks the corpus in order so each row is attributable to one record. Output
+    carries record indexes and milliseconds only — no request or response content.
+
+    With batch_size > 1 each matrix cell is the batch's latency amortized over its calls, and the
+    whole-batch latencies go to timings-batches.csv beside it; --rps still counts calls.
+
+    A paced run is open-loop: each request has a scheduled start, and its latency runs from that
+    start, not from when it was actually sent. When the node saturates every concurrency slot,
+    requests queue and the wait is charged to them, as a real client at that rate would see it —
+    instead of silently slowing the schedule and reporting the tail as if it never happened.
+
+    Latencies also stream into log-bucketed histograms, overall and per outcome, written to
+    timings.hist.json; with grid=False that, the meta and any batch file are the only output, and
+    memory no longer grows with records x passes.
+    """
+    with load_corpus(corpus) as records:
+        total_records = len(records)
+        if passes < 1:
+            raise CorpusParityError("passes must be >= 1")
+        if batch_size < 1:
+            raise CorpusParityError("batch size must be >= 1")
+        head, chain_id, block_hash = _node_identity(rpc_url)
+
+        matrix = _TimingsMatrix(total_records, passes, batch_size > 1, grid)
+        started_at = time.perf_counter()
+        issued = passes * total_records
+        batched = batch_size > 1
+
+        schedule = ((p * total_records + i, range(i, min(i + batch_size, total_records)), p)
+                    for p in range(passes) for i in range(0, total_records, batch_size))
+        lags, generator_bound, _ = asyncio.run(_paced_replay(
+            rpc_url, records, schedule, rps, concurrency, batch_size, started_at, matrix.observe))
+
+        wall = time.perf_counter() - started_at
+        achieved = issued / wall if wall > 0 else 0.0
+        meta = _timings_meta((head, chain_id, block_hash), rpc_url, total_records, passes, issued, rps,
+                             achieved, concurrency, batch_size, warmup_seconds, matrix.outcomes)
+        if rps > 0:
+            # How far behind schedule requests left (waiting for a slot included), and how many
+            # one-second intervals of the run fell behind with a slot free — the client's fault.
+            meta["dispatch_lag_ms"] = {name: round(lags.percentile(share), 3)
+                                       for name, share in (("p50", 0.5), ("p99", 0.99), ("max", 1.0))}
+            meta["generator_bound_seconds"] = len(generator_bound)
+        matrix.write(Path(out_path), meta)
+        outcomes = matrix.outcomes
+        summary = ", ".join(f"{k}={v}" for k, v in sorted(outcomes.items()))
+        print(f"timings: {total_records} records x {passes} passes = {issued} requests "
+              f"at head {head} chain {chain_id}" + (f" in batches of {batch_size}" if batched else ""))
+        print(f"  wall {wall:.1f}s, achieved {achieved:.1f} rps"
+              + (f" (target {rps:g})" if rps > 0 else " (unpaced)"))
+        print(f"  outcomes: {summary}")
+        overall = matrix.histograms["all"]
+        print(f"  latency p50 {overall.percentile(0.5):.2f} ms, p90 {overall.percentile(0.9):.2f} ms, "
+              f"p99 {overall.percentile(0.99):.2f} ms (all outcomes, histogram precision ~1%)")
+        if rps > 0:
+            lag = meta["dispatch_lag_ms"]
+            print(f"  dispatch lag vs schedule: p50 {lag['p50']:.1f} ms, p99 {lag['p99']:.1f} ms, "
+                  f"max {lag['max']:.1f} ms (charged to each request's latency)")
+        if generator_bound:
+            offsets = " ".join(f"{second}s" for second in sorted(generator_bound)[:20])
+            print(f"  WARNING: the client, not the node, fell behind schedule in {len(generator_bound)} "
+                  f"one-second interval(s) (first: {offsets}) — latencies there overstate the node's; "
+                  f"lower --rps or spread the load over more runners", flush=True)
+        failed = sum(v for k, v in outcomes.items() if k != "ok")
+        if failed:
+            share = failed / issued * 100
+            print(f"  WARNING: {failed}/{issued} ({share:.1f}%) did not return a result — "
+                  f"latency percentiles over this matrix are NOT comparable to a clean run, "
+                  f"because failures return early and pull every percentile down", flush=True)
+
+
+# A saturation step must reach this share of its target rate to count as sustained. The open-loop
+# dispatcher only falls behind when every concurrency slot is busy (or the client itself is the
+# bottleneck, which the step reports), so a shortfall means the node stopped keeping up.
+SATURATION_RATE_TOLERANCE = 0.95
+# More non-ok outcomes than this make a step unsustainable however fast it looks: failures return
+# early and pull the percentiles down.
+SATURATION_MAX_FAILURE_SHARE = 0.01
+# The knee: the fastest sustained step whose p99 is still within this factor of the first step's.
+KNEE_LATENCY_FACTOR = 2.0
+
+
+def _saturation_rates(start_rps: float, max_rps: float, growth: float):
+    rate = start_rps
+    while not max_rps or rate < max_rps:
+        yield round(rate, 2)
+        rate *= growth
+    yield max_rps
+
+
+def _paced_step(rpc_url: str, records: Corpus, cursor: int, rate: float, count: int, concurrency: int,
+                batch_size: int) -> tuple[LatencyHistogram, dict[str, int], float, LatencyHistogram, int, int]:
+    """Replay `count` calls open-loop at `rate`, continuing through the corpus from cursor (wrapping).
+
+    Returns the latency histogram, outcome counts, achieved rate, dispatch lag histogram, the number
+    of one-second intervals the client itself fell behind in, and the cursor to continue from.
+    """
+    total = len(records)
+    histogram = LatencyHistogram()
+    outcomes: dict[str, int] = {}
+    last = 0
+
+    def schedule():
+        nonlocal cursor, last
+        for order in range(0, count, batch_size):
+            last = min(batch_size, count - order)
+            positions = [(cursor + offset) % total for offset in range(last)]
+            cursor = (cursor + last) % total
+            yield order, positions, None
+
+    def observe(_: Any, positions: Sequence[int], elapsed: float, results: list[str]) -> None:
+        for outcome in results:
+            histogram.record(elapsed / len(positions))
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    started = time.perf_counter()
+    lags, generator_bound, dispatched = asyncio.run(_paced_replay(
+        rpc_url, records, schedule(), rate, concurrency, batch_size, started, observe))
+    # On schedule, the last dispatch leaves (count - last) / rate after the start, so this is
+    # exactly the target rate; every second the dispatcher waited for a slot lowers it.
+    achieved = count / (dispatched - started + last / rate)
+    return histogram, outcomes, achieved, lags, len(generator_bound), cursor
+
+
+def saturate(corpus: str, rpc_url: str, out_path: str, slo_p99_ms: float, start_rps: float,
+             max_rps: float = 0.0, growth: float = 1.5, step_seconds: float = 10.0,
+             concurrency_levels: Sequence[int] = (16,), batch_size: int = 1,
+             warmup_seconds: int = 0) -> dict:
+    """Ramp a paced replay through rising rates until the node stops keeping up, per concurrency.
+
+    Each step replays `rate x step_seconds` calls open-loop, continuing through the corpus where
+    the previous step stopped, and the ramp multiplies the rate by `growth` until a step's p99
+    exceeds the SLO, its achieved rate falls short of the target, more than 1% of its calls fail,
+    or max_rps (0 = no cap) has been run. The report carries the same identity fields as
+    timings.meta.json plus, per concurrency level, every step's latency and outcome counts, the
+    highest sustained rate and the knee — and nothing derived from request or response content.
+    """
+    with load_corpus(corpus) as records:
+        total = len(records)
+        if slo_p99_ms <= 0 or start_rps <= 0 or step_seconds <= 0:
+            raise CorpusParityError("SLO, start rate and step length must be > 0")
+        if growth <= 1:
+            raise CorpusParityError("growth must be > 1")
+        if max_rps and max_rps < start_rps:
+            raise CorpusParityError("max rate must be >= the start rate")
+        if not concurrency_levels or min(concurrency_levels) < 1:
+            raise CorpusParityError("concurrency levels must be >= 1")
+        if batch_size < 1:
+            raise CorpusParityError("batch size must be >= 1")
+        head, chain_id, block_hash = _node_identity(rpc_url)
+        cursor = 0
+
+        def run_step(rate: float, concurrency: int) -> dict:
+            nonlocal cursor
+            count = max(1, math.ceil(rate * step_seconds))
+            histogram, outcomes, achieved, lags, generator_bound, cursor = _paced_step(
+                rpc_url, records, cursor, rate, count, concurrency, batch_size)
+            failed = sum(value for outcome, value in outcomes.items() if outcome != "ok")
+            step = {
+                "target_rps": rate, "achieved_rps": round(achieved, 2), "requests": count,
+                "p50_ms": round(histogram.percentile(0.5), 3), "p90_ms": round(histogram.percentile(0.9), 3),
+                "p99_ms": round(histogram.percentile(0.99), 3),
+                "dispatch_lag_p99_ms": round(lags.percentile(0.99), 3),
+                "generator_bound_seconds": generator_bound,
+                "outcomes": {k: v for k, v in sorted(outcomes.items())},
+            }
+            if failed > SATURATION_MAX_FAILURE_SHARE * count:
+                step["limit"] = "failures"
+            elif achieved < SATURATION_RATE_TOLERANCE * rate:
+                step["limit"] = "rate"
+            elif step["p99_ms"] > slo_p99_ms:
+                step["limit"] = "slo"
+            else:
+                step["limit"] = None
+            verdict = "sustained" if step["limit"] is None else f"NOT sustained ({step['limit']})"
+            print(f"  concurrency {concurrency}, target {rate:g} rps: achieved {achieved:.1f} rps, "
+                  f"p50 {step['p50_ms']:.2f} ms, p99 {step['p99_ms']:.2f} ms, {failed} failed — {verdict}",
+                  flush=True)
+            if generator_bound:
+                print(f"  WARNING: the client fell behind schedule in {generator_bound} one-second "
+                      f"interval(s) of this step — a rate shortfall here may be the runner's, not the node's",
+                      flush=True)
+            return step
+
+        levels = []
+        print(f"saturate: {total} records at head {head} chain {chain_id}, p99 SLO {slo_p99_ms:g} ms, "
+              f"{step_seconds:g}s steps" + (f", batches of {batch_size}" if batch_size > 1 else ""), flush=True)
+        for concurrency in concurrency_levels:
+            steps = []
+            stopped_by = "max_rps"
+            for rate in _saturation_rates(start_rps, max_rps, growth):
+                steps.append(run_step(rate, concurrency))
+                if steps[-1]["limit"] is not None:
+                    stopped_by = steps[-1]["limit"]
+                    break
+            sustained = [step for step in steps if step["limit"] is None]
+            knee = [step for step in sustained if step["p99_ms"] <= KNEE_LATENCY_FACTOR * steps[0]["p99_ms"]]
+            levels.append({
+                "concurrency": concurrency, "stopped_by": stopped_by,
+                "max_sustainable_rps": sustained[-1]["target_rps"] if sustained else None,
+                "knee_rps": knee[-1]["target_rps"] if knee else None,
+                "steps": steps,
+            })
+        best = max((level for level in levels if level["max_sustainable_rps"] is not None),
+                   key=lambda level: level["max_sustainable_rps"], default=None)
+        report = {
+            "head": head, "chain_id": chain_id, "block_hash": block_hash,
+            "records": total, "batch_size": batch_size, "transport": _transport(rpc_url),
+            "latency_origin": "scheduled",
+            "warmup_seconds": warmup_seconds,
+            "slo_p99_ms": slo_p99_ms, "step_seconds": step_seconds, "growth": growth,
+            "max_sustainable_rps": best["max_sustainable_rps"] if best else None,
+            "max_sustainable_concurrency": best["concurrency"] if best else None,
+            "levels": levels,
+        }
+        target = Path(out_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8") as handle:
+            json.dump(report, handle, sort_keys=True, separators=(",", ":"))
+        for level in levels:
+            print(f"  concurrency {level['concurrency']}: max sustainable {level['max_sustainable_rps']} rps, "
+                  f"knee {level['knee_rps']} rps, stopped by {level['stopped_by']}")
+        if best:
+            print(f"capacity: {best['max_sustainable_rps']:g} rps at p99 <= {slo_p99_ms:g} ms "
+                  f"(concurrency {best['concurrency']})", flush=True)
+        else:
+            print(f"capacity: no step sustained its rate at p99 <= {slo_p99_ms:g} ms — lower --start-rps", flush=True)
+        return report
+
+
+# Convergence warm-up: a window is steady when no more than this share of its calls fail (a cold
+# node fails a few percent while its caches fill) and it sustained its rate; the warm-up ends
+# once enough consecutive steady windows also agree on p50 and p99 within the tolerance.
+WARMUP_MAX_FAILURE_SHARE = 0.001
+
+
+def _steady(windows: Sequence[dict], rps: float, tolerance: float) -> bool:
+    if any(window["failures"] > WARMUP_MAX_FAILURE_SHARE * window["requests"]
+           or window["achieved_rps"] < SATURATION_RATE_TOLERANCE * rps for window in windows):
+        return False
+    return all(max(window[key] for window in windows) <= (1 + tolerance) * min(window[key] for window in windows)
+               for key in ("p50_ms", "p99_ms"))
+
+
+def warmup(corpus: str, rpc_url: str, out_path: str, rps: float, max_seconds: float, concurrency: int = 16,
+           window_seconds: float = 10.0, stable_windows: int = 3, tolerance: float = 0.1,
+           batch_size: int = 1) -> dict:
+    """Warm a node with a paced replay until its latency converges, for at most max_seconds.
+
+    The replay runs in windows of window_seconds, continuing through the corpus, and stops after
+    the first stable_windows consecutive windows that are steady (see WARMUP_MAX_FAILURE_SHARE)
+    and whose p50s and p99s each stay within `tolerance` of one another. A node that never
+    settles gets the whole max_seconds, as a fixed warm-up would. The report carries the seconds
+    of load actually applied — what a measured cell's warmup_seconds should state — plus every
+    window's latency and counts, and nothing derived from request or response content.
+    """
+    with load_corpus(corpus) as records:
+        if rps <= 0 or max_seconds <= 0 or window_seconds <= 0:
+            raise CorpusParityError("rate, maximum and window length must be > 0")
+        if stable_windows < 2 or tolerance < 0:
+            raise CorpusParityError("need at least 2 stable windows and a non-negative tolerance")
+        if concurrency < 1 or batch_size < 1:
+            raise CorpusParityError("concurrency and batch size must be >= 1")
+        head, chain_id, block_hash = _node_identity(rpc_url)
+        print(f"warmup: up to {max_seconds:g}s at {rps:g} rps; done after {stable_windows} steady "
+              f"{window_seconds:g}s windows within {tolerance:.0%}", flush=True)
+        windows: list[dict] = []
+        cursor = 0
+        converged = False
+        started = time.perf_counter()
+        while not converged:
+            remaining = max_seconds - (time.perf_counter() - started)
+            if remaining <= 0:
+                break
+            count = max(1, math.ceil(rps * min(window_seconds, remaining)))
+            histogram, outcomes, achieved, _, _, cursor = _paced_step(
+                rpc_url, records, cursor, rps, count, concurrency, batch_size)
+            windows.append({
+                "requests": count, "achieved_rps": round(achieved, 2),
+                "failures": sum(value for outcome, value in outcomes.items() if outcome != "ok"),
+                "p50_ms": round(histogram.percentile(0.5), 3), "p99_ms": round(histogram.percentile(0.99), 3),
+            })
+            converged = len(windows) >= stable_windows and _steady(windows[-stable_windows:], rps, tolerance)
+            window = windows[-1]
+            print(f"  window {len(windows)}: achieved {achieved:.1f} rps, p50 {window['p50_ms']:.2f} ms, "
+                  f"p99 {window['p99_ms']:.2f} ms, {window['failures']} failed", flush=True)
+        applied = math.ceil(time.perf_counter() - started)
+        report = {
+            "head": head, "chain_id": chain_id, "block_hash": block_hash,
+            "records": len(records), "batch_size": batch_size, "transport": _transport(rpc_url),
+            "target_rps": rps, "concurrency": concurrency, "max_seconds": max_seconds,
+            "window_seconds": window_seconds, "stable_windows": stable_windows, "tolerance": tolerance,
+            "converged": converged, "warmup_seconds": applied, "windows": windows,
+        }
+        target = Path(out_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with target.open("w", encoding="utf-8") as handle:
+            json.dump(report, handle, sort_keys=True, separators=(",", ":"))
+        if converged:
+            print(f"warmup: converged after {applied}s ({len(windows)} windows)", flush=True)
+        else:
+            print(f"  WARNING: latency did not converge within {max_seconds:g}s — measurements that follow "
+                  f"may still include warm-up effects", flush=True)
+        return report
 
 
 def main(argv: Sequence[str] | None = None) -> int:
@@ -623,19 +2142,34 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     baseline_parser = subparsers.add_parser("baseline", help="replay the corpus and store baseline responses")
     baseline_parser.add_argument("--corpus", required=True)
-    baseline_parser.add_argument("--rpc-url", required=True)
-    baseline_parser.add_argument("--state", required=True, help="VM-local state file (gzip JSON)")
-
-    compare_parser = subparsers.add_parser("compare", help="replay the corpus and diff against the baseline")
+    baseline_parser.add_argument("--rpc-url", required=True,
+                                 help="node endpoint; comma-separate identical nodes to shard the replay across them")
+    baseline_parser.add_argument("--state", required=True, help="VM-local state file (binary, memory-mapped by compare)")
+    baseline_parser.add_argument("--digest", action="store_true",
+                                 help="store a fixed-width digest per record instead of the result bytes")
+    baseline_parser.add_argument("--cache-dir", default=None,
+                                 help="VM-local directory caching results across runs (raw bytes — never artifact it)")
+    baseline_parser.add_argument("--cache-identity", default="",
+                                 help="what else pins the results besides block and client version, "
+                                      "e.g. the image digest and node flags")
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="replay the corpus and diff against the baseline; repeat --rpc-url, "
+                        "--candidate-client and --report to fan out to several candidates at once")
     compare_parser.add_argument("--corpus", required=True)
-    compare_parser.add_argument("--rpc-url", required=True)
+    compare_parser.add_argument("--rpc-url", required=True, action="append",
+                                help="candidate endpoint; comma-separate identical nodes to shard its replay")
     compare_parser.add_argument("--state", required=True)
-    compare_parser.add_argument("--report", required=True, help="counts-only report destination (safe to publish)")
+    compare_parser.add_argument("--report", required=True, action="append",
+                                help="counts-only report destination (safe to publish), one per candidate")
     compare_parser.add_argument("--baseline-client", required=True)
-    compare_parser.add_argument("--candidate-client", required=True)
-    compare_parser.add_argument("--diffs", default=None,
-                                help="optional: characterise each content mismatch word by word "
-                                     "(derived from response bytes — opt in deliberately)")
+    compare_parser.add_argument("--candidate-client", required=True, action="append")
+    compare_parser.add_argument("--diffs", default=None, action="append",
+                                help="optional, one per candidate: characterise each content mismatch "
+                                     "word by word (derived from response bytes — opt in deliberately)")
+    compare_parser.add_argument("--baseline-rpc-url", default=None,
+                                help="baseline node still serving the same head; with a --digest state, "
+                                     "the only source of full bytes for --diffs")
 
     timings_parser = subparsers.add_parser(
         "timings", help="replay the corpus N times and write a record x pass latency matrix")
@@ -647,25 +2181,95 @@ def main(argv: Sequence[str] | None = None) -> int:
     timings_parser.add_argument("--concurrency", type=int, default=16, help="in-flight requests")
     timings_parser.add_argument("--warmup-seconds", type=int, default=0,
                                 help="discarded warm-up seconds applied before the matrix (recorded in meta)")
+    timings_parser.add_argument("--histogram-only", action="store_true",
+                                help="skip the record x pass matrix; write only the histograms and meta")
+
+    saturate_parser = subparsers.add_parser(
+        "saturate", help="ramp the paced replay's rate until p99 breaks the SLO or the node falls behind")
+    saturate_parser.add_argument("--corpus", required=True)
+    saturate_parser.add_argument("--rpc-url", required=True)
+    saturate_parser.add_argument("--out", required=True, help="capacity report destination (counts + ms only)")
+    saturate_parser.add_argument("--slo-p99-ms", type=float, required=True, help="p99 latency a step must stay under")
+    saturate_parser.add_argument("--start-rps", type=float, required=True, help="rate of the first step")
+    saturate_parser.add_argument("--max-rps", type=float, default=0.0, help="last rate to try; 0 = no cap")
+    saturate_parser.add_argument("--growth", type=float, default=1.5, help="rate multiplier between steps")
+    saturate_parser.add_argument("--step-seconds", type=float, default=10.0, help="length of each step at its rate")
+    saturate_parser.add_argument("--concurrency", type=int, nargs="+", default=[16],
+                                 help="in-flight limits to ramp, one full ramp each")
+    saturate_parser.add_argument("--warmup-seconds", type=int, default=0,
+                                 help="discarded warm-up seconds applied before the ramp (recorded in the report)")
+
+    warmup_parser = subparsers.add_parser(
+        "warmup", help="paced replay that stops once windowed latency and failures stop changing")
+    warmup_parser.add_argument("--corpus", required=True)
+    warmup_parser.add_argument("--rpc-url", required=True)
+    warmup_parser.add_argument("--out", required=True, help="warm-up report destination (counts + ms only)")
+    warmup_parser.add_argument("--rps", type=float, required=True, help="warm-up request rate")
+    warmup_parser.add_argument("--max-seconds", type=float, required=True,
+                               help="longest warm-up to apply if latency never converges")
+    warmup_parser.add_argument("--concurrency", type=int, default=16, help="in-flight requests")
+    warmup_parser.add_argument("--window-seconds", type=float, default=10.0, help="length of each measured window")
+    warmup_parser.add_argument("--stable-windows", type=int, default=3,
+                               help="consecutive steady windows that end the warm-up")
+    warmup_parser.add_argument("--tolerance", type=float, default=0.1,
+                               help="largest relative spread of p50 and of p99 across those windows")
+
+    for replay_parser in (baseline_parser, compare_parser, timings_parser, saturate_parser, warmup_parser):
+        replay_parser.add_argument("--batch-size", type=int, default=1,
+                                   help="eth_calls per JSON-RPC batch POST; 1 = single calls")
+    for replay_parser in (baseline_parser, compare_parser):
+        replay_parser.add_argument("--adaptive-concurrency", action="store_true",
+                                   help="grow in-flight requests while latency and errors stay flat, "
+                                        "halve on degradation (AIMD); reports where it settled")
+        replay_parser.add_argument("--processes", type=int, default=1,
+                                   help="worker processes to fetch and classify responses in; 1 = in-process")
+        replay_parser.add_argument("--warmup-seconds", type=int, default=0,
+                                   help="discarded warm-up seconds applied before the replay (recorded in the --timings meta)")
+    baseline_parser.add_argument("--timings", default=None,
+                                 help="also write the replay's per-record latencies as a timings.csv (indexes + ms only)")
+    compare_parser.add_argument("--timings", default=None, action="append",
+                                help="optional, one per candidate: its replay's per-record latencies as a timings.csv")
 
     arguments = parser.parse_args(argv)
     try:
         if arguments.command == "validate":
-            print(f"corpus OK: {len(load_corpus(arguments.corpus))} records")
+            with load_corpus(arguments.corpus) as records:
+                print(f"corpus OK: {len(records)} records")
             return 0
         if arguments.command == "timings":
             timings(arguments.corpus, arguments.rpc_url, arguments.out,
                     arguments.passes, arguments.rps, arguments.concurrency,
-                    arguments.warmup_seconds)
+                    arguments.warmup_seconds, arguments.batch_size, not arguments.histogram_only)
+            return 0
+        if arguments.command == "saturate":
+            saturate(arguments.corpus, arguments.rpc_url, arguments.out, arguments.slo_p99_ms,
+                     arguments.start_rps, arguments.max_rps, arguments.growth, arguments.step_seconds,
+                     arguments.concurrency, arguments.batch_size, arguments.warmup_seconds)
+            return 0
+        if arguments.command == "warmup":
+            warmup(arguments.corpus, arguments.rpc_url, arguments.out, arguments.rps, arguments.max_seconds,
+                   arguments.concurrency, arguments.window_seconds, arguments.stable_windows,
+                   arguments.tolerance, arguments.batch_size)
             return 0
         if arguments.command == "baseline":
-            baseline(arguments.corpus, arguments.rpc_url, arguments.state)
+            baseline(arguments.corpus, arguments.rpc_url, arguments.state, arguments.digest,
+                     arguments.batch_size, arguments.adaptive_concurrency, arguments.cache_dir,
+                     arguments.cache_identity, arguments.processes, arguments.timings,
+                     arguments.warmup_seconds)
             return 0
-        clean = compare(
-            arguments.corpus, arguments.rpc_url, arguments.state, arguments.report,
-            arguments.baseline_client, arguments.candidate_client, arguments.diffs,
+        candidates = len(arguments.rpc_url)
+        if len(arguments.candidate_client) != candidates or len(arguments.report) != candidates \
+                or any(extra is not None and len(extra) != candidates for extra in (arguments.diffs, arguments.timings)):
+            raise CorpusParityError(
+                "give one --candidate-client, --report (and --diffs, --timings, if any) per --rpc-url")
+        clean = compare_each(
+            arguments.corpus, arguments.state, arguments.baseline_client,
+            list(zip(arguments.rpc_url, arguments.candidate_client, arguments.report,
+                     arguments.diffs or [None] * candidates)),
+            arguments.baseline_rpc_url, arguments.batch_size, arguments.adaptive_concurrency,
+            arguments.processes, arguments.timings, arguments.warmup_seconds,
         )
-        return 0 if clean else 1
+        return 0 if all(clean) else 1
     except CorpusParityError as error:
         print(f"error: {error}", file=sys.stderr)
         return 2
@@ -16,12 +16,16 @@ import csv
 import json
 import re
 import math
+import operator
+import platform
+import random
 import shutil
 import sys
 from pathlib import Path
 from typing import Any, Sequence
 
 from corpus_parity import PARITY_COUNTER_FIELDS, PARITY_LABEL_FIELDS
+from latency_histogram import SUB_BUCKETS, UNIT, LatencyHistogram, merged
 
 # metric name -> aggregate fields copied into the sanitized summary
 METRIC_FIELDS: dict[str, tuple[str, ...]] = {
@@ -36,8 +40,9 @@ BLOCK_HASH_PATTERN = re.compile(r"0x[0-9a-f]{64}")
 STATUS_PATTERN = re.compile(r"(ok|transport_failure|invalid_response|rpc_error)(:-?\d+)?")
 
 STAGED_FILENAMES = ("summary.json", "parity.json", "jsonbench-summary.md", "summaries.manifest",
-                    "timings.csv", "parity-diffs.json", "timings.meta.json",
-                    "resources.json")
+                    "timings.csv", "timings-batches.csv", "parity-diffs.json", "timings.meta.json",
+                    "timings.hist.json", "resources.json", "noise.json")
+TIMINGS_BATCHES_HEADER = ["pass", "first_record_index", "calls", "batch_ms", "failures"]
 
 
 class CorpusResultsError(Exception):
@@ -176,6 +181,42 @@ def _validate_timings(path: Path) -> None:
                     raise CorpusResultsError(f"timings.csv: row {number} holds an unexpected status")
 
 
+def _validate_timings_batches(path: Path) -> None:
+    """Batch latencies: the fixed header and numbers only."""
+    with path.open(encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        if next(reader, None) != TIMINGS_BATCHES_HEADER:
+            raise CorpusResultsError(f"{path.name}: unexpected header")
+        for number, row in enumerate(reader, start=2):
+            if len(row) != len(TIMINGS_BATCHES_HEADER):
+                raise CorpusResultsError(f"{path.name}: row {number} has {len(row)} columns")
+            try:
+                values = [float(cell) for cell in row]
+            except ValueError:
+                raise CorpusResultsError(f"{path.name}: row {number} holds a non-numeric value") from None
+            if not all(math.isfinite(value) and value >= 0 for value in values):
+                raise CorpusResultsError(f"{path.name}: row {number} holds a negative or non-finite value")
+
+
+def _read_histograms(path: Path) -> dict[str, LatencyHistogram]:
+    """Parse and validate a timings.hist.json: bucket indexes and counts under outcome names only."""
+    with path.open("r", encoding="utf-8") as source:
+        data = json.load(source)
+    if not isinstance(data, dict) or set(data) != {"unit", "sub_buckets", "histograms"} \
+            or data["unit"] != UNIT or data["sub_buckets"] != SUB_BUCKETS \
+            or not isinstance(data["histograms"], dict) or "all" not in data["histograms"]:
+        raise CorpusResultsError(f"{path.name} does not match the histogram schema")
+    histograms: dict[str, LatencyHistogram] = {}
+    for name, histogram in data["histograms"].items():
+        if name != "all" and not STATUS_PATTERN.fullmatch(name):
+            raise CorpusResultsError(f"{path.name}: unexpected histogram name")
+        try:
+            histograms[name] = LatencyHistogram.from_json(histogram)
+        except ValueError:
+            raise CorpusResultsError(f"{path.name}: malformed histogram") from None
+    return histograms
+
+
 def _validate_parity_diffs(path: Path) -> None:
     """Exact schema for the divergence characterisation — numbers only, never response words.
 
@@ -225,9 +266,26 @@ def _validate_timings_meta(path: Path) -> None:
         data = json.load(source)
     required = {"head", "chain_id", "block_hash", "records", "passes", "requests",
                 "target_rps", "achieved_rps", "concurrency", "warmup_seconds", "outcomes"}
-    if not isinstance(data, dict) or set(data) != required:
+    # Keys newer runs add; a meta written before them still stages.
+    optional = {"batch_size", "transport", "latency_origin", "dispatch_lag_ms", "generator_bound_seconds",
+                "replay", "adaptive_concurrency", "concurrency_min", "concurrency_max", "cells_skipped"}
+    if not isinstance(data, dict) or not required <= set(data) <= required | optional:
         raise CorpusResultsError(f"{path.name} does not match the timings metadata schema")
-    for key in ("head", "chain_id", "records", "passes", "requests", "concurrency", "warmup_seconds"):
+    if data.get("transport", "http") not in ("http", "ipc", "ws"):
+        raise CorpusResultsError(f"{path.name}: transport is not 'http', 'ipc' or 'ws'")
+    # Set when the matrix is a by-product of a parity replay rather than a `timings` run.
+    if data.get("replay", "baseline") not in ("baseline", "compare") \
+            or not isinstance(data.get("adaptive_concurrency", False), bool):
+        raise CorpusResultsError(f"{path.name}: replay or adaptive_concurrency is malformed")
+    if data.get("latency_origin", "sent") not in ("scheduled", "sent"):
+        raise CorpusResultsError(f"{path.name}: latency_origin is not 'scheduled' or 'sent'")
+    lag = data.get("dispatch_lag_ms", {"p50": 0})
+    if not isinstance(lag, dict) or not set(lag) <= {"p50", "p99", "max"} \
+            or any(isinstance(v, bool) or not isinstance(v, (int, float)) or v < 0 for v in lag.values()):
+        raise CorpusResultsError(f"{path.name}: dispatch_lag_ms is not a set of non-negative numbers")
+    for key in ("head", "chain_id", "records", "passes", "requests", "concurrency", "warmup_seconds",
+                *({"batch_size", "generator_bound_seconds", "concurrency_min", "concurrency_max",
+                   "cells_skipped"} & set(data))):
         if isinstance(data[key], bool) or not isinstance(data[key], int) or data[key] < 0:
             raise CorpusResultsError(f"{path.name}: {key} is not a non-negative integer")
     for key in ("target_rps", "achieved_rps"):
@@ -264,11 +322,11 @@ def _validate_resources(path: Path) -> None:
             raise CorpusResultsError(f"{path.name}: {key} is not numeric")
 
 
-# Arity matches the one consumer exactly: percat-matrix.py unpacks 4 fields for iso| and
-# 3 for mix|, so the label class excludes '|' and each kind states its field count.
+# Arity matches the one consumer exactly: percat-matrix.py unpacks 4 fields for iso| and loo|
+# and 3 for mix|, so the label class excludes '|' and each kind states its field count.
 _LABEL = r"[A-Za-z0-9._-]+"
 MANIFEST_LINE_PATTERN = re.compile(
-    rf"(?P<prefix>iso\|{_LABEL}\|{_LABEL}\|{_LABEL}|mix\|{_LABEL}\|{_LABEL})"
+    rf"(?P<prefix>iso\|{_LABEL}\|{_LABEL}\|{_LABEL}|loo\|{_LABEL}\|{_LABEL}\|{_LABEL}|mix\|{_LABEL}\|{_LABEL})"
     rf"=(?P<path>.+jsonbench-summary\.md)$")
 
 
@@ -329,12 +387,18 @@ def stage(output_root: str, stage_root: str) -> None:
                 _validate_parity(path)
             elif path.name == "timings.csv":
                 _validate_timings(path)
+            elif path.name == "timings-batches.csv":
+                _validate_timings_batches(path)
             elif path.name == "parity-diffs.json":
                 _validate_parity_diffs(path)
             elif path.name == "timings.meta.json":
                 _validate_timings_meta(path)
+            elif path.name == "timings.hist.json":
+                _read_histograms(path)
             elif path.name == "resources.json":
                 _validate_resources(path)
+            elif path.name == "noise.json":
+                _read_noise(path)
             elif path.name == "summaries.manifest":
                 target = destination_root / path.relative_to(source_root)
                 target.parent.mkdir(parents=True, exist_ok=True)
@@ -356,15 +420,172 @@ def stage(output_root: str, stage_root: str) -> None:
 
 COMMENT_METRICS = (("avg", "avg"), ("med", "median"), ("p(90)", "p90"),
                    ("p(95)", "p95"), ("p(99)", "p99"), ("max", "max"))
+HISTOGRAM_PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p99.9", 0.999))
+
+
+def _timings_histograms(root: Path, outcome: str = "ok") -> dict[tuple[str, str], LatencyHistogram]:
+    """(corpus, label) -> the staged timings histogram for one outcome (empty if never seen)."""
+    found: dict[tuple[str, str], LatencyHistogram] = {}
+    for path in sorted(root.rglob("timings.hist.json")):
+        label, corpus = path.parent.name, path.parent.parent.name
+        found[(corpus, label)] = _read_histograms(path).get(outcome, LatencyHistogram())
+    return found
+
+
+def percentiles(stage_root: str, outcome: str = "ok") -> str:
+    """Percentiles per client, per corpus and merged over every corpus, from staged histograms.
+
+    The merged row adds bucket counts, so it is the percentile of every request the client served
+    — not an average of per-corpus percentiles, which has no meaning.
+    """
+    found = _timings_histograms(Path(stage_root), outcome)
+    if not found:
+        return "No timings histograms were staged."
+    lines = [f"| client | corpus | {outcome} requests | " + " | ".join(n for n, _ in HISTOGRAM_PERCENTILES) + " |",
+             "|---|---|---|" + "---|" * len(HISTOGRAM_PERCENTILES)]
+    for label in sorted({label for _, label in found}):
+        rows = sorted((corpus, h) for (corpus, name), h in found.items() if name == label)
+        if len(rows) > 1:
+            rows.append(("all corpora", merged(h for _, h in rows)))
+        for corpus, histogram in rows:
+            values = " | ".join(f"{histogram.percentile(share):.2f} ms" for _, share in HISTOGRAM_PERCENTILES)
+            lines.append(f"| {label} | {corpus} | {histogram.total} | {values} |")
+    return "\n".join(lines)
+
+
+# A/A noise calibration: the same image listed several times in one sweep gets labels
+# <label>, <label>_r2, ... (see run-rpc-sweep.sh), and every pair of those cells at one rate slot
+# is a delta that only run-to-run noise produced.
+REPEAT_SUFFIX = re.compile(r"_r(?:[2-9]|[1-9][0-9]+)$")
+NOISE_ARCH_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+NOISE_STATISTICS = ("mean_pct", "stdev_pct", "max_abs_pct")
+# Band used for a slot without a calibration, as comment() always did before one existed.
+DEFAULT_NOISE_PCT = 1.0
+
+
+def _summary_cells(root: Path) -> dict[tuple[str, str, str], dict]:
+    """(corpus, label, slot) -> the http_req_duration values of every corpus cell under root."""
+    cells: dict[tuple[str, str, str], dict] = {}
+    for path in sorted((root / "corpus").glob("*/*/*/summary.json")):
+        try:
+            _validate_summary(path)
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError) as error:
+            raise CorpusResultsError(f"{path.name}: unreadable ({error.__class__.__name__})") from None
+        cells[(path.parent.parent.parent.name, path.parent.parent.name, path.parent.name)] = \
+            data["metrics"]["http_req_duration"]["values"]
+    return cells
+
+
+def measure_noise(output_root: str, arch: str, head: int) -> dict[str, Any]:
+    """Per-percentile relative deltas between repeats of one image, keyed corpus -> rate slot -> arch.
+
+    Repeats are paired in run order, so mean_pct also shows drift across the sweep (a node that
+    keeps warming up); max_abs_pct is the band comment() treats as noise. n repeats give
+    n(n-1)/2 pairs, so three or more make the band much less of a single draw.
+    """
+    if not NOISE_ARCH_PATTERN.fullmatch(arch):
+        raise CorpusResultsError("arch is not a plain machine name")
+    groups: dict[tuple[str, str, str], list[tuple[int, dict]]] = {}
+    for (corpus, label, slot), values in _summary_cells(Path(output_root)).items():
+        head_label = REPEAT_SUFFIX.sub("", label)
+        repeat = 1 if head_label == label else int(label[len(head_label) + 2:])
+        groups.setdefault((corpus, head_label, slot), []).append((repeat, values))
+    noise: dict[str, Any] = {}
+    for (corpus, _, slot), repeats in sorted(groups.items()):
+        if len(repeats) < 2:
+            continue
+        repeats.sort(key=operator.itemgetter(0))
+        metrics: dict[str, dict[str, float]] = {}
+        for key, name in COMMENT_METRICS:
+            deltas = [(later[key] - earlier[key]) / earlier[key] * 100
+                      for i, (_, earlier) in enumerate(repeats) for _, later in repeats[i + 1:] if earlier[key]]
+            if not deltas:
+                continue
+            mean = sum(deltas) / len(deltas)
+            stdev = math.sqrt(sum((d - mean) ** 2 for d in deltas) / (len(deltas) - 1)) if len(deltas) > 1 else 0.0
+            metrics[name] = {"mean_pct": round(mean, 3), "stdev_pct": round(stdev, 3),
+                             "max_abs_pct": round(max(abs(d) for d in deltas), 3)}
+        pairs = len(repeats) * (len(repeats) - 1) // 2
+        # Keyed by slot, not bare rate: a repeated rate (100_r2) runs later on an already-loaded
+        # node, which is exactly the kind of condition a noise band must not be borrowed across.
+        noise.setdefault(corpus, {}).setdefault(slot, {})[arch] = {
+            "head": head, "repeats": len(repeats), "pairs": pairs, "metrics": metrics}
+    if not noise:
+        raise CorpusResultsError("no corpus cell was measured more than once, so there is no noise to measure")
+    return {"unit": "percent", "noise": noise}
+
+
+def _read_noise(path: Path) -> dict[str, Any]:
+    """Load a noise.json; CorpusResultsError unless it is exactly measure_noise's shape."""
+    with path.open("r", encoding="utf-8") as source:
+        data = json.load(source)
+    if not isinstance(data, dict) or data.get("unit") != "percent" or set(data) != {"unit", "noise"} \
+            or not isinstance(data["noise"], dict):
+        raise CorpusResultsError(f"{path.name} does not match the noise schema")
+    label = re.compile(_LABEL)
+    for corpus, rates in data["noise"].items():
+        if not label.fullmatch(corpus) or not isinstance(rates, dict):
+            raise CorpusResultsError(f"{path.name}: corpus entry is malformed")
+        for rate, arches in rates.items():
+            if not label.fullmatch(rate) or not isinstance(arches, dict):
+                raise CorpusResultsError(f"{path.name}: rate entry is malformed")
+            for arch, entry in arches.items():
+                if not NOISE_ARCH_PATTERN.fullmatch(arch) or not isinstance(entry, dict) \
+                        or set(entry) != {"head", "repeats", "pairs", "metrics"} \
+                        or not isinstance(entry["metrics"], dict) \
+                        or not set(entry["metrics"]) <= {name for _, name in COMMENT_METRICS}:
+                    raise CorpusResultsError(f"{path.name}: arch entry is malformed")
+                for key in ("head", "repeats", "pairs"):
+                    if isinstance(entry[key], bool) or not isinstance(entry[key], int) or entry[key] < 0:
+                        raise CorpusResultsError(f"{path.name}: {key} is not a non-negative integer")
+                for statistics in entry["metrics"].values():
+                    if not isinstance(statistics, dict) or set(statistics) != set(NOISE_STATISTICS) \
+                            or any(isinstance(v, bool) or not isinstance(v, (int, float)) or not math.isfinite(v)
+                                   for v in statistics.values()) \
+                            or statistics["stdev_pct"] < 0 or statistics["max_abs_pct"] < 0:
+                        raise CorpusResultsError(f"{path.name}: noise statistics are malformed")
+    return data
+
+
+def noise(output_root: str, out_path: str, arch: str, head: int, merge: str | None = None) -> None:
+    """Write the A/A noise measured under output_root, refreshing a previous calibration if given.
+
+    A refresh replaces only the (corpus, rate, arch) entries this run measured, so calibrating
+    one corpus or one runner type leaves every other entry as it was.
+    """
+    measured = measure_noise(output_root, arch, head)
+    if merge and Path(merge).is_file():
+        try:
+            combined = _read_noise(Path(merge))
+        except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+            raise CorpusResultsError("previous noise calibration is unreadable") from None
+        for corpus, rates in measured["noise"].items():
+            for rate, arches in rates.items():
+                combined["noise"].setdefault(corpus, {}).setdefault(rate, {}).update(arches)
+        measured = combined
+    target = Path(out_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("w", encoding="utf-8") as output:
+        json.dump(measured, output, sort_keys=True, separators=(",", ":"))
+        output.write("\n")
+    entries = sum(len(arches) for rates in measured["noise"].values() for arches in rates.values())
+    print(f"noise: {entries} calibrated (corpus, rate, arch) entr{'y' if entries == 1 else 'ies'}")
 
 
-def comment(stage_root: str, baseline_label: str, candidate_label: str) -> str:
+def comment(stage_root: str, baseline_label: str, candidate_label: str, arch: str | None = None) -> str:
     """Render a PR comment from STAGED results only.
 
     Reads the staged tree rather than the raw output dir on purpose: staging is what enforces the
     aggregate-only boundary, so anything reaching a public PR comment has already passed it.
+    A staged noise.json colors each delta against the A/A noise measured for its corpus, rate
+    slot and runner arch (this machine's unless given); a slot without one falls back to ±1%.
     """
     root = Path(stage_root)
+    calibration: dict[str, Any] = {}
+    if (root / "noise.json").is_file():
+        calibration = _read_noise(root / "noise.json")["noise"]
+    arch = arch or platform.machine()
     # Keyed by rate slot as well: a multi-rate sweep produces sibling rate directories under one
     # label, and keying on (corpus, label) alone silently kept whichever slot sorted last.
     cells: dict[tuple[str, str, str], dict] = {}
@@ -374,6 +595,7 @@ def comment(stage_root: str, baseline_label: str, candidate_label: str) -> str:
         cells[(corpus, label, slot)] = json.loads(path.read_text(encoding="utf-8"))["metrics"]
     if not cells:
         return "No corpus cells were produced, so there is nothing to compare."
+    histograms = _timings_histograms(root)
 
     def slot_order(slot: str):
         head = slot.split("_")[0]
@@ -390,16 +612,26 @@ def comment(stage_root: str, baseline_label: str, candidate_label: str) -> str:
                 continue
             b_fail = base["http_req_failed"]["values"]["rate"] * 100
             c_fail = cand["http_req_failed"]["values"]["rate"] * 100
+            measured = calibration.get(corpus, {}).get(slot, {}).get(arch)
             lines += [f"**`{corpus}`** @ `{slot}` rps · "
                       f"{int(cand['http_reqs']['values']['count'])} requests/client", "",
-                      "| metric | master | PR | delta |", "|---|---|---|---|"]
+                      "| metric | master | PR | delta | noise |", "|---|---|---|---|---|"]
             for key, name in COMMENT_METRICS:
                 bv = base["http_req_duration"]["values"][key]
                 cv = cand["http_req_duration"]["values"][key]
                 delta = (cv - bv) / bv * 100 if bv else float("nan")
-                arrow = "🟢" if delta < -1 else ("🔴" if delta > 1 else "⚪")
-                lines.append(f"| {name} | {bv:.2f} ms | {cv:.2f} ms | {arrow} {delta:+.1f}% |")
-            lines += ["", f"Failure rate — master {b_fail:.2f}%, PR {c_fail:.2f}%.", ""]
+                band = measured["metrics"][name]["max_abs_pct"] \
+                    if measured and name in measured["metrics"] else DEFAULT_NOISE_PCT
+                arrow = "🟢" if delta < -band else ("🔴" if delta > band else "⚪")
+                lines.append(f"| {name} | {bv:.2f} ms | {cv:.2f} ms | {arrow} {delta:+.1f}% | ±{band:.1f}% |")
+            lines += ["", f"Failure rate — master {b_fail:.2f}%, PR {c_fail:.2f}%."]
+            if measured:
+                lines.append(f"Noise band: largest A/A delta over {measured['repeats']} repeats of one image "
+                             f"({measured['pairs']} pairs) on {arch} at head {measured['head']}.")
+            elif calibration:
+                lines.append(f"Noise band: no A/A calibration for this corpus, rate and {arch} — "
+                             f"±{DEFAULT_NOISE_PCT:g}% assumed.")
+            lines.append("")
 
         report = root / "corpus" / corpus / candidate_label / "parity.json"
         if report.is_file():
@@ -412,10 +644,158 @@ def comment(stage_root: str, baseline_label: str, candidate_label: str) -> str:
                                     if isinstance(v, int) and v
                                     and k not in ("total", "matched", "both_rpc_errors"))
                 lines.append(f"Divergence counts: {defects}")
+        base_hist = histograms.get((corpus, baseline_label))
+        cand_hist = histograms.get((corpus, candidate_label))
+        if base_hist and cand_hist and base_hist.total and cand_hist.total:
+            lines.append("Per-record replay latency (ok calls) — " + ", ".join(
+                f"{name} {base_hist.percentile(share):.2f} → {cand_hist.percentile(share):.2f} ms"
+                for name, share in HISTOGRAM_PERCENTILES) + ".")
         lines.append("")
-    lines.append("<sub>Fixed corpus and rate; a PR that changes results is a correctness "
-                 "regression regardless of latency. Latency deltas under ~2.5% are within "
-                 "run-to-run noise.</sub>")
+    band = "." if calibration else f"; no A/A calibration was staged, so the band is ±{DEFAULT_NOISE_PCT:g}%."
+    lines.append("<sub>Fixed corpus and rate; a PR that changes results is a correctness regression "
+                 f"regardless of latency. ⚪ marks a latency delta inside the noise band{band}</sub>")
+    return "\n".join(lines)
+
+
+# Paired comparison of two timings matrices. Only these meta fields decide whether two matrices
+# measured the same thing; absent optional keys read as the value older runs implied.
+PAIRED_META_DEFAULTS: dict[str, Any] = {
+    "head": None, "chain_id": None, "block_hash": None, "records": None, "passes": None,
+    "target_rps": None, "concurrency": None, "batch_size": 1, "transport": "http",
+    "latency_origin": "sent", "adaptive_concurrency": False,
+}
+PAIRED_PERCENTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+PAIRED_CONFIDENCE = 0.95
+# The CSV holds 3 decimals; a 0.000 ms cell is clamped to this so a ratio stays finite.
+TIMINGS_RESOLUTION_MS = 0.001
+# A record is listed as regressed when every candidate ok pass is slower than every baseline ok
+# pass and its median latency grew by at least this factor.
+REGRESSED_RECORD_RATIO = 1.10
+MAX_REGRESSED_INDEXES = 40
+
+
+def _ok_latencies(path: Path) -> list[list[float]]:
+    """Per record (by position), the latencies of its ok passes in a validated timings.csv."""
+    _validate_timings(path)
+    with path.open(encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        next(reader)
+        return [[max(float(ms), TIMINGS_RESOLUTION_MS) for ms, status in zip(row[1::2], row[2::2])
+                 if status == "ok" and ms != ""] for row in reader]
+
+
+def _nearest_rank(ordered: Sequence[float], share: float) -> float:
+    return ordered[max(0, math.ceil(share * len(ordered)) - 1)]
+
+
+def _median(values: Sequence[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def paired_compare(baseline_csv: str, candidate_csv: str, resamples: int = 1000, seed: int = 0) -> dict[str, Any]:
+    """Compare two timings matrices record by record, with bootstrap confidence intervals.
+
+    Each record's latency is the median of its ok passes; records without an ok pass on either
+    side are left out. The statistics are the geometric mean of the per-record ratios and the
+    ratio of each percentile, and resampling records (not requests) keeps every bootstrap draw
+    paired, so the record-to-record spread that dominates an unpaired comparison cancels out. A
+    verdict is "slower" or "faster" only when the whole interval lies on one side of 1.
+    """
+    if resamples < 1:
+        raise CorpusResultsError("resamples must be >= 1")
+    metas = []
+    for path in (Path(baseline_csv), Path(candidate_csv)):
+        meta_path = path.with_name("timings.meta.json")
+        _validate_timings_meta(meta_path)
+        metas.append(json.loads(meta_path.read_text(encoding="utf-8")))
+    # Two adaptive replays each settle where their own node let them; neither chose its concurrency.
+    both_adaptive = all(meta.get("adaptive_concurrency", False) for meta in metas)
+    differing = sorted(key for key, default in PAIRED_META_DEFAULTS.items()
+                       if metas[0].get(key, default) != metas[1].get(key, default)
+                       and not (key == "concurrency" and both_adaptive))
+    if (metas[0]["warmup_seconds"] > 0) != (metas[1]["warmup_seconds"] > 0):
+        differing.append("warmup_seconds")
+    # A baseline and a compare replay measure the same way (master's matrix comes from the one, a
+    # PR's from the other); only a parity replay against a `timings` run is a different measurement.
+    if ("replay" in metas[0]) != ("replay" in metas[1]):
+        differing.append("replay")
+    if differing:
+        raise CorpusResultsError(f"the timings metas differ in {', '.join(differing)}; the matrices are not comparable")
+
+    baseline_cells, candidate_cells = _ok_latencies(Path(baseline_csv)), _ok_latencies(Path(candidate_csv))
+    if len(baseline_cells) != len(candidate_cells):
+        raise CorpusResultsError("the timings matrices hold different record counts")
+    indexes, base, cand, regressed = [], [], [], []
+    for index, (b, c) in enumerate(zip(baseline_cells, candidate_cells), start=1):
+        if b and c:
+            indexes.append(index)
+            base.append(_median(b))
+            cand.append(_median(c))
+            if min(c) > max(b) and cand[-1] >= REGRESSED_RECORD_RATIO * base[-1]:
+                regressed.append((cand[-1] / base[-1], index))
+    if not indexes:
+        raise CorpusResultsError("no record has an ok latency in both matrices")
+    logs = [math.log(c / b) for b, c in zip(base, cand)]
+
+    def statistics(base: Sequence[float], cand: Sequence[float], logs: Sequence[float]) -> list[float]:
+        ordered_base, ordered_cand = sorted(base), sorted(cand)
+        return [math.exp(math.fsum(logs) / len(logs))] + [
+            _nearest_rank(ordered_cand, share) / _nearest_rank(ordered_base, share)
+            for _, share in PAIRED_PERCENTILES]
+
+    observed = statistics(base, cand, logs)
+    rng = random.Random(seed)
+    draws: list[list[float]] = [[] for _ in observed]
+    for _ in range(resamples):
+        pick = rng.choices(range(len(indexes)), k=len(indexes))
+        take = (lambda values: [values[pick[0]]]) if len(pick) == 1 else operator.itemgetter(*pick)
+        for column, value in zip(draws, statistics(take(base), take(cand), take(logs))):
+            column.append(value)
+    tail = (1 - PAIRED_CONFIDENCE) / 2
+    rows = []
+    for name, value, column in zip(["per_record"] + [n for n, _ in PAIRED_PERCENTILES], observed, draws):
+        column.sort()
+        low, high = _nearest_rank(column, tail), _nearest_rank(column, 1 - tail)
+        row = {"statistic": name, "ratio": round(value, 5), "ci_low": round(low, 5), "ci_high": round(high, 5),
+               "verdict": "slower" if low > 1 else ("faster" if high < 1 else "no significant change")}
+        if name != "per_record":
+            share = dict(PAIRED_PERCENTILES)[name]
+            row["baseline_ms"] = round(_nearest_rank(sorted(base), share), 3)
+            row["candidate_ms"] = round(_nearest_rank(sorted(cand), share), 3)
+        rows.append(row)
+    regressed.sort(reverse=True)
+    return {
+        "records": len(baseline_cells), "paired_records": len(indexes), "resamples": resamples,
+        "confidence": PAIRED_CONFIDENCE, "statistics": rows,
+        "regressed_records": len(regressed),
+        "regressed_indexes": [index for _, index in regressed[:MAX_REGRESSED_INDEXES]],
+    }
+
+
+def render_paired(result: dict[str, Any]) -> str:
+    """A paired_compare result as markdown: one row per statistic, then the regressed records."""
+    arrows = {"slower": "🔴", "faster": "🟢", "no significant change": "⚪"}
+    lines = [f"Paired per-record latency: {result['paired_records']}/{result['records']} records with ok "
+             f"calls on both sides, {result['resamples']} bootstrap resamples, "
+             f"{result['confidence']:.0%} intervals.", "",
+             "| statistic | master | PR | delta | interval | verdict |", "|---|---|---|---|---|---|"]
+    for row in result["statistics"]:
+        name = "per-record (geometric mean)" if row["statistic"] == "per_record" else row["statistic"]
+        base = f"{row['baseline_ms']:.3f} ms" if "baseline_ms" in row else "—"
+        cand = f"{row['candidate_ms']:.3f} ms" if "candidate_ms" in row else "—"
+        lines.append(f"| {name} | {base} | {cand} | {(row['ratio'] - 1) * 100:+.2f}% | "
+                     f"{(row['ci_low'] - 1) * 100:+.2f}% … {(row['ci_high'] - 1) * 100:+.2f}% | "
+                     f"{arrows[row['verdict']]} {row['verdict']} |")
+    lines.append("")
+    if result["regressed_records"]:
+        shown = " ".join(str(index) for index in result["regressed_indexes"])
+        lines.append(f"Regressed records: {result['regressed_records']} slower on every pass by "
+                     f"≥{(REGRESSED_RECORD_RATIO - 1) * 100:.0f}% (first {len(result['regressed_indexes'])} "
+                     f"by ratio): {shown}")
+    else:
+        lines.append("Regressed records: none.")
     return "\n".join(lines)
 
 
@@ -435,6 +815,28 @@ def main(argv: Sequence[str] | None = None) -> int:
     comment_parser.add_argument("stage_root")
     comment_parser.add_argument("--baseline", required=True)
     comment_parser.add_argument("--candidate", required=True)
+    comment_parser.add_argument("--arch", default=None, help="runner arch to read noise for (default: this machine)")
+
+    noise_parser = subparsers.add_parser(
+        "noise", help="measure A/A noise from repeats of one image in a sweep's output")
+    noise_parser.add_argument("output_root")
+    noise_parser.add_argument("--out", required=True)
+    noise_parser.add_argument("--arch", default=platform.machine(), help="runner arch the repeats ran on")
+    noise_parser.add_argument("--head", type=int, required=True, help="block the repeats were pinned to")
+    noise_parser.add_argument("--merge", default=None, help="previous noise.json to refresh (kept where not re-measured)")
+
+    percentiles_parser = subparsers.add_parser(
+        "percentiles", help="merge staged timings histograms into per-client percentiles")
+    percentiles_parser.add_argument("stage_root")
+    percentiles_parser.add_argument("--outcome", default="ok", help="histogram to report: ok, all, or an outcome name")
+
+    paired_parser = subparsers.add_parser(
+        "paired", help="compare two timings matrices record by record with bootstrap intervals")
+    paired_parser.add_argument("--baseline", required=True, help="master's timings.csv (meta read beside it)")
+    paired_parser.add_argument("--candidate", required=True, help="the PR's timings.csv (meta read beside it)")
+    paired_parser.add_argument("--resamples", type=int, default=1000, help="bootstrap resamples")
+    paired_parser.add_argument("--seed", type=int, default=0, help="bootstrap seed, for reproducible intervals")
+    paired_parser.add_argument("--json", default=None, help="also write the result as JSON (indexes + ratios only)")
 
     arguments = parser.parse_args(argv)
     try:
@@ -442,8 +844,17 @@ def main(argv: Sequence[str] | None = None) -> int:
             sanitize(arguments.raw, arguments.out)
         elif arguments.command == "stage":
             stage(arguments.output_root, arguments.stage_root)
+        elif arguments.command == "percentiles":
+            print(percentiles(arguments.stage_root, arguments.outcome))
+        elif arguments.command == "paired":
+            result = paired_compare(arguments.baseline, arguments.candidate, arguments.resamples, arguments.seed)
+            if arguments.json:
+                Path(arguments.json).write_text(json.dumps(result, sort_keys=True), encoding="utf-8")
+            print(render_paired(result))
+        elif arguments.command == "noise":
+            noise(arguments.output_root, arguments.out, arguments.arch, arguments.head, arguments.merge)
         else:
-            print(comment(arguments.stage_root, arguments.baseline, arguments.candidate))
+            print(comment(arguments.stage_root, arguments.baseline, arguments.candidate, arguments.arch))
     except CorpusResultsError as error:
         print(f"error: {error}", file=sys.stderr)
         return 1
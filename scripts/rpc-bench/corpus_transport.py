@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
+# SPDX-License-Identifier: LGPL-3.0-only
+
+"""Asyncio JSON-RPC transports for the corpus replay.
+
+A thread per in-flight request stops scaling at a few dozen threads: the GIL and context
+switches, not the node, become the ceiling. These transports run every request of a replay on one
+event loop over a pool of keep-alive connections, so thousands of calls can be outstanding.
+
+Privacy contract: transports move opaque bytes. They never log, and every failure they surface is
+a return value, never an exception message that could carry a request or response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+import ssl
+import struct
+import urllib.parse
+from typing import Sequence
+
+# Header block and chunk-size lines are short; anything past this is not a JSON-RPC server.
+MAX_HEADER_BYTES = 64 * 1024
+
+# Everything a broken peer or connection can raise mid-exchange. IncompleteReadError is an
+# EOFError; TimeoutError and ssl.SSLError are OSErrors.
+TRANSPORT_ERRORS = (OSError, EOFError, ValueError, IndexError, asyncio.LimitOverrunError,
+                    asyncio.TimeoutError)
+
+HTTP_SCHEMES = ("http", "https")
+IPC_SCHEME = "ipc://"
+WS_SCHEMES = ("ws", "wss")
+
+
+def open_pool(url: str, max_response_bytes: int, timeout: float, connections: int = 1) -> Pool:
+    """The pool for an http(s)://, ipc:// or ws(s):// URL; ValueError for anything else.
+
+    connections only applies to WebSocket pools, whose requests share connections instead of
+    taking one each.
+    """
+    if url.startswith(IPC_SCHEME):
+        return IpcPool(url, max_response_bytes, timeout)
+    if urllib.parse.urlsplit(url).scheme in WS_SCHEMES:
+        return WsPool(url, max_response_bytes, timeout, connections)
+    return HttpPool(url, max_response_bytes, timeout)
+
+
+class HttpPool:
+    """Keep-alive HTTP/1.1 connections shared by every in-flight request of one replay.
+
+    The pool does not bound concurrency — the caller does — it only keeps idle connections for
+    reuse, so it never holds more connections than the caller ever had requests in flight.
+    """
+
+    def __init__(self, url: str, max_response_bytes: int, timeout: float) -> None:
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in HTTP_SCHEMES or not parsed.hostname:
+            raise ValueError("unsupported RPC URL")
+        self._host = parsed.hostname
+        self._port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self._ssl = ssl.create_default_context() if parsed.scheme == "https" else None
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        authority = self._host if parsed.port is None else f"{self._host}:{parsed.port}"
+        self._head = (f"POST {path} HTTP/1.1\r\nHost: {authority}\r\n"
+                      f"Content-Type: application/json\r\nContent-Length: ").encode("ascii")
+        self._max = max_response_bytes
+        self._timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def fetch(self, *body: bytes | memoryview, ids: Sequence[int] = ()) -> tuple[int, bytes] | None:
+        """POST the concatenation of the body parts and return (status, raw), or None on failure.
+
+        Parts are written as given, never joined, so a memory-mapped body goes to the socket
+        without a copy.
+
+        Retries once: a pooled connection can be closed by the peer between requests, which is
+        indistinguishable from a real failure on the first attempt. A body longer than the
+        response cap comes back truncated to cap + 1 bytes, so the caller can tell it apart.
+        """
+        for attempt in (0, 1):
+            connection = None
+            try:
+                connection = self._idle.pop() if self._idle else await asyncio.wait_for(
+                    asyncio.open_connection(self._host, self._port, ssl=self._ssl,
+                                            limit=MAX_HEADER_BYTES), self._timeout)
+                status, raw, reusable = await asyncio.wait_for(
+                    self._exchange(connection, body), self._timeout)
+            except TRANSPORT_ERRORS:
+                _close(connection)
+                if attempt:
+                    return None
+                continue
+            except BaseException:
+                # Cancellation mid-exchange leaves the stream at an unknown position.
+                _close(connection)
+                raise
+            if reusable:
+                self._idle.append(connection)
+            else:
+                _close(connection)
+            return status, raw
+        return None
+
+    async def _exchange(self, connection: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+                        body: tuple[bytes | memoryview, ...]) -> tuple[int, bytes, bool]:
+        reader, writer = connection
+        writer.writelines((self._head, str(sum(map(len, body))).encode("ascii"), b"\r\n\r\n", *body))
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        version, code = lines[0].split(" ", 2)[:2]
+        status = int(code)
+        headers: dict[str, str] = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raw = bytearray()
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";", 1)[0], 16)
+                if size == 0:
+                    while await reader.readuntil(b"\r\n") != b"\r\n":
+                        pass  # trailers
+                    return status, bytes(raw), reusable
+                if len(raw) + size > self._max:
+                    # Unread bytes stay on the socket, so the connection cannot be reused.
+                    raw += await reader.readexactly(self._max + 1 - len(raw))
+                    return status, bytes(raw), False
+                raw += await reader.readexactly(size)
+                await reader.readexactly(2)
+        if "content-length" in headers:
+            length = int(headers["content-length"])
+            if length > self._max:
+                return status, await reader.readexactly(self._max + 1), False
+            return status, await reader.readexactly(length), reusable
+        # No framing: the body runs to EOF.
+        raw = bytearray()
+        while len(raw) <= self._max:
+            chunk = await reader.read(self._max + 1 - len(raw))
+            if not chunk:
+                break
+            raw += chunk
+        return status, bytes(raw), False
+
+    async def close(self) -> None:
+        while self._idle:
+            _close(self._idle.pop())
+
+
+def _close(connection: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None) -> None:
+    if connection is not None:
+        try:
+            connection[1].close()
+        except Exception:  # noqa: BLE001 — a failed close must not mask the caller's outcome
+            pass
+
+
+class IpcPool:
+    """Connections to a node's JSON-RPC Unix socket, framed one JSON document per line.
+
+    Same contract as HttpPool.fetch, minus HTTP: every exchange reports status 200, so a caller
+    classifies the response body exactly as it would an HTTP one. Compiled request bodies are
+    compact JSON and never contain a raw newline, so the newline is an unambiguous frame end.
+    """
+
+    def __init__(self, url: str, max_response_bytes: int, timeout: float) -> None:
+        if not url.startswith(IPC_SCHEME) or len(url) == len(IPC_SCHEME):
+            raise ValueError("unsupported IPC URL")
+        self._path = url[len(IPC_SCHEME):]
+        self._max = max_response_bytes
+        self._timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def fetch(self, *body: bytes | memoryview, ids: Sequence[int] = ()) -> tuple[int, bytes] | None:
+        """Send the body parts as one line and return (200, raw) for the reply line, or None."""
+        for attempt in (0, 1):
+            connection = None
+            try:
+                # A reply over the cap must stay unterminated in the buffer, not be read whole.
+                connection = self._idle.pop() if self._idle else await asyncio.wait_for(
+                    asyncio.open_unix_connection(self._path, limit=self._max + 1), self._timeout)
+                raw, reusable = await asyncio.wait_for(self._exchange(connection, body), self._timeout)
+            except TRANSPORT_ERRORS:
+                _close(connection)
+                if attempt:
+                    return None
+                continue
+            except BaseException:
+                _close(connection)
+                raise
+            if reusable:
+                self._idle.append(connection)
+            else:
+                _close(connection)
+            return 200, raw
+        return None
+
+    async def _exchange(self, connection: tuple[asyncio.StreamReader, asyncio.StreamWriter],
+                        body: tuple[bytes | memoryview, ...]) -> tuple[bytes, bool]:
+        reader, writer = connection
+        writer.writelines((*body, b"\n"))
+        await writer.drain()
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.LimitOverrunError:
+            # Over the cap: hand back cap + 1 bytes, like HttpPool; the rest is still unread.
+            return await reader.readexactly(self._max + 1), False
+        return line[:-1], True
+
+    async def close(self) -> None:
+        while self._idle:
+            _close(self._idle.pop())
+
+
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC11B85"
+WS_TEXT, WS_CONTINUATION, WS_CLOSE, WS_PING = 0x1, 0x0, 0x8, 0x9
+# Bytes kept from the end of an over-cap message: enough to find its id and route it.
+WS_TAIL_BYTES = 256
+# A reply's id, when the node puts it last as Nethermind does; anything else is parsed in full.
+WS_TRAILING_ID = re.compile(rb'"id"\s*:\s*(\d+)\s*}\s*$')
+
+
+class WsPool:
+    """Pipelined JSON-RPC over a fixed number of WebSocket connections.
+
+    Unlike HttpPool, a connection carries many requests at once: each is written as one text
+    message and its reply is matched back by JSON-RPC id (the ids argument of fetch — for a batch,
+    every id in it), so the caller's concurrency is spread over `connections` sockets instead of
+    needing one socket each. A reply that cannot be routed is dropped and its request times out.
+
+    Every client frame is masked with a fresh random key, as RFC 6455 requires; a proxy or strict
+    server may drop frames that are not. That costs one copy of each body on its way out.
+    """
+
+    def __init__(self, url: str, max_response_bytes: int, timeout: float, connections: int = 1) -> None:
+        parsed = urllib.parse.urlsplit(url)
+        if parsed.scheme not in WS_SCHEMES or not parsed.hostname or connections < 1:
+            raise ValueError("unsupported WebSocket URL")
+        self._host = parsed.hostname
+        self._port = parsed.port or (443 if parsed.scheme == "wss" else 80)
+        self._ssl = ssl.create_default_context() if parsed.scheme == "wss" else None
+        path = parsed.path or "/"
+        if parsed.query:
+            path += "?" + parsed.query
+        self._path = path
+        self._authority = self._host if parsed.port is None else f"{self._host}:{parsed.port}"
+        self._max = max_response_bytes
+        self._timeout = timeout
+        self._connections: list[_WsConnection | None] = [None] * connections
+        self._opening = asyncio.Lock()
+
+    async def fetch(self, *body: bytes | memoryview, ids: Sequence[int] = ()) -> tuple[int, bytes] | None:
+        """Send the body parts as one message; (200, raw reply) once its id comes back, or None.
+
+        Retries once on a fresh connection when the chosen one turns out to be dead.
+        """
+        if not ids:
+            raise ValueError("a pipelined request needs its JSON-RPC ids")
+        for attempt in (0, 1):
+            try:
+                connection = await self._pick()
+                raw = await asyncio.wait_for(connection.request(body, ids), self._timeout)
+            except TRANSPORT_ERRORS:
+                if attempt:
+                    return None
+                continue
+            return 200, raw
+        return None
+
+    async def _pick(self) -> _WsConnection:
+        """The open connection with the fewest requests in flight, opening dead slots first."""
+        async with self._opening:
+            for slot, connection in enumerate(self._connections):
+                if connection is None or connection.closed:
+                    self._connections[slot] = await asyncio.wait_for(self._connect(), self._timeout)
+        return min(self._connections, key=lambda connection: connection.in_flight)
+
+    async def _connect(self) -> _WsConnection:
+        reader, writer = await asyncio.open_connection(self._host, self._port, ssl=self._ssl,
+                                                       limit=MAX_HEADER_BYTES)
+        try:
+            key = base64.b64encode(os.urandom(16))
+            writer.write(f"GET {self._path} HTTP/1.1\r\nHost: {self._authority}\r\nUpgrade: websocket\r\n"
+                         f"Connection: Upgrade\r\nSec-WebSocket-Key: {key.decode('ascii')}\r\n"
+                         f"Sec-WebSocket-Version: 13\r\n\r\n".encode("ascii"))
+            await writer.drain()
+            head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+            accept = base64.b64encode(hashlib.sha1(key + WS_GUID).digest()).decode("ascii")
+            headers = {name.strip().lower(): value.strip()
+                       for name, _, value in (line.partition(":") for line in head[1:]) if name}
+            if head[0].split(" ", 2)[1:2] != ["101"] or headers.get("sec-websocket-accept") != accept:
+                raise ValueError("WebSocket upgrade refused")
+        except BaseException:
+            writer.close()
+            raise
+        return _WsConnection(reader, writer, self._max)
+
+    async def close(self) -> None:
+        for connection in self._connections:
+            if connection is not None:
+                await connection.close()
+        self._connections = [None] * len(self._connections)
+
+
+class _WsConnection:
+    """One WebSocket with a reader task routing replies to the requests waiting on their ids."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_bytes: int) -> None:
+        self._reader, self._writer, self._max = reader, writer, max_bytes
+        # Waiters per id, oldest first: a timings run can have one record in flight twice, and
+        # identical requests may take identical replies in either order.
+        self._pending: dict[int, list[asyncio.Future]] = {}
+        self.in_flight = 0
+        self.closed = False
+        self._task = asyncio.get_running_loop().create_task(self._read_replies())
+
+    async def request(self, body: tuple[bytes | memoryview, ...], ids: Sequence[int]) -> bytes:
+        if self.closed:
+            raise ConnectionError("connection closed")
+        reply = asyncio.get_running_loop().create_future()
+        for request_id in ids:
+            self._pending.setdefault(request_id, []).append(reply)
+        self.in_flight += 1
+        try:
+            self._writer.write(_ws_frame(WS_TEXT, body))
+            await self._writer.drain()
+            return await reply
+        finally:
+            self.in_flight -= 1
+            for request_id in ids:
+                waiters = self._pending.get(request_id, [])
+                if reply in waiters:
+                    waiters.remove(reply)
+                if not waiters:
+                    self._pending.pop(request_id, None)
+
+    async def _read_replies(self) -> None:
+        try:
+            while True:
+                head, tail = await self._read_message()
+                reply = self._route(head, tail)
+                if reply is not None and not reply.done():
+                    reply.set_result(head)
+        except TRANSPORT_ERRORS:
+            pass
+        finally:
+            self.closed = True
+            for waiters in self._pending.values():
+                for reply in waiters:
+                    if not reply.done():
+                        reply.set_exception(ConnectionError("connection closed"))
+            _close((self._reader, self._writer))
+
+    def _route(self, head: bytes, tail: bytes) -> asyncio.Future | None:
+        """The oldest request waiting on the reply's id, found from the tail when the id comes last
+        (the common case, no parse) and otherwise from the parsed reply or batch."""
+        found = WS_TRAILING_ID.search(tail)
+        ids: list[int] = [int(found.group(1))] if found is not None else []
+        if found is None and len(head) <= self._max:
+            try:
+                document = json.loads(head)
+            except ValueError:
+                document = None
+            ids = [element["id"] for element in (document if isinstance(document, list) else [document])
+                   if isinstance(element, dict) and isinstance(element.get("id"), int)]
+        for request_id in ids:
+            waiters = [reply for reply in self._pending.get(request_id, []) if not reply.done()]
+            if waiters:
+                return waiters[0]
+        if ids:
+            return None  # a late reply to a request that already timed out
+        # Unroutable (a null-id error, say): only unambiguous when one request is waiting.
+        waiting = {reply for waiters in self._pending.values() for reply in waiters if not reply.done()}
+        return waiting.pop() if len(waiting) == 1 else None
+
+    async def _read_message(self) -> tuple[bytes, bytes]:
+        """The next text message as (first cap + 1 bytes, last WS_TAIL_BYTES bytes); answers pings."""
+        head = bytearray()
+        tail = b""
+        while True:
+            first, second = await self._reader.readexactly(2)
+            opcode, length = first & 0x0F, second & 0x7F
+            if length == 126:
+                length = struct.unpack(">H", await self._reader.readexactly(2))[0]
+            elif length == 127:
+                length = struct.unpack(">Q", await self._reader.readexactly(8))[0]
+            mask = await self._reader.readexactly(4) if second & 0x80 else None
+            payload = bytearray()
+            remaining = length
+            while remaining:
+                # Over the cap, keep the head and a sliding tail instead of the whole message.
+                chunk = await self._reader.readexactly(min(remaining, 1 << 20))
+                remaining -= len(chunk)
+                if mask is not None:
+                    chunk = _mask(chunk, mask, length - remaining - len(chunk))
+                if opcode >= WS_CLOSE:
+                    payload += chunk
+                    continue
+                if len(head) <= self._max:
+                    head += chunk[:self._max + 1 - len(head)]
+                tail = (tail + chunk)[-WS_TAIL_BYTES:]
+            if opcode == WS_CLOSE:
+                raise ConnectionError("closed by peer")
+            if opcode == WS_PING:
+                self._writer.write(_ws_frame(0xA, (payload,)))
+                continue
+            if opcode > WS_CLOSE:
+                continue  # pong
+            if first & 0x80:
+                return bytes(head), tail
+
+    async def close(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def _ws_frame(opcode: int, parts: Sequence[bytes | memoryview]) -> bytes:
+    """A final client frame carrying the parts as one payload, masked with a fresh random key."""
+    payload = b"".join(parts)
+    length = len(payload)
+    key = os.urandom(4)
+    if length < 126:
+        header = bytes((0x80 | opcode, 0x80 | length))
+    elif length < 1 << 16:
+        header = bytes((0x80 | opcode, 0x80 | 126)) + struct.pack(">H", length)
+    else:
+        header = bytes((0x80 | opcode, 0x80 | 127)) + struct.pack(">Q", length)
+    return header + key + _mask(payload, key, 0)
+
+
+def _mask(chunk: bytes, mask: bytes, offset: int) -> bytes:
+    """XOR a chunk that starts `offset` bytes into a payload with its masking key; masks and unmasks."""
+    key = (mask[offset % 4:] + mask[:offset % 4]) * (len(chunk) // 4 + 1)
+    return (int.from_bytes(chunk, "little") ^ int.from_bytes(key[:len(chunk)], "little")).to_bytes(len(chunk), "little")
+
+
+Pool = HttpPool | IpcPool | WsPool
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
+# SPDX-License-Identifier: LGPL-3.0-only
+
+"""Log-bucketed latency histograms that merge exactly and answer percentiles without raw samples.
+
+Buckets split every power of two of microseconds into SUB_BUCKETS equal log steps, so any
+recorded value is known to within ~1.1% however wide the range, and a histogram of a billion
+requests is a few hundred (bucket, count) pairs. Two histograms merge by adding counts, so
+percentiles over many cells are exact to the bucket rather than an average of percentiles.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Iterable
+
+SUB_BUCKETS = 64
+UNIT = "us"
+
+
+def _bucket(ms: float) -> int:
+    micros = ms * 1000.0
+    return 0 if micros < 1.0 else int(math.log2(micros) * SUB_BUCKETS)
+
+
+class LatencyHistogram:
+    """Counts per log bucket of latencies recorded in milliseconds."""
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.total = 0
+
+    def record(self, ms: float) -> None:
+        index = _bucket(ms)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+
+    def merge(self, other: LatencyHistogram) -> LatencyHistogram:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        return self
+
+    def percentile(self, share: float) -> float:
+        """Latency in ms below which `share` of the recorded values fall, to bucket precision."""
+        if not self.total:
+            return 0.0
+        rank = max(1, math.ceil(share * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                # Geometric midpoint of the bucket; bucket 0 holds everything under 1 us.
+                return 0.0 if index == 0 else 2 ** ((index + 0.5) / SUB_BUCKETS) / 1000.0
+        return 0.0  # unreachable: the last bucket always reaches the total
+
+    def to_json(self) -> dict[str, Any]:
+        return {"count": self.total, "buckets": [[index, self.counts[index]] for index in sorted(self.counts)]}
+
+    @classmethod
+    def from_json(cls, data: Any) -> LatencyHistogram:
+        """Rebuild from to_json output; ValueError on anything that is not exactly that shape."""
+        if not isinstance(data, dict) or set(data) != {"count", "buckets"} or not isinstance(data["buckets"], list):
+            raise ValueError("not a histogram")
+        histogram = cls()
+        for pair in data["buckets"]:
+            if not isinstance(pair, list) or len(pair) != 2 or not all(_is_count(value) for value in pair) \
+                    or pair[1] == 0 or pair[0] in histogram.counts:
+                raise ValueError("malformed bucket")
+            histogram.counts[pair[0]] = pair[1]
+            histogram.total += pair[1]
+        if not _is_count(data["count"]) or data["count"] != histogram.total:
+            raise ValueError("count does not match the buckets")
+        return histogram
+
+
+def merged(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    total = LatencyHistogram()
+    for histogram in histograms:
+        total.merge(histogram)
+    return total
+
+
+def _is_count(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
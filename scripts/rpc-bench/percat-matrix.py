@@ -2,8 +2,14 @@
 # SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
 # SPDX-License-Identifier: LGPL-3.0-only
 #
-# Aggregate per-cell jsonbench-summary.md from run-rpc-sweep.sh into MIXED-overall/ISOLATED/MIXED-per-scenario views.
-# Args: 'iso|<scenario>|<client>|<rps>=<summary.md>', 'mix|<client>|<rps>=<summary.md>' (legacy '<client>:<rps>=<md>' = MIXED cell).
+# Aggregate per-cell jsonbench-summary.md from run-rpc-sweep.sh into MIXED-overall/ISOLATED/MIXED-per-scenario views,
+# plus a Universal Scalability Law capacity model per client (MIXED) and per client x scenario (ISOLATED), and a
+# MIXED-vs-ISOLATED interference report per scenario.
+# Args: 'iso|<scenario>|<client>|<rps>=<summary.md>', 'mix|<client>|<rps>=<summary.md>' (legacy '<client>:<rps>=<md>' = MIXED cell),
+# 'loo|<client>|<rps>|<left-out call>=<summary.md>' (a MIXED cell without one call, for the interference drivers).
+# Options: --target-p99-ms=<ms> (capacity target, default 100), --curves=<csv> (write the fitted curves).
+import csv
+import math
 import re
 import sys
 
@@ -15,8 +21,9 @@ _OVR = {
     "tput": re.compile(r"\|\s*throughput \(req/s\)\s*\|\s*([0-9.]+)"),
     "checks": re.compile(r"\|\s*checks passed\s*\|\s*([0-9.]+)%"),
 }
+# Call names may contain spaces (the curated config's "WETH balance eth_call"); norm() turns them into '-'.
 _METH = re.compile(
-    r"\|\s*([\w/#-]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|"
+    r"\|\s*([\w/#-][\w/#. -]*?)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|\s*([0-9.]+)\s*\|"
 )
 
 
@@ -39,15 +46,200 @@ def parse(path):
         if in_meth:
             m = _METH.match(line.strip())
             if m and m.group(1) != "method":
-                meth[norm(m.group(1))] = {"p90": float(m.group(4)), "p99": float(m.group(6))}
+                meth[norm(m.group(1))] = {"avg": float(m.group(2)), "p90": float(m.group(4)), "p99": float(m.group(6))}
     return ovr, meth
 
 
+# USL: X(N) = lam*N / (1 + sig*(N-1) + kap*N*(N-1)). The sweep is open-loop, so N (requests in flight) is not set
+# but measured by Little's law, N = X * mean latency; then N/X is the mean latency R, and the model is linear in
+# its coefficients: R(N) = a + b*(N-1) + c*N*(N-1), with lam = 1/a, sig = b/a, kap = c/a.
+TARGET_P99_MS = 100.0
+CURVE_POINTS = 40
+
+
+def _solve(m, v):
+    """Gaussian elimination with partial pivoting; None if singular."""
+    n = len(v)
+    m = [row[:] + [v[i]] for i, row in enumerate(m)]
+    for col in range(n):
+        piv = max(range(col, n), key=lambda r: abs(m[r][col]))
+        if abs(m[piv][col]) < 1e-15:
+            return None
+        m[col], m[piv] = m[piv], m[col]
+        for r in range(col + 1, n):
+            f = m[r][col] / m[col][col]
+            for k in range(col, n + 1):
+                m[r][k] -= f * m[col][k]
+    x = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        x[r] = (m[r][n] - sum(m[r][k] * x[k] for k in range(r + 1, n))) / m[r][r]
+    return x
+
+
+def usl_fit(cells):
+    """Fit the USL to [(throughput r/s, mean latency ms, p99 ms)]; None with fewer than 2 usable cells.
+
+    Contention and coherency are physical only when non-negative, so every subset of them is fitted and the
+    best non-negative one kept (a flat or noisy sweep then honestly reports 0 rather than a negative cost).
+    """
+    pts = [(x * r / 1000.0, r / 1000.0, p99 / r) for x, r, p99 in cells if x > 0 and r > 0]
+    if len(pts) < 2:
+        return None
+    best = None
+    for terms in ((), ("b",), ("c",), ("b", "c")):
+        if len(terms) + 1 > len(pts):
+            continue
+        basis = [lambda n: 1.0] + [{"b": lambda n: n - 1, "c": lambda n: n * (n - 1)}[t] for t in terms]
+        rows = [[f(n) for f in basis] for n, _, _ in pts]
+        coef = _solve([[sum(rw[i] * rw[j] for rw in rows) for j in range(len(basis))] for i in range(len(basis))],
+                      [sum(rw[i] * y for rw, (_, y, _) in zip(rows, pts)) for i in range(len(basis))])
+        if coef is None or coef[0] <= 0 or any(c < 0 for c in coef[1:]):
+            continue
+        sse = sum((sum(c * v for c, v in zip(coef, rw)) - y) ** 2 for rw, (_, y, _) in zip(rows, pts))
+        if best is None or sse < best[0]:
+            named = dict(zip(("a",) + terms, coef))
+            best = (sse, named.get("a"), named.get("b", 0.0), named.get("c", 0.0))
+    if best is None:
+        return None
+    _, a, b, c = best
+    ratios = sorted(q for _, _, q in pts)
+    fit = {"lam": 1 / a, "sig": b / a, "kap": c / a, "cells": len(pts), "max_n": max(n for n, _, _ in pts),
+           "max_rps": max(x for x, r, _ in cells if x > 0 and r > 0),
+           "p99_ratio": ratios[len(ratios) // 2]}    # p99 read as a fixed multiple of the mean: the median observed
+    # peak: dX/dN = 0 at N* = sqrt((1 - sig) / kap); without coherency X only approaches lam/sig (or grows linearly)
+    fit["peak_n"] = math.sqrt((1 - fit["sig"]) / fit["kap"]) if fit["kap"] > 0 and fit["sig"] < 1 else math.inf
+    fit["peak_rps"] = usl_x(fit, fit["peak_n"]) if fit["peak_n"] < math.inf else (
+        fit["lam"] / fit["sig"] if fit["sig"] > 0 else math.inf)
+    # knee: where mean latency has doubled over unloaded, 1 + sig*(N-1) + kap*N*(N-1) = 2
+    fit["knee_n"] = _grow_to(fit, 2.0)
+    fit["knee_rps"] = usl_x(fit, min(fit["knee_n"], fit["peak_n"]))
+    return fit
+
+
+def usl_x(fit, n):
+    if n == math.inf:
+        return math.inf
+    return fit["lam"] * n / (1 + fit["sig"] * (n - 1) + fit["kap"] * n * (n - 1))
+
+
+def usl_mean_ms(fit, n):
+    return 1000.0 * (1 + fit["sig"] * (n - 1) + fit["kap"] * n * (n - 1)) / fit["lam"]
+
+
+def _grow_to(fit, factor):
+    """N at which mean latency is `factor` x its value at N=1 (positive root of kap*N^2 + (sig-kap)*N - (sig+f-1))."""
+    sig, kap, k = fit["sig"], fit["kap"], factor - 1
+    if kap > 0:
+        return (-(sig - kap) + math.sqrt((sig - kap) ** 2 + 4 * kap * (sig + k))) / (2 * kap)
+    return 1 + k / sig if sig > 0 else math.inf
+
+
+def capacity_at(fit, target_p99_ms):
+    """Highest modeled throughput whose p99 stays within target, on the rising side of the curve; 0 if even one
+    request in flight is too slow."""
+    if fit["p99_ratio"] * 1000.0 / fit["lam"] * (1 - fit["sig"]) > target_p99_ms:
+        return 0.0     # the model's latency at N -> 0 is already over the target
+    n = max(_grow_to(fit, target_p99_ms / fit["p99_ratio"] * fit["lam"] / 1000.0), 0.0)
+    return usl_x(fit, min(n, fit["peak_n"]))
+
+
+def _rate(r):
+    return int(r.split("_")[0])     # repeated rates arrive as slots like 100_r2
+
+
+def capacity(iso, mix, clients, target, curves):
+    """USL per client (MIXED overall) and per client x scenario (ISOLATED); table on stdout, curves to CSV."""
+    groups = []
+    for c in clients:
+        cells = [(o.get("tput", 0), o.get("avg", 0), o.get("p99", 0)) for (cc, r), (o, _) in sorted(mix.items()) if cc == c]
+        groups.append((c, "MIXED", "all", cells))
+        for s in sorted({s for s, cc, _ in iso if cc == c}):
+            cells = [(o.get("tput", 0), o.get("avg", 0), o.get("p99", 0)) for (ss, cc, _), o in sorted(iso.items())
+                     if ss == s and cc == c]
+            groups.append((c, "ISOLATED", s, cells))
+    print(f"\n## Capacity model (USL, N = throughput x mean latency) - capacity at p99 <= {target:g} ms\n")
+    print("| client | mode | scenario | cells | lambda r/s | contention sigma | coherency kappa | peak rps | knee rps | capacity rps |")
+    print("|---|---|---|---|---|---|---|---|---|---|")
+    rows = []
+    for c, mode, s, cells in groups:
+        fit = usl_fit(cells)
+        if not fit:
+            print(f"| {c} | {mode} | {s} | {len(cells)} | - | - | - | - | - | - |")
+            continue
+        # A node that kept up at every swept rate fits no contention; its limits lie past the sweep, not at infinity.
+        fmt = lambda v: f"not reached within sweep (max {fit['max_rps']:.0f} rps)" if v == math.inf else f"{v:.0f}"  # noqa: E731
+        print(f"| {c} | {mode} | {s} | {fit['cells']} | {fit['lam']:.0f} | {fit['sig']:.4f} | {fit['kap']:.6f} | "
+              f"{fmt(fit['peak_rps'])} | {fmt(fit['knee_rps'])} | {fmt(capacity_at(fit, target))} |")
+        # Curve from 0 to past the peak, or to twice the most loaded cell when there is no peak.
+        top = fit["peak_n"] * 1.5 if fit["peak_n"] < math.inf else fit["max_n"] * 2
+        for i in range(1, CURVE_POINTS + 1):
+            n = top * i / CURVE_POINTS
+            mean = usl_mean_ms(fit, n)
+            rows.append([c, mode, s, f"{n:.4f}", f"{usl_x(fit, n):.2f}", f"{mean:.3f}", f"{mean * fit['p99_ratio']:.3f}"])
+    print("\nlambda: throughput per request in flight at low load; sigma: serialized share; kappa: pairwise "
+          "crosstalk cost. peak: where adding load lowers throughput; knee: where mean latency has doubled.")
+    if curves:
+        with open(curves, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["client", "mode", "scenario", "in_flight", "throughput_rps", "mean_ms", "p99_ms"])
+            w.writerows(rows)
+
+
+def match_call(scenario, calls):
+    """The MIXED call an ISOLATED scenario measures: same name, else the longest call name its config name ends with
+    after a separator (eth_call-heavy.yaml's scenario is 'eth_call-heavy', its call perhaps 'heavy'); None if neither."""
+    scenario = norm(scenario)
+    if scenario in calls:
+        return scenario
+    tails = [c for c in calls if scenario.endswith(c) and scenario[-len(c) - 1] in "-_"]
+    return max(tails, key=len) if tails else None
+
+
+def interference(iso, mix, loo, clients, rpss):
+    """Per scenario and rate, how much slower its call runs MIXED than ALONE, ranked worst first.
+
+    Both cells run at the same total rps, so MIXED adds the other calls' load and takes away some of this one's.
+    Per-call throughput is not in the summaries; throughput loss is read at equal requests in flight (Little's law:
+    X = N / mean latency), i.e. 1 - isolated avg / mixed avg. A driver is the co-running call whose leave-one-out
+    cell relieves this call's p99 most.
+    """
+    rows = []
+    for c in clients:
+        for r in rpss:
+            if (c, r) not in mix:
+                continue
+            calls = mix[(c, r)][1]
+            for s in sorted({s for s, cc, rr in iso if cc == c and rr == r}):
+                o, call = iso[(s, c, r)], match_call(s, calls)
+                if not call or not o.get("p99") or not o.get("avg"):
+                    continue
+                m = calls[call]
+                reliefs = sorted(((m["p99"] / loo[(c, r, t)][call]["p99"] - 1, t) for t in calls
+                                  if t != call and (c, r, t) in loo and loo[(c, r, t)].get(call, {}).get("p99")),
+                                 reverse=True)
+                rows.append((m["p99"] / o["p99"], c, r, s, o, m, reliefs))
+    if not rows:
+        return
+    print("\n## Interference - MIXED vs ISOLATED per scenario, worst p99 inflation first\n")
+    print("| scenario | client@rps | p99 alone -> mixed ms | p99 x | p90 x | avg x | throughput loss | drivers (p99 relief without) |")
+    print("|---|---|---|---|---|---|---|---|")
+    for inflation, c, r, s, o, m, reliefs in sorted(rows, key=lambda row: row[0], reverse=True):
+        p90 = f"{m['p90'] / o['p90']:.2f}" if o.get("p90") else "-"
+        drivers = ", ".join(f"{t} {relief * 100:+.0f}%" for relief, t in reliefs[:3]) if reliefs else "-"
+        print(f"| {s} | {c}@{r} | {o['p99']:.0f} -> {m['p99']:.0f} | {inflation:.2f} | {p90} | {m['avg'] / o['avg']:.2f} | "
+              f"{(1 - o['avg'] / m['avg']) * 100:.0f}% | {drivers} |")
+    if not loo:
+        print("\nDrivers need leave-one-out MIXED cells (sweep key leave_one_out).")
+
+
 def main():
     argv = sys.argv[1:]
+    opts = dict(a[2:].split("=", 1) for a in argv if a.startswith("--") and "=" in a)
+    argv = [a for a in argv if not a.startswith("--")]
+    target = float(opts.get("target-p99-ms", TARGET_P99_MS))
     if len(argv) == 1 and argv[0].startswith("@"):  # @manifest: one 'key=path' per line (avoids ARG_MAX on big sweeps)
         argv = [ln.strip() for ln in open(argv[0][1:], encoding="utf-8") if ln.strip()]
-    iso, mix = {}, {}                 # iso[(scen,client,rps)]=ovr ; mix[(client,rps)]=(ovr,meth)
+    iso, mix, loo = {}, {}, {}        # iso[(scen,client,rps)]=ovr ; mix[(client,rps)]=(ovr,meth) ; loo[(client,rps,out)]=meth
     clients, rpss, scen_iso, scen_mix = [], [], [], []
     for arg in argv:
         key, path = arg.split("=", 1)
@@ -57,6 +249,9 @@ def main():
             iso[(scen, client, rps)] = ovr
             if scen not in scen_iso:
                 scen_iso.append(scen)
+        elif key.startswith("loo|"):
+            _, client, rps, out = key.split("|")
+            loo[(client, rps, out)] = parse(path)[1]
         else:
             if key.startswith("mix|"):
                 _, client, rps = key.split("|")
@@ -71,7 +266,7 @@ def main():
             clients.append(client)
         if rps not in rpss:
             rpss.append(rps)
-    rpss.sort(key=int)
+    rpss.sort(key=_rate)
     cols = [(c, r) for c in clients for r in rpss]
 
     # 1) MIXED overall (saturation)
@@ -114,5 +309,11 @@ def main():
             row = [s] + [f"{mix[(c,r)][1][s]['p99']:.0f}" if (c, r) in mix and s in mix[(c, r)][1] else "-" for c, r in cols]
             print("| " + " | ".join(row) + " |")
 
+    # 4) Capacity model per client, MIXED and each ISOLATED scenario
+    capacity(iso, mix, clients, target, opts.get("curves"))
+
+    # 5) Interference: each scenario MIXED vs ALONE, with leave-one-out drivers when the sweep ran them
+    interference(iso, mix, loo, clients, rpss)
+
 if __name__ == "__main__":
     main()
@@ -34,6 +34,9 @@ JB_COMPARE_CONFIG="${JB_COMPARE_CONFIG:-config/compare/defaults.yaml}"
 JB_RPS="${JB_RPS:-}"                         # override the workload's rps; empty = keep it (generated default: 100)
 JB_DURATION="${JB_DURATION:-}"               # override the workload's k6 duration; empty = keep it (generated default: 60s)
 JB_VUS="${JB_VUS:-}"                         # override the workload's vus; empty = keep it (generated default: 10)
+# Drop the call with this name (as percat-matrix.py normalizes it) from a benchmark_config, leaving the rest at the
+# same total rps — the sweep's leave-one-out MIXED cells. Needs a benchmark_config; the call must exist.
+JB_EXCLUDE_CALL="${JB_EXCLUDE_CALL:-}"
 JB_CONCURRENCY="${JB_CONCURRENCY:-5}"        # compare mode
 JB_TIMEOUT="${JB_TIMEOUT:-30}"               # compare mode, per-request seconds
 JB_VALIDATE_SCHEMA="${JB_VALIDATE_SCHEMA:-false}"
@@ -145,6 +148,9 @@ resolve_config() {
   fi
 }
 
+if [[ -n "$JB_EXCLUDE_CALL" && ( "$JB_MODE" != "benchmark" || -z "$JB_BENCHMARK_CONFIG" ) ]]; then
+  die "JB_EXCLUDE_CALL needs benchmark mode with a benchmark_config"
+fi
 if [[ "$JB_MODE" == "benchmark" && -z "$JB_BENCHMARK_CONFIG" ]]; then
   # Default read mix targeting OUR registry names. Loose per-call thresholds never trip;
   # they only make k6 emit a per-method http_req_duration sub-metric into summary.json.
@@ -213,9 +219,9 @@ elif [[ "$JB_MODE" == "benchmark" ]]; then
   ref_label=""
   [[ -n "$REFERENCE_RPC_URL" ]] && ref_label="$REFERENCE_LABEL"
   JB_PRIMARY_LABEL="$LABEL" JB_REF_LABEL="$ref_label" \
-  JB_RPS="$JB_RPS" JB_VUS="$JB_VUS" JB_DURATION="$JB_DURATION" \
+  JB_RPS="$JB_RPS" JB_VUS="$JB_VUS" JB_DURATION="$JB_DURATION" JB_EXCLUDE_CALL="$JB_EXCLUDE_CALL" \
   python3 - "$src_bench" "$work/io/benchmark.yaml" <<'PY'
-import os, sys, yaml
+import os, re, sys, yaml
 
 src, out = sys.argv[1], sys.argv[2]
 with open(src) as f:
@@ -234,6 +240,14 @@ dur = os.environ.get("JB_DURATION", "").strip()
 if dur:
     cfg["duration"] = dur
 
+excluded = os.environ.get("JB_EXCLUDE_CALL", "")
+if excluded:
+    calls = cfg.get("calls", []) or []
+    kept = [c for c in calls if re.sub(r"[^a-zA-Z0-9_-]", "-", str(c.get("name", ""))) != excluded]
+    if len(kept) == len(calls) or not kept:
+        sys.exit(f"JB_EXCLUDE_CALL '{excluded}' matches no call, or every call")
+    cfg["calls"] = kept
+
 # Fixtures stay relative: container CWD is /jb and json-bench's loader (SafeReadPath)
 # rejects absolute paths, so ./rpc-calls/... resolve as-is.
 for call in cfg.get("calls", []) or []:
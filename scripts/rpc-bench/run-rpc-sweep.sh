@@ -25,6 +25,12 @@ ISO_CONFIGS="${ISO_CONFIGS:-}"          # space-separated repo-relative single-s
 STATE_LAYOUT="${STATE_LAYOUT:-flat}"
 JB_DURATION="${JB_DURATION:-60s}"       # mixed-run load duration
 ISO_DURATION="${ISO_DURATION:-20s}"     # per-scenario isolated load duration (shorter; single call)
+# Per MIXED cell, also run one MIXED cell per call with that call left out (same total rps, so the rest take its
+# share): percat-matrix.py's interference report then names which co-running calls drive each one's slowdown.
+# Costs (calls x rps_list) extra JB_DURATION cells per client.
+SWEEP_LEAVE_ONE_OUT="${SWEEP_LEAVE_ONE_OUT:-false}"
+# p99 the capacity model's "capacity rps" is read at; the fitted curves land in $OUT_DIR/capacity-curves.csv.
+CAPACITY_TARGET_P99_MS="${CAPACITY_TARGET_P99_MS:-100}"
 NETWORK="${NETWORK:-mainnet}"
 JSONRPC_MODULES="${JSONRPC_MODULES:-Eth,Subscribe,Trace,TxPool,Web3,Proof,Net,Parity,Health,Rpc,Debug}"
 HEALTH_TIMEOUT="${HEALTH_TIMEOUT:-1800}"
@@ -50,16 +56,59 @@ CORPUS_PASSES="${CORPUS_PASSES:-}"
 CORPUS_TIMINGS_PASSES="${CORPUS_TIMINGS_PASSES:-}"
 CORPUS_TIMINGS_RPS="${CORPUS_TIMINGS_RPS:-0}"
 CORPUS_TIMINGS_CONCURRENCY="${CORPUS_TIMINGS_CONCURRENCY:-16}"
+# eth_calls per JSON-RPC batch for parity and timings; 1 sends single calls. Above 1 the timings
+# matrix holds per-call amortized latency and timings-batches.csv the whole-batch latency.
+CORPUS_BATCH_SIZE="${CORPUS_BATCH_SIZE:-1}"
 # Characterise each parity divergence word by word. Derived from response bytes, so opt-in.
 CORPUS_PARITY_DIFFS="${CORPUS_PARITY_DIFFS:-false}"
+# Reuse baseline results across runs from a cache on the snapshot disk, keyed by chain, block hash,
+# client version, image ID and node flags: a repeat baseline of the same corpus on the same snapshot
+# and image reads them back instead of replaying. The cache holds raw response bytes, like the
+# parity state, so it lives on scratch and is never artifacted.
+CORPUS_BASELINE_CACHE="${CORPUS_BASELINE_CACHE:-false}"
+CORPUS_BASELINE_CACHE_DIR="${CORPUS_BASELINE_CACHE_DIR:-$SCRATCH_ROOT/baseline-cache}"
+# Let the parity replays find their own in-flight limit (AIMD) instead of the fixed default; each
+# replay prints the concurrency it settled at.
+CORPUS_PARITY_ADAPTIVE="${CORPUS_PARITY_ADAPTIVE:-false}"
+# Fetch and classify parity responses in this many worker processes instead of one; helps corpora
+# with large results, where response parsing rather than the node bounds the replay.
+CORPUS_PARITY_PROCESSES="${CORPUS_PARITY_PROCESSES:-1}"
+# Keep the latency of every parity exchange and write it as the cell's timings.csv (one pass,
+# closed-loop at the parity concurrency), instead of replaying the corpus again for timings.
+CORPUS_PARITY_TIMINGS="${CORPUS_PARITY_TIMINGS:-false}"
+if [[ "$CORPUS_PARITY_TIMINGS" == "true" && -n "$CORPUS_TIMINGS_PASSES" ]]; then
+  echo "::error::parity_timings and timings_passes cannot be combined: both write the cell's timings.csv"
+  exit 1
+fi
+# Store a 16-byte digest per parity record instead of the result bytes, so the baseline state stays
+# small for a billion-record corpus. Diffs then need the baseline node, which this sweep has
+# already stopped by the time a candidate is compared — so the two are mutually exclusive here.
+CORPUS_PARITY_DIGEST="${CORPUS_PARITY_DIGEST:-false}"
+if [[ "$CORPUS_PARITY_DIGEST" == "true" && "$CORPUS_PARITY_DIFFS" == "true" ]]; then
+  echo "::error::parity_digest and parity_diffs cannot be combined: digest-only diffs need the baseline node running"
+  exit 1
+fi
 # Sample the node container's cgroup during each corpus cell. Counters only, and a missing cgroup
 # is a no-op, so this is on by default: without it a cross-client latency gap cannot be attributed
 # to doing more work, waiting on IO, or leaving the machine idle.
 CORPUS_RESOURCE_SAMPLING="${CORPUS_RESOURCE_SAMPLING:-true}"
+# Keep the parity state directory of an interrupted sweep instead of wiping it: a committed
+# baseline state is reused, and a partial baseline or compare resumes from its checkpoint. Both
+# are keyed to the corpus file, node identity and client build, so stale work is never reused.
+CORPUS_PARITY_RESUME="${CORPUS_PARITY_RESUME:-false}"
 # Discarded load applied to each node before its measured cells. Default covers two 120s cells,
 # which is what the 2026-08-13 measurements showed is needed to reach a 0% failure rate; set to 0
 # to measure a cold node deliberately.
 CORPUS_WARMUP_DURATION="${CORPUS_WARMUP_DURATION:-240s}"
+# fixed: burn the whole warm-up duration. converge: a paced corpus replay that stops once windowed
+# p50/p99 and the failure rate hold steady, with the duration as its cap.
+CORPUS_WARMUP_MODE="${CORPUS_WARMUP_MODE:-fixed}"
+# A/A noise calibration: run NM_IMAGE this many times (instead of CLIENTS) at the same head, rates
+# and warm-up, and measure how far identical runs drift apart per percentile. The result refreshes
+# CORPUS_NOISE_FILE, which every later corpus sweep on this runner stages as noise.json so the PR
+# comment colors deltas against measured noise. Empty = a normal sweep.
+CORPUS_NOISE_CALIBRATION="${CORPUS_NOISE_CALIBRATION:-}"
+CORPUS_NOISE_FILE="${CORPUS_NOISE_FILE:-$CORPUS_DIR/noise.json}"
 PARITY_STATE="$SCRATCH_ROOT/parity"
 
 # Free-form knobs reach shell arithmetic, where under `set -uo pipefail` (no -e) a value such as
@@ -76,6 +125,7 @@ require_positive_int CORPUS_REQUESTS "$CORPUS_REQUESTS"
 require_positive_int CORPUS_PASSES "$CORPUS_PASSES"
 require_positive_int CORPUS_TIMINGS_PASSES "$CORPUS_TIMINGS_PASSES"
 require_positive_int CORPUS_TIMINGS_CONCURRENCY "$CORPUS_TIMINGS_CONCURRENCY"
+require_positive_int CORPUS_BATCH_SIZE "$CORPUS_BATCH_SIZE"
 if [[ -n "$CORPUS_REQUESTS" && -n "$CORPUS_PASSES" ]]; then
   echo "::error::corpus_requests and corpus_passes are mutually exclusive"; exit 1
 fi
@@ -92,6 +142,17 @@ if [[ ! "$CORPUS_WARMUP_DURATION" =~ ^[0-9]+s?$ ]]; then
   echo "::error::corpus_warmup_duration must be integer seconds (optional 's' suffix), got '${CORPUS_WARMUP_DURATION}'"; exit 1
 fi
 WARMUP_SECONDS="${CORPUS_WARMUP_DURATION%s}"
+if [[ "$CORPUS_WARMUP_MODE" != "fixed" && "$CORPUS_WARMUP_MODE" != "converge" ]]; then
+  echo "::error::corpus_warmup_mode must be fixed or converge, got '${CORPUS_WARMUP_MODE}'"; exit 1
+fi
+require_positive_int CORPUS_NOISE_CALIBRATION "$CORPUS_NOISE_CALIBRATION"
+if [[ -n "$CORPUS_NOISE_CALIBRATION" ]]; then
+  if [[ "$JB_ETH_CALL_CORPUS" != "true" || -z "${RPS_LIST// /}" ]] || (( CORPUS_NOISE_CALIBRATION < 2 )); then
+    echo "::error::noise_calibration needs corpus mode, a non-empty rps_list and at least 2 repeats"; exit 1
+  fi
+  # Repeats of one image get labels <label>, <label>_r2, ... below, which is what `noise` pairs up.
+  CLIENTS="$(for _ in $(seq "$CORPUS_NOISE_CALIBRATION"); do printf 'nethermind@%s ' "$NM_IMAGE"; done)"
+fi
 
 # Sweep mode resolves ONE snapshot set — Nethermind, flat layout, at SNAPSHOT_BLOCK — and varies only
 # the image, so a geth/reth entry would reach start-node.sh with a DB_SOURCE that does not exist. That
@@ -257,7 +318,8 @@ if [[ "$JB_ETH_CALL_CORPUS" == "true" ]]; then
       echo "::error::corpus $(corpus_label "$corpus") failed validation — fix the file before sweeping"; exit 1
     fi
   done
-  rm -rf "$PARITY_STATE"; mkdir -p "$PARITY_STATE"
+  [[ "$CORPUS_PARITY_RESUME" == "true" ]] || rm -rf "$PARITY_STATE"
+  mkdir -p "$PARITY_STATE"
 fi
 
 # Each entry is a client type or 'ctype@image' (e.g. nethermind@nethermindeth/nethermind:master) for
@@ -292,6 +354,14 @@ for entry in $CLIENTS; do
     echo "::warning::${label} failed to start — skipping its cells"; echo "::endgroup::"; continue
   fi
   LABELS+=("$label")
+  # Everything besides block and client version that pins this node's eth_call results; hashed so
+  # it is one word on the command line. No image ID (e.g. a failed inspect) means no cache.
+  cache_identity=""
+  if [[ "$CORPUS_BASELINE_CACHE" == "true" ]]; then
+    image_id="$(docker image inspect --format '{{.Id}}' "$img" 2>/dev/null || true)"
+    [[ -n "$image_id" ]] && cache_identity="$(printf '%s|' "$image_id" "$ctype" "$NM_LAYOUT_FLAGS" \
+      "$CORPUS_RPC_GAS_CAP" "${NODE_ENV_VARS:-}" | sha256sum | cut -c1-32)"
+  fi
 
   if [[ "$JB_ETH_CALL_CORPUS" == "true" ]]; then
     # One latency cell per corpus per rps, then one full-corpus parity replay per corpus
@@ -328,7 +398,26 @@ for entry in $CLIENTS; do
         # concurrency/latency), so THERE an elapsed clock plus a hard `timeout` state the
         # truth; hitting the bound still IS a completed warm-up — the node absorbed load for
         # the whole window.
-        if [[ -n "$RPS_LIST" ]]; then
+        if [[ "$CORPUS_WARMUP_MODE" == "converge" ]]; then
+          # Same paced eth_calls as the replay branch, but it ends as soon as the node has settled
+          # rather than after the whole budget; its report states the seconds actually applied. It
+          # never needs the k6 fixture or the record count.
+          mkdir -p "$warm_cell"
+          warm_started=$SECONDS
+          timeout $(( WARMUP_SECONDS + 60 )) python3 "$here/corpus_parity.py" warmup \
+              --corpus "$corpus" --rpc-url "http://localhost:8545" --out "$warm_cell/warmup.json" \
+              --rps "$warm_rps" --concurrency "$CORPUS_TIMINGS_CONCURRENCY" --max-seconds "$WARMUP_SECONDS"
+          warm_status=$?
+          if [[ "$warm_status" -eq 0 ]]; then
+            WARMED_SECONDS="$(jq -r '.warmup_seconds' "$warm_cell/warmup.json")"
+            [[ "$(jq -r '.converged' "$warm_cell/warmup.json")" == "true" ]] \
+              || echo "::warning::warmup for ${label} on ${clabel} did not converge within ${WARMUP_SECONDS}s"
+          elif [[ "$warm_status" -eq 124 ]]; then
+            WARMED_SECONDS=$(( SECONDS - warm_started ))
+          else
+            echo "::warning::warmup replay for ${label} failed — measured cells may be cold (recorded warmup_seconds=0)"
+          fi
+        elif [[ -n "$RPS_LIST" ]]; then
           # The k6 cells build the JSON-array fixture anyway, so warming through run_cell adds no
           # extra materialization. The fail-rate gate is LIFTED for this cell: the warm-up exists
           # to absorb exactly the cold failures the gate rejects, so gating it inverts its exit
@@ -388,9 +477,19 @@ for entry in $CLIENTS; do
       unset RPS_SEEN
       if [[ -z "$BASELINE_LABEL" ]]; then
         echo "-- PARITY ${clabel}: capturing baseline (${label}) --"
-        if ! python3 "$here/corpus_parity.py" baseline \
+        if [[ "$CORPUS_PARITY_RESUME" == "true" && -f "$PARITY_STATE/${clabel}.state" ]]; then
+          # compare re-checks the node identity against it, so a stale state fails loudly there.
+          echo "reusing the committed baseline state from an earlier run"
+          if [[ "$CORPUS_PARITY_TIMINGS" == "true" ]]; then
+            echo "::warning::no baseline timings matrix for ${label} on corpus ${clabel}: the resumed baseline state was reused, not replayed"
+          fi
+        elif ! python3 "$here/corpus_parity.py" baseline \
             --corpus "$corpus" --rpc-url "http://localhost:8545" \
-            --state "$PARITY_STATE/${clabel}.json"; then
+            --state "$PARITY_STATE/${clabel}.state" --batch-size "$CORPUS_BATCH_SIZE" --processes "$CORPUS_PARITY_PROCESSES" \
+            $([[ -n "$cache_identity" ]] && echo "--cache-dir $CORPUS_BASELINE_CACHE_DIR --cache-identity $cache_identity") \
+            $([[ "$CORPUS_PARITY_DIGEST" == "true" ]] && echo "--digest") \
+            $([[ "$CORPUS_PARITY_TIMINGS" == "true" ]] && echo "--timings $OUT_DIR/corpus/${clabel}/${label}/timings.csv --warmup-seconds $WARMED_SECONDS") \
+            $([[ "$CORPUS_PARITY_ADAPTIVE" == "true" ]] && echo "--adaptive-concurrency"); then
           echo "::error::parity baseline capture failed for corpus ${clabel} on ${label}"
           parity_fail=$((parity_fail + 1))
         fi
@@ -400,8 +499,10 @@ for entry in $CLIENTS; do
         echo "-- PARITY ${clabel}: ${label} vs baseline ${BASELINE_LABEL} --"
         if python3 "$here/corpus_parity.py" compare \
             --corpus "$corpus" --rpc-url "http://localhost:8545" \
-            --state "$PARITY_STATE/${clabel}.json" --report "$report" \
-            --baseline-client "$BASELINE_LABEL" --candidate-client "$label" \
+            --state "$PARITY_STATE/${clabel}.state" --report "$report" \
+            --baseline-client "$BASELINE_LABEL" --candidate-client "$label" --batch-size "$CORPUS_BATCH_SIZE" --processes "$CORPUS_PARITY_PROCESSES" \
+            $([[ "$CORPUS_PARITY_ADAPTIVE" == "true" ]] && echo "--adaptive-concurrency") \
+            $([[ "$CORPUS_PARITY_TIMINGS" == "true" ]] && echo "--timings $report_dir/timings.csv --warmup-seconds $WARMED_SECONDS") \
             $([[ "$CORPUS_PARITY_DIFFS" == "true" ]] && echo "--diffs $report_dir/parity-diffs.json"); then
           PARITY_ROWS+=("${clabel}|${label}|$report")
         else
@@ -418,7 +519,7 @@ for entry in $CLIENTS; do
             --corpus "$corpus" --rpc-url "http://localhost:8545" \
             --out "$tdir/timings.csv" --passes "$CORPUS_TIMINGS_PASSES" \
             --rps "$CORPUS_TIMINGS_RPS" --concurrency "$CORPUS_TIMINGS_CONCURRENCY" \
-            --warmup-seconds "$WARMED_SECONDS"; then
+            --warmup-seconds "$WARMED_SECONDS" --batch-size "$CORPUS_BATCH_SIZE"; then
           echo "::warning::timings replay failed for ${label} on corpus ${clabel}"
           cell_fail=$((cell_fail + 1))
         fi
@@ -440,6 +541,17 @@ for entry in $CLIENTS; do
     echo "-- MIX ${label} @ rps=${rps} --"
     run_cell "$JB_BENCHMARK_CONFIG" "$rps" "$JB_DURATION" "$mcell" "$ctype" "$label" || { echo "::warning::mix ${label}/${rps} failed"; cell_fail=$((cell_fail + 1)); }
     [[ -f "$mcell/jsonbench-summary.md" ]] && SUMMARIES+=("mix|${label}|${rps}=$mcell/jsonbench-summary.md")
+    if [[ "$SWEEP_LEAVE_ONE_OUT" == "true" && -f "$mcell/jsonbench-summary.md" ]]; then
+      # Call names as the MIXED cell's per-method table reports them, normalized the way percat-matrix.py keys them.
+      for scen in $(awk -F'|' '/^### Per method/ {m=1; next} m && /^\|/ {gsub(/^ +| +$/, "", $2); if ($2 != "method" && $2 !~ /^-+$/) print $2}' \
+                      "$mcell/jsonbench-summary.md" | tr -c 'a-zA-Z0-9_\n-' '-'); do
+        lcell="$OUT_DIR/mix-loo/${label}/${rps}/${scen}"
+        echo "-- MIX without ${scen} ${label} @ rps=${rps} --"
+        JB_EXCLUDE_CALL="$scen" run_cell "$JB_BENCHMARK_CONFIG" "$rps" "$JB_DURATION" "$lcell" "$ctype" "$label" \
+          || { echo "::warning::leave-one-out ${label}/${rps}/${scen} failed"; cell_fail=$((cell_fail + 1)); }
+        [[ -f "$lcell/jsonbench-summary.md" ]] && SUMMARIES+=("loo|${label}|${rps}|${scen}=$lcell/jsonbench-summary.md")
+      done
+    fi
   done
   fi
 
@@ -488,6 +600,22 @@ for entry in $CLIENTS; do
   echo "::endgroup::"
 done
 
+# Noise is per runner type, so the arch is part of the key; the file holds numbers only, and stage()
+# validates it like every other aggregate before it can reach the artifact or the PR comment.
+if [[ "$JB_ETH_CALL_CORPUS" == "true" ]]; then
+  if [[ -n "$CORPUS_NOISE_CALIBRATION" ]]; then
+    if python3 "$here/corpus_results.py" noise "$OUT_DIR" --out "$OUT_DIR/noise.json" \
+        --arch "$(uname -m)" --head "$SNAPSHOT_BLOCK" --merge "$CORPUS_NOISE_FILE"; then
+      cp "$OUT_DIR/noise.json" "$CORPUS_NOISE_FILE.tmp" && mv "$CORPUS_NOISE_FILE.tmp" "$CORPUS_NOISE_FILE" \
+        || echo "::warning::could not refresh ${CORPUS_NOISE_FILE} — this run's noise.json is still in the artifact"
+    else
+      echo "::warning::noise calibration produced no noise.json"
+    fi
+  elif [[ -f "$CORPUS_NOISE_FILE" ]]; then
+    cp "$CORPUS_NOISE_FILE" "$OUT_DIR/noise.json"
+  fi
+fi
+
 sink="${GITHUB_STEP_SUMMARY:-/dev/stdout}"
 {
   echo "# Cross-client sweep — same head ${SNAPSHOT_BLOCK}"
@@ -497,7 +625,8 @@ sink="${GITHUB_STEP_SUMMARY:-/dev/stdout}"
 } >> "$sink"
 if [[ "${#SUMMARIES[@]}" -gt 0 ]]; then
   printf '%s\n' "${SUMMARIES[@]}" > "$OUT_DIR/summaries.manifest"  # via file — 100+ cells exceed ARG_MAX
-  python3 "$here/percat-matrix.py" "@$OUT_DIR/summaries.manifest" >> "$sink" || echo "aggregation failed" >> "$sink"
+  python3 "$here/percat-matrix.py" "@$OUT_DIR/summaries.manifest" --target-p99-ms="$CAPACITY_TARGET_P99_MS" \
+    --curves="$OUT_DIR/capacity-curves.csv" >> "$sink" || echo "aggregation failed" >> "$sink"
 elif [[ -z "${RPS_LIST// /}" ]]; then
   # Documented mode: an empty rps_list requests no k6 cells at all (parity/timings only), so
   # having no summaries is the expected outcome, not a failed sweep. Keep going so the parity
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
+# SPDX-License-Identifier: LGPL-3.0-only
+
+import contextlib
+import io
+import json
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import corpus_history  # noqa: E402
+import corpus_results  # noqa: E402
+
+
+def staged_summary(avg, med, p99):
+    return corpus_results.sanitize_data({"metrics": {
+        "http_req_duration": {"values": {"avg": avg, "med": med, "p(90)": p99 / 2, "p(95)": p99 / 1.5,
+                                         "p(99)": p99, "max": p99 * 3}},
+        "http_reqs": {"values": {"count": 12000, "rate": 100.0}},
+        "http_req_failed": {"values": {"rate": 0.0}}}})
+
+
+class CorpusHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.db = str(self.dir / "history.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def stage_run(self, run, avg, med, p99):
+        root = Path(tempfile.mkdtemp(dir=self.dir))
+        cell = root / "corpus" / "corpus-a" / "nethermind" / "100"
+        cell.mkdir(parents=True)
+        (cell / "summary.json").write_text(json.dumps(staged_summary(avg, med, p99)), encoding="utf-8")
+        (cell / "resources.json").write_text(json.dumps({"cpu_ms_per_request": 1.5, "stall_io_usec": None}),
+                                             encoding="utf-8")
+        (root / "corpus" / "corpus-a" / "nethermind" / "parity.json").write_text(
+            json.dumps({"total": 497, "matched": 495, "both_rpc_errors": 1}), encoding="utf-8")
+        # Another client's cells in the same tree must not be filed under this label.
+        other = root / "corpus" / "corpus-a" / "nethermind_master" / "100"
+        other.mkdir(parents=True)
+        (other / "summary.json").write_text(json.dumps(staged_summary(99.0, 99.0, 99.0)), encoding="utf-8")
+        return root
+
+    def ingest(self, run, avg, med, p99):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return corpus_history.ingest(str(self.stage_run(run, avg, med, p99)), self.db, "nethermind",
+                                         self.commit(run), "nethermindeth/nethermind:master", 24000000,
+                                         "x86_64", f"2026-09-{run + 1:02d}T00:00:00Z")
+
+    @staticmethod
+    def commit(run):
+        return f"{run + 1:02x}" + "c" * 38
+
+    def test_report_finds_a_step_and_a_slow_drift_but_not_noise(self):
+        noise = random.Random(3)
+        for run in range(24):
+            jitter = lambda: 1 + noise.gauss(0, 0.002)  # noqa: E731
+            self.ingest(run, avg=10.0 * 1.005 ** run * jitter(), med=8.0 * jitter(),
+                        p99=40.0 * (1.05 if run >= 12 else 1.0) * jitter())
+        findings = {f["metric"]: f for f in corpus_history.analyse(self.db, label="nethermind", slot="100")}
+        self.assertEqual(len(findings["p99"]["change_points"]), 1)
+        step = findings["p99"]["change_points"][0]
+        self.assertEqual(step["commit"], self.commit(12))
+        self.assertAlmostEqual(step["change_pct"], 5.0, delta=0.5)
+        self.assertFalse(findings["p99"]["drifting"])
+        self.assertTrue(findings["avg"]["drifting"])
+        self.assertAlmostEqual(findings["avg"]["drift_pct_per_run"], 0.5, delta=0.1)
+        self.assertEqual((findings["median"]["change_points"], findings["median"]["drifting"]), ([], False))
+        body = corpus_history.report(corpus_history.analyse(self.db, label="nethermind"))
+        self.assertIn(f"+5.", body)
+        self.assertIn("%/run over 24 runs", body)
+        self.assertNotIn("| median |", body)
+
+    def test_ingest_files_only_the_label_and_a_rerun_replaces_itself(self):
+        first = self.ingest(0, 10.0, 8.0, 40.0)
+        self.assertEqual(first, self.ingest(0, 11.0, 8.0, 40.0))
+        out = io.StringIO()
+        corpus_history.query(self.db, out, metric="avg")
+        rows = out.getvalue().splitlines()
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(rows[1].endswith(",100,x86_64,avg,11.0"))
+        out = io.StringIO()
+        corpus_history.query(self.db, out, slot=corpus_history.PARITY_SLOT)
+        self.assertIn("diverged,1.0", out.getvalue())
+        out = io.StringIO()
+        corpus_history.query(self.db, out, metric="cpu_ms_per_request")
+        self.assertEqual(len(out.getvalue().splitlines()), 2)  # the null PSI counter is skipped
+
+    def test_a_pr_head_files_into_its_own_series_not_master(self):
+        for run in range(8):
+            self.ingest(run, 10.0, 8.0, 40.0)
+        # The same client built from the same commits as a PR's heads, much slower: kept apart in
+        # the store, not a step in the master series.
+        with contextlib.redirect_stdout(io.StringIO()):
+            for run in range(8, 12):
+                corpus_history.ingest(str(self.stage_run(run, 10.0, 8.0, 80.0)), self.db, "pr-1234",
+                                      self.commit(run - 4), "nethermindeth/nethermind:master", 24000000, "x86_64",
+                                      f"2026-09-{run + 1:02d}T00:00:00Z", client="nethermind")
+        out = io.StringIO()
+        corpus_history.query(self.db, out, metric="p99")
+        self.assertEqual(sum(self.commit(7) in row for row in out.getvalue().splitlines()), 2)
+        master = {f["metric"]: f for f in corpus_history.analyse(self.db, label="nethermind", slot="100")}
+        self.assertEqual((master["p99"]["runs"], master["p99"]["change_points"]), (8, []))
+        pr = {f["metric"]: f for f in corpus_history.analyse(self.db, label="pr-1234", slot="100")}
+        self.assertEqual((pr["p99"]["runs"], pr["p99"]["latest"]), (4, 80.0))
+
+    def test_cli_refuses_bad_keys_and_a_missing_store_without_content(self):
+        root = self.stage_run(0, 10.0, 8.0, 40.0)
+        with contextlib.redirect_stderr(io.StringIO()) as err:
+            self.assertEqual(corpus_history.main(
+                ["ingest", str(root), "--db", self.db, "--label", "nethermind", "--commit", "not-a-sha",
+                 "--image", "img", "--head", "1", "--arch", "x86_64"]), 1)
+            self.assertEqual(corpus_history.main(["report", "--db", str(self.dir / "absent.sqlite")]), 1)
+        self.assertIn("commit is not a hex sha", err.getvalue())
+        self.assertIn("history store does not exist", err.getvalue())
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(corpus_history.main(
+                ["ingest", str(root), "--db", self.db, "--label", "nethermind", "--commit", "abcdef0",
+                 "--image", "nethermindeth/nethermind:master", "--head", "1", "--arch", "x86_64"]), 0)
+            self.assertEqual(corpus_history.main(["report", "--db", self.db]), 0)
+        self.assertIn("No change points", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
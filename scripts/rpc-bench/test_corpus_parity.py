@@ -2,12 +2,17 @@
 # SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
 # SPDX-License-Identifier: LGPL-3.0-only
 
+import asyncio
+import base64
 import contextlib
 import csv
 import gzip
+import hashlib
 import io
+import itertools
 import json
 import os
+import re
 import sys
 import tempfile
 import threading
@@ -19,23 +24,43 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 import corpus_parity  # noqa: E402
+import corpus_transport  # noqa: E402
 
 SENTINEL = "SENTINEL_PRIVATE_CALLDATA"
 
 
 class RpcServer:
     """Minimal JSON-RPC test double; responder(id) -> result hex | ('error',) | ('http', status)
-    | ('http_json_error', status) | bytes. Answers the node-identity calls itself."""
+    | ('http_json_error', status) | bytes. Answers the node-identity calls itself. A batch is
+    answered element by element, in reverse order, with ('http', ...) and bytes dropping the element;
+    each batch's size is recorded in .batches."""
 
     def __init__(self, responder, head=25_490_000, chain=1, block_hash=None):
         outer = self
         self.head, self.chain = head, chain
         # Distinct per head by default so a same-height/different-chain-segment case is expressible.
         self.block_hash = block_hash or ("0x" + f"{head:064x}")
+        self.batches = []
 
         class Handler(BaseHTTPRequestHandler):
             def do_POST(self):  # noqa: N802
                 request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if isinstance(request, list):
+                    outer.batches.append(len(request))
+                    answers = []
+                    for call in reversed(request):
+                        verdict = outer.responder(call["id"])
+                        if isinstance(verdict, tuple) and verdict[0] == "error":
+                            answers.append({"jsonrpc": "2.0", "id": call["id"],
+                                            "error": {"code": -32000, "message": SENTINEL}})
+                        elif isinstance(verdict, str):
+                            answers.append({"jsonrpc": "2.0", "id": call["id"], "result": verdict})
+                    body = json.dumps(answers).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
                 if request.get("method") in ("eth_blockNumber", "eth_chainId", "eth_getBlockByNumber"):
                     if request["method"] == "eth_getBlockByNumber":
                         result = {"number": hex(outer.head), "hash": outer.block_hash}
@@ -74,8 +99,12 @@ class RpcServer:
             def log_message(self, *args):  # noqa: A003
                 return
 
+        class Server(ThreadingHTTPServer):
+            # The default backlog of 5 drops connects from a wide replay and serializes it.
+            request_queue_size = 256
+
         self.responder = responder
-        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server = Server(("127.0.0.1", 0), Handler)
         self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
 
     @property
@@ -92,11 +121,86 @@ class RpcServer:
         self.server.server_close()
 
 
+class StreamRpcServer:
+    """JSON-RPC over a Unix socket (one JSON document per line) or a WebSocket: the node-identity
+    calls plus responder(id) -> result hex for everything else. Serves from its own loop thread."""
+
+    def __init__(self, responder, directory, transport="ipc", head=25_490_000, chain=1):
+        self.responder, self.transport, self.head, self.chain = responder, transport, head, chain
+        self.path = str(Path(directory) / "node.ipc")
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def answer(self, request):
+        method = request.get("method")
+        if method == "eth_getBlockByNumber":
+            result = {"number": hex(self.head), "hash": "0x" + f"{self.head:064x}"}
+        elif method in ("eth_blockNumber", "eth_chainId"):
+            result = hex(self.head if method == "eth_blockNumber" else self.chain)
+        else:
+            result = self.responder(request["id"])
+        return json.dumps({"jsonrpc": "2.0", "result": result, "id": request["id"]}).encode()
+
+    async def handle(self, reader, writer):
+        try:
+            if self.transport == "ipc":
+                while True:
+                    writer.write(self.answer(json.loads(await reader.readuntil(b"\n"))) + b"\n")
+                    await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            key = next(line.split(b":", 1)[1].strip() for line in head.split(b"\r\n")
+                       if line.lower().startswith(b"sec-websocket-key"))
+            accept = base64.b64encode(hashlib.sha1(key + corpus_transport.WS_GUID).digest())
+            writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+            while True:
+                _, second = await reader.readexactly(2)
+                length = second & 0x7F
+                if length > 125:
+                    length = int.from_bytes(await reader.readexactly(2 if length == 126 else 8), "big")
+                mask = await reader.readexactly(4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(length)))
+                reply = self.answer(json.loads(payload))
+                size = bytes((len(reply),)) if len(reply) < 126 else b"\x7e" + len(reply).to_bytes(2, "big")
+                writer.write(b"\x81" + size + reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @property
+    def url(self):
+        if self.transport == "ipc":
+            return "ipc://" + self.path
+        return f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+
+    def __enter__(self):
+        self.thread.start()
+        start = asyncio.start_unix_server(self.handle, self.path) if self.transport == "ipc" \
+            else asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.server = asyncio.run_coroutine_threadsafe(start, self.loop).result()
+        return self
+
+    def __exit__(self, *exc):
+        async def stop():
+            self.server.close()
+            handlers = asyncio.all_tasks() - {asyncio.current_task()}
+            for task in handlers:
+                task.cancel()
+            await asyncio.gather(*handlers, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
 class CorpusParityTests(unittest.TestCase):
     def setUp(self):
         self.tmp = tempfile.TemporaryDirectory()
         self.dir = Path(self.tmp.name)
-        self.state = self.dir / "state.json.gz"
+        self.state = self.dir / "state.bin"
         self.report = self.dir / "parity.json"
 
     def tearDown(self):
@@ -115,15 +219,15 @@ class CorpusParityTests(unittest.TestCase):
             path.write_text(text, encoding="utf-8")
         return path
 
-    def run_baseline(self, corpus, responder):
+    def run_baseline(self, corpus, responder, digest_only=False):
         with RpcServer(responder) as server, contextlib.redirect_stdout(io.StringIO()) as out:
-            corpus_parity.baseline(str(corpus), server.url, str(self.state))
+            corpus_parity.baseline(str(corpus), server.url, str(self.state), digest_only)
         return out.getvalue()
 
-    def run_compare(self, corpus, responder):
+    def run_compare(self, corpus, responder, **options):
         with RpcServer(responder) as server, contextlib.redirect_stdout(io.StringIO()) as out:
             clean = corpus_parity.compare(str(corpus), server.url, str(self.state), str(self.report),
-                                          "base_client", "cand_client")
+                                          "base_client", "cand_client", **options)
         return clean, json.loads(self.report.read_text(encoding="utf-8")), out.getvalue()
 
     def test_concurrency_only_failures_are_retried_and_not_reported_as_defects(self):
@@ -157,6 +261,113 @@ class CorpusParityTests(unittest.TestCase):
         self.assertEqual(report["matched"], 30)
         self.assertEqual(report["candidate_transport_failures"], 0)
 
+    def test_replay_holds_many_requests_in_flight_on_one_event_loop(self):
+        """Concurrency is coroutines, not threads, so a wide setting is actually reached."""
+        corpus = self.write_corpus(64)
+        state = {"inflight": 0, "peak": 0}
+        guard = threading.Lock()
+
+        def slow(i):
+            with guard:
+                state["inflight"] += 1
+                state["peak"] = max(state["peak"], state["inflight"])
+            time.sleep(0.2)
+            with guard:
+                state["inflight"] -= 1
+            return "0x" + f"{i:04x}"
+
+        corpus_parity.REPLAY_CONCURRENCY = 64
+        try:
+            self.run_baseline(corpus, slow)
+        finally:
+            corpus_parity.REPLAY_CONCURRENCY = 16
+        self.assertGreater(state["peak"], 32)
+
+    def test_adaptive_limit_grows_while_healthy_and_halves_on_errors_or_queueing(self):
+        limit = corpus_parity._AimdLimit(16, 40)
+
+        async def window(elapsed, failed=False):
+            for _ in range(max(16, limit.limit)):
+                await limit.acquire()
+                await limit.release(elapsed, failed)
+
+        async def drive():
+            for _ in range(4):
+                await window(0.01)
+            grown = limit.limit
+            await window(0.01, failed=True)
+            after_errors = limit.limit
+            await window(0.05)
+            return grown, after_errors, limit.limit
+
+        grown, after_errors, after_queueing = asyncio.run(drive())
+        self.assertEqual(grown, 40)  # 16 -> 24 -> 32 -> 40, then held at the ceiling
+        self.assertEqual(after_errors, 20)
+        self.assertEqual(after_queueing, 10)
+
+    def test_adaptive_replay_backs_off_an_overloaded_node_and_reports_where_it_settled(self):
+        """A node that fails above a concurrency threshold still yields a clean parity run."""
+        corpus = self.write_corpus(300)
+        corpus_parity.REPLAY_CONCURRENCY = 16
+        self.run_baseline(corpus, lambda i: "0x" + f"{i:04x}")
+        state = {"inflight": 0, "flaked": 0}
+        guard = threading.Lock()
+
+        def overloaded(i):
+            with guard:
+                state["inflight"] += 1
+                overloaded_now = state["inflight"] > 4
+            try:
+                time.sleep(0.005)
+                if overloaded_now:
+                    with guard:
+                        state["flaked"] += 1
+                    return ("http", 503)
+                return "0x" + f"{i:04x}"
+            finally:
+                with guard:
+                    state["inflight"] -= 1
+
+        clean, report, out = self.run_compare(corpus, overloaded, adaptive=True,
+                                              timings_path=str(self.dir / "timings.csv"))
+        self.assertGreater(state["flaked"], 0, "test did not actually overload the node")
+        self.assertTrue(clean)
+        self.assertEqual(report["matched"], 300)
+        settled = re.search(r"adaptive concurrency settled at (\d+) in flight \(range (\d+)-(\d+)", out)
+        self.assertIsNotNone(settled)
+        self.assertLess(int(settled.group(1)), 16)
+        # The matrix is annotated with where the limit settled, not the 16 it started from.
+        meta = json.loads((self.dir / "timings.meta.json").read_text(encoding="utf-8"))
+        self.assertEqual((meta["adaptive_concurrency"], meta["concurrency"], meta["concurrency_min"],
+                          meta["concurrency_max"], meta["cells_skipped"]),
+                         (True, *map(int, settled.groups()), 0))
+
+    def test_adaptive_worker_processes_share_the_ceiling(self):
+        """Each worker process runs its own controller; together they stay under the one ceiling."""
+        corpus = self.write_corpus(120)
+        corpus_parity.REPLAY_CONCURRENCY = 16
+        self.run_baseline(corpus, lambda i: "0x" + f"{i:04x}")
+        state = {"inflight": 0, "peak": 0}
+        guard = threading.Lock()
+
+        def slow(i):
+            with guard:
+                state["inflight"] += 1
+                state["peak"] = max(state["peak"], state["inflight"])
+            try:
+                time.sleep(0.01)
+                return "0x" + f"{i:04x}"
+            finally:
+                with guard:
+                    state["inflight"] -= 1
+
+        with unittest.mock.patch.object(corpus_parity, "ADAPTIVE_MAX_CONCURRENCY", 6):
+            clean, report, _ = self.run_compare(corpus, slow, adaptive=True, processes=2)
+        self.assertTrue(clean)
+        self.assertEqual(report["matched"], 120)
+        self.assertGreater(state["peak"], 1)
+        self.assertLessEqual(state["peak"], 6)
+
     def test_reproducible_divergence_survives_the_retry(self):
         """The retry must not mask a client that is genuinely wrong."""
         corpus = self.write_corpus(30)
@@ -245,6 +456,21 @@ class CorpusParityTests(unittest.TestCase):
         self.assertNotIn(SENTINEL, out.getvalue())
         self.assertIn("3 records x 4 passes = 12 requests", out.getvalue())
 
+    def test_timings_stream_histograms_per_outcome_and_can_skip_the_matrix(self):
+        corpus = self.write_corpus(4)
+        out_csv = self.dir / "timings.csv"
+        with RpcServer(lambda i: ("error",) if i == 2 else "0x00") as server, \
+                contextlib.redirect_stdout(io.StringIO()) as out:
+            corpus_parity.main(["timings", "--corpus", str(corpus), "--rpc-url", server.url,
+                                "--out", str(out_csv), "--passes", "3", "--histogram-only"])
+        self.assertFalse(out_csv.exists())
+        data = json.loads((self.dir / "timings.hist.json").read_text(encoding="utf-8"))
+        self.assertEqual((data["unit"], data["sub_buckets"]), ("us", 64))
+        counts = {name: histogram["count"] for name, histogram in data["histograms"].items()}
+        self.assertEqual(counts, {"all": 12, "ok": 9, "rpc_error:-32000": 3})
+        self.assertIn("latency p50", out.getvalue())
+        self.assertNotIn(SENTINEL, json.dumps(data) + out.getvalue())
+
     def test_timings_records_failures_per_record_and_warns(self):
         """A load-shedding node must be visible in the matrix, not just in a stdout aggregate."""
         corpus = self.write_corpus(4)
@@ -257,6 +483,25 @@ class CorpusParityTests(unittest.TestCase):
         self.assertIn("ok", statuses)
         self.assertIn("did not return a result", out.getvalue())
 
+    def test_timings_in_batches_amortizes_per_call_and_records_each_batch(self):
+        corpus = self.write_corpus(5)
+        out_csv = self.dir / "timings.csv"
+        with RpcServer(lambda i: "0x00") as server, contextlib.redirect_stdout(io.StringIO()):
+            corpus_parity.timings(str(corpus), server.url, str(out_csv),
+                                  passes=2, rps=0.0, concurrency=2, batch_size=2)
+        self.assertEqual(sorted(server.batches), [1, 1, 2, 2, 2, 2])
+        rows = list(csv.reader(out_csv.read_text(encoding="utf-8").splitlines()))
+        batch_rows = list(csv.reader((self.dir / "timings-batches.csv").read_text(encoding="utf-8").splitlines()))
+        self.assertEqual(batch_rows[0], ["pass", "first_record_index", "calls", "batch_ms", "failures"])
+        self.assertEqual([row[:3] for row in batch_rows[1:]],
+                         [["1", "1", "2"], ["1", "3", "2"], ["1", "5", "1"],
+                          ["2", "1", "2"], ["2", "3", "2"], ["2", "5", "1"]])
+        # Both calls of a batch carry half its latency.
+        self.assertAlmostEqual(float(rows[1][1]) * 2, float(batch_rows[1][3]), places=2)
+        self.assertEqual(rows[1][1], rows[2][1])
+        meta = json.loads((self.dir / "timings.meta.json").read_text(encoding="utf-8"))
+        self.assertEqual((meta["batch_size"], meta["requests"], meta["outcomes"]), (2, 10, {"ok": 10}))
+
     def test_timings_paces_to_the_requested_rate(self):
         corpus = self.write_corpus(5)
         out_csv = self.dir / "timings.csv"
@@ -269,6 +514,123 @@ class CorpusParityTests(unittest.TestCase):
         self.assertGreater(elapsed, 0.4)
         self.assertIn("target 40", out.getvalue())
 
+    def test_paced_timings_charge_queueing_behind_a_slow_call_to_the_queued_request(self):
+        corpus = self.write_corpus(3)
+        out_csv = self.dir / "timings.csv"
+        with RpcServer(lambda i: time.sleep(0.4) or "0x00" if i == 1 else "0x00") as server, \
+                contextlib.redirect_stdout(io.StringIO()) as out:
+            corpus_parity.timings(str(corpus), server.url, str(out_csv), passes=1, rps=20.0, concurrency=1)
+        rows = list(csv.reader(out_csv.read_text(encoding="utf-8").splitlines()))
+        # Record 2 was due at 50 ms but its only slot was held until ~400 ms: a closed-loop
+        # measurement would report it as fast; from its scheduled start it waited ~350 ms.
+        self.assertGreater(float(rows[2][1]), 300.0)
+        meta = json.loads((self.dir / "timings.meta.json").read_text(encoding="utf-8"))
+        self.assertEqual(meta["latency_origin"], "scheduled")
+        self.assertGreater(meta["dispatch_lag_ms"]["max"], 300.0)
+        # The slot was taken, so the node — not the generator — set the pace.
+        self.assertEqual(meta["generator_bound_seconds"], 0)
+        self.assertIn("dispatch lag vs schedule", out.getvalue())
+
+    def test_paced_timings_flag_intervals_where_the_generator_fell_behind(self):
+        corpus = self.write_corpus(3)
+        out_csv = self.dir / "timings.csv"
+        with RpcServer(lambda i: "0x00") as server, contextlib.redirect_stdout(io.StringIO()) as out, \
+                unittest.mock.patch.object(corpus_parity, "GENERATOR_LAG_SECONDS", -1.0):
+            corpus_parity.timings(str(corpus), server.url, str(out_csv), passes=1, rps=50.0, concurrency=4)
+        meta = json.loads((self.dir / "timings.meta.json").read_text(encoding="utf-8"))
+        self.assertEqual(meta["generator_bound_seconds"], 1)
+        self.assertIn("the client, not the node, fell behind", out.getvalue())
+
+    def test_saturate_ramps_until_the_node_falls_behind_and_reports_capacity(self):
+        """One slot on a node that takes 20 ms per call keeps up with 20 rps but not with 80."""
+        corpus = self.write_corpus(8)
+        out = self.dir / "saturation.json"
+
+        def slow(i):
+            time.sleep(0.02)
+            return "0x00"
+
+        with RpcServer(slow) as server, contextlib.redirect_stdout(io.StringIO()) as printed:
+            corpus_parity.main(["saturate", "--corpus", str(corpus), "--rpc-url", server.url,
+                                "--out", str(out), "--slo-p99-ms", "1000", "--start-rps", "10",
+                                "--growth", "2", "--step-seconds", "0.5", "--concurrency", "1"])
+        report = json.loads(out.read_text(encoding="utf-8"))
+        self.assertEqual((report["head"], report["chain_id"], report["records"], report["batch_size"]),
+                         (25_490_000, 1, 8, 1))
+        self.assertEqual(report["latency_origin"], "scheduled")
+        [level] = report["levels"]
+        self.assertEqual(level["stopped_by"], "rate")
+        self.assertIn(level["max_sustainable_rps"], (20, 40))
+        self.assertEqual(report["max_sustainable_rps"], level["max_sustainable_rps"])
+        self.assertEqual([step["target_rps"] for step in level["steps"]][:2], [10, 20])
+        self.assertEqual(level["steps"][0]["requests"], 5)
+        self.assertEqual(level["steps"][-1]["limit"], "rate")
+        self.assertIsNotNone(level["knee_rps"])
+        self.assertIn("capacity:", printed.getvalue())
+        self.assertNotIn(SENTINEL, out.read_text(encoding="utf-8") + printed.getvalue())
+
+    def test_saturate_stops_at_the_slo_or_the_rate_cap_per_concurrency_level(self):
+        corpus = self.write_corpus(4)
+        out = self.dir / "saturation.json"
+
+        def slow(i):
+            time.sleep(0.03)
+            return "0x00"
+
+        with RpcServer(slow) as server, contextlib.redirect_stdout(io.StringIO()):
+            report = corpus_parity.saturate(str(corpus), server.url, str(out), slo_p99_ms=5.0,
+                                            start_rps=10, max_rps=20, growth=2, step_seconds=0.3,
+                                            concurrency_levels=(4,))
+        self.assertEqual(report["levels"][0]["stopped_by"], "slo")
+        self.assertIsNone(report["max_sustainable_rps"])
+        with RpcServer(lambda i: "0x00") as server, contextlib.redirect_stdout(io.StringIO()):
+            report = corpus_parity.saturate(str(corpus), server.url, str(out), slo_p99_ms=1000.0,
+                                            start_rps=10, max_rps=30, growth=2, step_seconds=0.3,
+                                            concurrency_levels=(1, 4))
+        for level in report["levels"]:
+            self.assertEqual(level["stopped_by"], "max_rps")
+            self.assertEqual([step["target_rps"] for step in level["steps"]], [10, 20, 30])
+            self.assertEqual(level["max_sustainable_rps"], 30)
+        with self.assertRaises(corpus_parity.CorpusParityError):
+            corpus_parity.saturate(str(corpus), "http://127.0.0.1:1", str(out), 10.0, 10, growth=1.0)
+
+    def test_warmup_stops_once_latency_converges_and_reports_the_seconds_applied(self):
+        corpus = self.write_corpus(4)
+        out = self.dir / "warmup.json"
+        calls = itertools.count()
+
+        def cold_then_warm(i):
+            call = next(calls)
+            if call < 10:
+                return ("http", 503)
+            if call < 40:
+                time.sleep(0.03)
+            return "0x00"
+
+        with RpcServer(cold_then_warm) as server, contextlib.redirect_stdout(io.StringIO()) as stdout:
+            report = corpus_parity.warmup(str(corpus), server.url, str(out), rps=100, max_seconds=20,
+                                          window_seconds=0.3, stable_windows=3, tolerance=3.0)
+        self.assertTrue(report["converged"])
+        self.assertGreater(report["windows"][0]["failures"], 0)
+        self.assertLess(report["warmup_seconds"], 20)
+        self.assertGreaterEqual(len(report["windows"]), 4)
+        self.assertEqual(json.loads(out.read_text(encoding="utf-8")), report)
+        self.assertIn("converged after", stdout.getvalue())
+        self.assertNotIn(SENTINEL, out.read_text(encoding="utf-8") + stdout.getvalue())
+
+        calls = itertools.count()
+
+        def never_settles(i):
+            time.sleep(0.002 * next(calls))
+            return "0x00"
+
+        with RpcServer(never_settles) as server, contextlib.redirect_stdout(io.StringIO()) as stdout:
+            report = corpus_parity.warmup(str(corpus), server.url, str(out), rps=50, max_seconds=1,
+                                          window_seconds=0.25, stable_windows=3, tolerance=0.5)
+        self.assertFalse(report["converged"])
+        self.assertGreaterEqual(report["warmup_seconds"], 1)
+        self.assertIn("did not converge", stdout.getvalue())
+
     def test_baseline_then_matching_compare_is_clean_and_content_free(self):
         corpus = self.write_corpus(3)
         stdout = self.run_baseline(corpus, lambda i: "0x" + "ab" * i)
@@ -283,9 +645,8 @@ class CorpusParityTests(unittest.TestCase):
         )
         for text in (stdout, compare_stdout, json.dumps(report)):
             self.assertNotIn(SENTINEL, text)
-        # The VM-local state holds response hex only — never request params.
-        with gzip.open(self.state, "rt", encoding="utf-8") as f:
-            self.assertNotIn(SENTINEL, f.read())
+        # The VM-local state holds response bytes only — never request params.
+        self.assertNotIn(SENTINEL.encode(), self.state.read_bytes())
 
     def test_compare_classifies_defects_without_leaking(self):
         cases = (
@@ -315,6 +676,31 @@ class CorpusParityTests(unittest.TestCase):
                 self.assertEqual(report["divergences"][0]["index"], 1)
                 self.assertNotIn(SENTINEL, json.dumps(report) + stdout)
 
+    def test_the_zero_parse_fast_path_classifies_exactly_like_the_full_parse(self):
+        fast = (b'{"jsonrpc":"2.0","id":1,"result":"0xABcd"}', b' { "result" : "0x" , "id" : 1 } ')
+        slow = (
+            b'{"id":1,"result":"0xab","error":{"code":3}}',     # an error wins over a result
+            b'{"id":1,"x":{"result":"0xab"},"result":""}',      # nested member, not the result
+            b'{"id":1,"result":"0xab","result":"0xcd"}',        # duplicate key: the last one counts
+            b'{"id":2,"result":"0xab"}',
+            b'{"id":1,"result":"0xabc"}',
+            b'{"id":1,"result":"0xa\\u0062"}',                 # escaped hex digit
+            b'{"id":1,"result":"0xzz"}',
+            b'[{"id":1,"result":"0xab"}]',
+            b'{"id":1,"result":"0xab"',
+        )
+
+        def full_parse(body):
+            try:
+                return corpus_parity._classify_envelope(1, json.loads(body))
+            except ValueError:
+                return "invalid_response", b""
+
+        for body in fast + slow:
+            with self.subTest(body=body):
+                self.assertEqual(corpus_parity._fast_result(1, body) is not None, body in fast)
+                self.assertEqual(corpus_parity._classify(1, (200, body)), full_parse(body))
+
     def test_baseline_tolerates_rpc_errors_and_compare_scores_agreement(self):
         # Captured corpora legitimately contain calls that fail at the pinned head; a call
         # both clients reject counts as agreement, a one-sided rejection as divergence.
@@ -322,8 +708,7 @@ class CorpusParityTests(unittest.TestCase):
         stdout = self.run_baseline(corpus, lambda i: ("error",) if i == 2 else "0xab")
         self.assertIn("1 rpc_error", stdout)
         self.assertNotIn(SENTINEL, stdout)
-        with gzip.open(self.state, "rt", encoding="utf-8") as f:
-            self.assertNotIn(SENTINEL, f.read())
+        self.assertNotIn(SENTINEL.encode(), self.state.read_bytes())
 
         clean, report, _ = self.run_compare(corpus, lambda i: ("error",) if i == 2 else "0xab")
         self.assertTrue(clean)
@@ -334,6 +719,328 @@ class CorpusParityTests(unittest.TestCase):
         self.assertEqual(report["baseline_rpc_errors"], 1)
         self.assertEqual(report["matched"], 2)
 
+    def test_batched_baseline_and_compare_demultiplex_responses_by_id(self):
+        corpus = self.write_corpus(5)
+        with RpcServer(lambda i: ("error",) if i == 4 else "0x" + f"{i:02x}") as server, \
+                contextlib.redirect_stdout(io.StringIO()):
+            corpus_parity.baseline(str(corpus), server.url, str(self.state), batch_size=2)
+        self.assertEqual(sorted(server.batches), [1, 2, 2])
+        state = corpus_parity.BaselineState(self.state)
+        try:
+            self.assertEqual([state.result(p) for p in range(5)], [b"\x01", b"\x02", b"\x03", None, b"\x05"])
+        finally:
+            state.close()
+        # A call missing from the candidate's batch reply is retried as a batch of one, and a
+        # divergence that reproduces there is still reported against the right index.
+        dropped = set()
+
+        def candidate(i):
+            if i == 2 and i not in dropped:
+                dropped.add(i)
+                return b"dropped"
+            return ("error",) if i == 4 else "0x" + f"{(0xff if i == 3 else i):02x}"
+
+        clean, report, _ = self.run_compare(corpus, candidate, batch_size=2)
+        self.assertFalse(clean)
+        self.assertEqual((report["matched"], report["both_rpc_errors"], report["content_mismatches"]), (3, 1, 1))
+        self.assertEqual(report["divergences"], [{"index": 3, "kind": "content_mismatch"}])
+
+    def test_compare_fans_out_to_several_candidates_in_one_replay(self):
+        """Each candidate gets its own report, and the candidates are replayed at the same time."""
+        corpus = self.write_corpus(6)
+        self.run_baseline(corpus, lambda i: "0x" + f"{i:04x}")
+        state = {"inflight": 0, "peak": 0}
+        guard = threading.Lock()
+
+        def node(wrong):
+            def respond(i):
+                with guard:
+                    state["inflight"] += 1
+                    state["peak"] = max(state["peak"], state["inflight"])
+                time.sleep(0.05)
+                with guard:
+                    state["inflight"] -= 1
+                return "0xdead" if i in wrong else "0x" + f"{i:04x}"
+            return respond
+
+        corpus_parity.REPLAY_CONCURRENCY = 1
+        try:
+            with RpcServer(node(set())) as good, RpcServer(node({3})) as bad, \
+                    contextlib.redirect_stdout(io.StringIO()) as out:
+                code = corpus_parity.main([
+                    "compare", "--corpus", str(corpus), "--state", str(self.state), "--baseline-client", "base",
+                    "--rpc-url", good.url, "--candidate-client", "good", "--report", str(self.dir / "good.json"),
+                    "--rpc-url", bad.url, "--candidate-client", "bad", "--report", str(self.dir / "bad.json")])
+        finally:
+            corpus_parity.REPLAY_CONCURRENCY = 16
+        self.assertEqual(code, 1)
+        self.assertEqual(state["peak"], 2)  # one in flight per candidate, both at once
+        good_report = json.loads((self.dir / "good.json").read_text(encoding="utf-8"))
+        bad_report = json.loads((self.dir / "bad.json").read_text(encoding="utf-8"))
+        self.assertEqual((good_report["candidate_client"], good_report["matched"]), ("good", 6))
+        self.assertEqual((bad_report["candidate_client"], bad_report["matched"]), ("bad", 5))
+        self.assertEqual(bad_report["divergences"], [{"index": 3, "kind": "content_mismatch"}])
+        self.assertIn("parity good vs base: 6/6 matched", out.getvalue())
+        self.assertNotIn(SENTINEL, out.getvalue())
+        self.assertEqual(list(self.dir.glob("*.journal")), [])
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            code = corpus_parity.main([
+                "compare", "--corpus", str(corpus), "--state", str(self.state), "--baseline-client", "base",
+                "--rpc-url", "http://127.0.0.1:1", "--rpc-url", "http://127.0.0.1:2",
+                "--candidate-client", "a", "--report", str(self.dir / "a.json")])
+        self.assertEqual(code, 2)
+
+    def test_sharded_replays_split_the_corpus_across_identical_nodes(self):
+        corpus = self.write_corpus(6)
+        answer = lambda i: "0x" + f"{i:04x}"  # noqa: E731
+        seen = {"a": set(), "b": set()}
+
+        def node(name):
+            return lambda i: seen[name].add(i) or answer(i)
+
+        with RpcServer(node("a")) as a, RpcServer(node("b")) as b, contextlib.redirect_stdout(io.StringIO()) as out:
+            corpus_parity.baseline(str(corpus), f"{a.url},{b.url}", str(self.state))
+            # Contiguous halves, in endpoint order (id 1 doubles as web3_clientVersion).
+            self.assertEqual((seen["a"] - {1}, seen["b"] - {1}), ({2, 3}, {4, 5, 6}))
+            seen["a"].clear()
+            seen["b"].clear()
+            clean = corpus_parity.compare(str(corpus), f"{b.url},{a.url}", str(self.state), str(self.report),
+                                          "base_client", "cand_client")
+            self.assertEqual((seen["b"] - {1}, seen["a"] - {1}), ({2, 3}, {4, 5, 6}))
+        self.assertTrue(clean)
+        self.assertIn("baseline shard 2/2", out.getvalue())
+        state = corpus_parity.BaselineState(self.state)
+        try:
+            self.assertEqual([state.result(p) for p in range(6)], [bytes((0, i)) for i in range(1, 7)])
+        finally:
+            state.close()
+        self.assertEqual(json.loads(self.report.read_text(encoding="utf-8"))["matched"], 6)
+
+        with RpcServer(answer) as a, RpcServer(answer, head=25_490_001) as moved, \
+                self.assertRaisesRegex(corpus_parity.CorpusParityError, "different node identities"):
+            corpus_parity.baseline(str(corpus), f"{a.url},{moved.url}", str(self.dir / "other.state"))
+
+    def test_process_pool_replays_match_the_in_process_replay(self):
+        corpus = self.write_corpus(7)
+        answer = lambda i: ("error",) if i == 3 else "0x" + f"{i:04x}"  # noqa: E731
+        with RpcServer(answer) as node, contextlib.redirect_stdout(io.StringIO()):
+            corpus_parity.baseline(str(corpus), node.url, str(self.dir / "single.state"))
+            corpus_parity.baseline(str(corpus), node.url, str(self.state), processes=3)
+            # Entries land in completion order, so compare what each position holds.
+            states = [corpus_parity.BaselineState(self.dir / "single.state"), corpus_parity.BaselineState(self.state)]
+            try:
+                single, pooled = ([state.result(p) for p in range(7)] for state in states)
+                self.assertEqual(pooled, single)
+                self.assertIsNone(pooled[2])
+            finally:
+                for state in states:
+                    state.close()
+            clean = corpus_parity.compare(str(corpus), node.url, str(self.state), str(self.report),
+                                          "base_client", "cand_client", processes=2)
+        self.assertTrue(clean)
+        report = json.loads(self.report.read_text(encoding="utf-8"))
+        self.assertEqual((report["matched"], report["both_rpc_errors"]), (6, 1))
+
+        divergent = lambda i: "0xdead" if i == 6 else answer(i)  # noqa: E731
+        with RpcServer(divergent) as node, contextlib.redirect_stdout(io.StringIO()):
+            clean = corpus_parity.compare(str(corpus), node.url, str(self.state), str(self.dir / "other.json"),
+                                          "base_client", "cand_client", processes=2)
+        self.assertFalse(clean)
+        report = json.loads((self.dir / "other.json").read_text(encoding="utf-8"))
+        self.assertEqual([d["index"] for d in report["divergences"]], [6])
+
+    def test_parity_replays_write_a_timings_matrix_of_their_own_exchanges(self):
+        corpus = self.write_corpus(5)
+        answer = lambda i: ("error",) if i == 3 else "0x" + f"{i:04x}"  # noqa: E731
+        with RpcServer(answer) as node, contextlib.redirect_stdout(io.StringIO()) as out:
+            corpus_parity.baseline(str(corpus), node.url, str(self.state),
+                                   timings_path=str(self.dir / "base" / "timings.csv"), warmup_seconds=30)
+            clean = corpus_parity.compare(str(corpus), node.url, str(self.state), str(self.report),
+                                          "base_client", "cand_client", processes=2, adaptive=True,
+                                          timings_path=str(self.dir / "cand" / "timings.csv"))
+        self.assertTrue(clean)
+        self.assertIn("baseline: timed 5/5 records", out.getvalue())
+        for replay, warmup in (("base", 30), ("cand", 0)):
+            with self.subTest(replay=replay):
+                directory = self.dir / replay
+                self.assertTrue((directory / "timings.hist.json").exists())
+                with (directory / "timings.csv").open(encoding="utf-8", newline="") as handle:
+                    rows = list(csv.reader(handle))
+                self.assertEqual(rows[0], ["record_index", "pass_1_ms", "pass_1_status"])
+                self.assertEqual([row[2] for row in rows[1:]], ["ok", "ok", "rpc_error:-32000", "ok", "ok"])
+                meta = json.loads((directory / "timings.meta.json").read_text(encoding="utf-8"))
+                self.assertEqual(
+                    (meta["replay"], meta["passes"], meta["requests"], meta["latency_origin"], meta["warmup_seconds"]),
+                    ("baseline" if replay == "base" else "compare", 1, 5, "sent", warmup))
+                self.assertEqual(meta["outcomes"], {"ok": 4, "rpc_error:-32000": 1})
+                self.assertEqual((meta["adaptive_concurrency"], meta["cells_skipped"]), (replay == "cand", 0))
+                # Each worker process ran its own controller; the meta sums them for the endpoint.
+                self.assertEqual("concurrency_max" in meta, replay == "cand")
+
+    def test_parity_and_timings_run_over_ipc_and_websocket(self):
+        corpus = self.write_corpus(4)
+        out_csv = self.dir / "timings.csv"
+        for transport in ("ipc", "ws"):
+            with self.subTest(transport=transport), \
+                    StreamRpcServer(lambda i: "0x" + f"{i:04x}", self.dir, transport) as node, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                corpus_parity.baseline(str(corpus), node.url, str(self.state))
+                clean = corpus_parity.compare(str(corpus), node.url, str(self.state), str(self.report),
+                                              "base_client", "cand_client")
+                corpus_parity.timings(str(corpus), node.url, str(out_csv), passes=2, rps=0.0, concurrency=4)
+                self.assertTrue(clean)
+                self.assertEqual(json.loads(self.report.read_text(encoding="utf-8"))["matched"], 4)
+                meta = json.loads((self.dir / "timings.meta.json").read_text(encoding="utf-8"))
+                self.assertEqual((meta["transport"], meta["outcomes"]), (transport, {"ok": 8}))
+                self.state.unlink()
+
+    def test_baseline_state_is_raw_bytes_with_an_error_flag_and_the_node_identity(self):
+        corpus = self.write_corpus(3)
+        self.run_baseline(corpus, lambda i: ("error",) if i == 2 else "0xABcd" + f"{i:02x}")
+        state = corpus_parity.BaselineState(self.state)
+        try:
+            self.assertEqual((state.head, state.chain_id, state.total), (25_490_000, 1, 3))
+            self.assertEqual(state.block_hash, "0x" + f"{25_490_000:064x}")
+            self.assertEqual(state.result(0), b"\xab\xcd\x01")
+            self.assertIsNone(state.result(1))
+            self.assertEqual(state.result(2), b"\xab\xcd\x03")
+        finally:
+            state.close()
+        self.assertFalse(self.state.with_name(self.state.name + ".partial").exists())
+
+    def test_digest_state_is_small_and_classifies_without_the_result_bytes(self):
+        corpus = self.write_corpus(1)
+        self.run_baseline(corpus, lambda i: "0x" + "ab" * 4096, digest_only=True)
+        self.assertLess(self.state.stat().st_size, 256)
+        with self.assertRaises(corpus_parity.CorpusParityError):
+            corpus_parity.BaselineState(self.state).result(0)
+        cases = (
+            (lambda i: "0x" + "ab" * 4096, "matched"),
+            (lambda i: "0x" + "ab" * 4095 + "ff", "content_mismatches"),
+            (lambda i: "0x" + "ab" * 4097, "baseline_shorter"),
+            # Without the bytes a strict-prefix candidate is only known to differ in length.
+            (lambda i: "0x" + "ab" * 4095, "length_mismatches"),
+        )
+        for responder, field in cases:
+            with self.subTest(field=field):
+                clean, report, _ = self.run_compare(corpus, responder)
+                self.assertEqual(clean, field == "matched")
+                self.assertEqual(report[field], 1, report)
+
+    def test_digest_state_diffs_come_from_the_baseline_node_or_not_at_all(self):
+        corpus = self.write_corpus(1)
+        diffs = self.dir / "diffs.json"
+        self.run_baseline(corpus, lambda i: "0x" + "00" * 31 + "01", digest_only=True)
+        candidate = lambda i: "0x" + "00" * 31 + "02"  # noqa: E731
+        _, report, stdout = self.run_compare(corpus, candidate, diffs_path=str(diffs))
+        self.assertEqual(report["content_mismatches"], 1)
+        self.assertIn("not characterised", stdout)
+        self.assertFalse(diffs.exists())
+
+        with RpcServer(lambda i: "0x" + "00" * 31 + "01") as baseline_node:
+            self.run_compare(corpus, candidate, diffs_path=str(diffs), baseline_rpc_url=baseline_node.url)
+        document = json.loads(diffs.read_text(encoding="utf-8"))
+        self.assertEqual([record["index"] for record in document["diffs"]], [1])
+        self.assertEqual(document["diffs"][0]["differing_words"], [{"word": 0, "direction": "higher"}])
+        self.assertNotIn(SENTINEL, diffs.read_text(encoding="utf-8"))
+
+    def test_an_interrupted_baseline_resumes_from_its_partial_state(self):
+        corpus = self.write_corpus(5)
+        with self.assertRaises(corpus_parity.CorpusParityError):
+            self.run_baseline(corpus, lambda i: ("http", 503) if i == 3 else "0x" + f"{i:02x}")
+        self.assertFalse(self.state.exists())
+        self.assertTrue(self.state.with_name(self.state.name + ".partial").exists())
+
+        asked = []
+        stdout = self.run_baseline(corpus, lambda i: asked.append(i) or "0x" + f"{i:02x}")
+        # id 1 is also the test double's answer to web3_clientVersion.
+        self.assertEqual(sorted(set(asked) - {1}), [3])
+        self.assertIn("resuming, 4/5", stdout)
+        state = corpus_parity.BaselineState(self.state)
+        try:
+            self.assertEqual([state.result(p) for p in range(5)], [bytes((i,)) for i in range(1, 6)])
+        finally:
+            state.close()
+
+    def test_a_repeat_baseline_reads_results_from_the_cross_run_cache(self):
+        corpus = self.write_corpus(lines=[
+            json.dumps({"method": "eth_call", "params": [{"to": "0x1", "data": f"0x{i:02x}"}, "latest"]})
+            for i in range(5)])
+        cache = self.dir / "cache"
+        answer = lambda i: ("error",) if i == 2 else "0x" + f"{i:02x}"  # noqa: E731
+
+        def capture(state, responder, identity="image-a", **options):
+            asked = []
+            with RpcServer(lambda i: asked.append(i) or responder(i)) as server, \
+                    contextlib.redirect_stdout(io.StringIO()) as out:
+                corpus_parity.baseline(str(corpus), server.url, str(state), cache_dir=str(cache),
+                                       cache_identity=identity, **options)
+            return asked, out.getvalue()
+
+        capture(self.dir / "first.state", answer)
+        asked, out = capture(self.dir / "second.state", answer, timings_path=str(self.dir / "timings.csv"))
+        # Only the errored record replays (id 1 is also the double's web3_clientVersion answer).
+        self.assertEqual(sorted(set(asked)), [1, 2])
+        self.assertIn("4/5 records from the result cache", out)
+        # The cached records were never exchanged; the meta says so rather than claim a full pass.
+        meta = json.loads((self.dir / "timings.meta.json").read_text(encoding="utf-8"))
+        self.assertEqual((meta["requests"], meta["cells_skipped"]), (1, 4))
+        first = corpus_parity.BaselineState(self.dir / "first.state")
+        second = corpus_parity.BaselineState(self.dir / "second.state")
+        try:
+            for position in range(5):
+                self.assertEqual(first.rejected(position), second.rejected(position))
+                if not first.rejected(position):
+                    self.assertEqual(first.result(position), second.result(position))
+        finally:
+            first.close()
+            second.close()
+
+        asked, out = capture(self.dir / "third.state", answer, identity="image-b")
+        self.assertEqual(sorted(set(asked)), [1, 2, 3, 4, 5])
+        self.assertNotIn("from the result cache", out)
+        self.assertEqual(len(list(cache.glob("*.cache"))), 2)
+
+    def test_the_baseline_cache_is_evicted_by_age_then_size(self):
+        cache = self.dir / "cache"
+        cache.mkdir()
+        stale, old, recent = (cache / f"{name}.cache" for name in ("stale", "old", "recent"))
+        for path, age_days in ((stale, 40), (old, 2), (recent, 1)):
+            path.write_bytes(b"x" * 100)
+            moment = time.time() - age_days * 86400
+            os.utime(path, (moment, moment))
+        with unittest.mock.patch.object(corpus_parity, "CACHE_MAX_BYTES", 150):
+            corpus_parity._evict_cache(cache, keep=old)
+        self.assertEqual(sorted(path.name for path in cache.iterdir()), ["old.cache"])
+
+    def test_an_interrupted_compare_resumes_from_its_journal(self):
+        corpus = self.write_corpus(4)
+        self.run_baseline(corpus, lambda i: "0xab")
+        candidate = lambda i: ("error",) if i == 2 else "0xab"  # noqa: E731
+        with unittest.mock.patch.object(corpus_parity, "_rerun", side_effect=KeyboardInterrupt), \
+                self.assertRaises(KeyboardInterrupt):
+            self.run_compare(corpus, candidate)
+        journals = list(self.dir.glob("state.bin.*.journal"))
+        self.assertEqual(len(journals), 1)
+        self.assertNotIn(SENTINEL.encode(), journals[0].read_bytes())
+
+        asked = []
+        clean, report, stdout = self.run_compare(corpus, lambda i: asked.append(i) or candidate(i))
+        self.assertIn("resuming, 4/4", stdout)
+        self.assertEqual(sorted(set(asked) - {1}), [2])  # only the serial re-verification
+        self.assertFalse(clean)
+        self.assertEqual((report["matched"], report["candidate_rpc_errors"]), (3, 1))
+        self.assertEqual(list(self.dir.glob("*.journal")), [])
+
+    def test_a_truncated_state_file_is_refused(self):
+        corpus = self.write_corpus(3)
+        self.run_baseline(corpus, lambda i: "0xab")
+        self.state.write_bytes(self.state.read_bytes()[:40])
+        with self.assertRaises(corpus_parity.CorpusParityError) as caught:
+            self.run_compare(corpus, lambda i: "0xab")
+        self.assertIn("missing or unreadable", str(caught.exception))
+
     def test_baseline_still_aborts_on_transport_failures_with_counts_only_error(self):
         corpus = self.write_corpus(3)
         with RpcServer(lambda i: ("http", 503) if i == 2 else "0xab") as server:
@@ -379,9 +1086,50 @@ class CorpusParityTests(unittest.TestCase):
         with self.assertRaises(corpus_parity.CorpusParityError):
             self.run_compare(bigger, lambda i: "0xab")
         with self.assertRaises(corpus_parity.CorpusParityError):
-            corpus_parity.compare(str(corpus), "http://127.0.0.1:1", str(self.dir / "missing.gz"),
+            corpus_parity.compare(str(corpus), "http://127.0.0.1:1", str(self.dir / "missing.bin"),
                                   str(self.report), "b", "c")
 
+    def test_corpus_index_is_cached_beside_the_corpus_and_reused(self):
+        corpus = self.write_corpus(3)
+        with corpus_parity.load_corpus(corpus) as records:
+            self.assertEqual(len(records), 3)
+            self.assertEqual(records.params(2), [{"to": "0x1", "data": SENTINEL}, "latest"])
+        index = self.dir / ".corpus.jsonl.gz.cache" / "records.idx"
+        built = index.stat().st_mtime_ns
+        with unittest.mock.patch.object(corpus_parity, "_build_index") as rebuild:
+            with corpus_parity.load_corpus(corpus) as records:
+                self.assertEqual(len(records), 3)
+        rebuild.assert_not_called()
+        self.assertEqual(index.stat().st_mtime_ns, built)
+
+    def test_compiled_bodies_are_sent_as_is_without_reserializing(self):
+        corpus = self.write_corpus(3, lines=[json.dumps({"method": "eth_call", "extra": 1,
+                                                         "params": [{"to": "0x1", "data": SENTINEL}, "0x10"]})] * 3)
+        with corpus_parity.load_corpus(corpus) as records:
+            with records.body(1) as body:
+                envelope = json.loads(bytes(body) + b"7}")
+        self.assertEqual(envelope, {"jsonrpc": "2.0", "method": "eth_call", "id": 7,
+                                    "params": [{"to": "0x1", "data": SENTINEL}, "0x10"]})
+        self.run_baseline(corpus, lambda i: "0xab")
+        with unittest.mock.patch.object(corpus_parity, "_compile", side_effect=AssertionError):
+            clean, report, _ = self.run_compare(corpus, lambda i: "0xab")
+        self.assertTrue(clean)
+        self.assertEqual(report["matched"], 3)
+
+    def test_a_changed_corpus_invalidates_its_index(self):
+        corpus = self.write_corpus(3)
+        corpus_parity.load_corpus(corpus).close()
+        corpus = self.write_corpus(5)
+        with corpus_parity.load_corpus(corpus) as records:
+            self.assertEqual(len(records), 5)
+
+    def test_a_corrupt_corpus_leaves_no_partial_cache(self):
+        truncated = self.dir / "trunc.jsonl.gz"
+        truncated.write_bytes(self.write_corpus(200).read_bytes()[:200])
+        with self.assertRaises(corpus_parity.CorpusParityError):
+            corpus_parity.load_corpus(truncated)
+        self.assertEqual(list((self.dir / ".trunc.jsonl.gz.cache").iterdir()), [])
+
     def test_load_corpus_accepts_plain_jsonl_and_rejects_bad_records(self):
         plain = self.write_corpus(2, gz=False)
         self.assertEqual(len(corpus_parity.load_corpus(plain)), 2)
@@ -5,6 +5,7 @@
 import contextlib
 import io
 import json
+import random
 import sys
 import tempfile
 import unittest
@@ -155,19 +156,74 @@ class CorpusResultsTests(unittest.TestCase):
         with self.assertRaises(corpus_results.CorpusResultsError):
             corpus_results._validate_timings_meta(path2)
 
+    def test_timings_batches_and_batch_size_meta_stage_as_numbers_only(self):
+        meta = {"head": 100, "chain_id": 1, "block_hash": "0x" + "ab" * 32, "records": 3,
+                "passes": 1, "requests": 3, "target_rps": 0, "achieved_rps": 9.5,
+                "concurrency": 4, "warmup_seconds": 0, "outcomes": {"ok": 3}, "batch_size": 2,
+                "transport": "ipc"}
+        corpus_results._validate_timings_meta(self.write_json(self.dir / "timings.meta.json", meta))
+        with self.assertRaises(corpus_results.CorpusResultsError):
+            corpus_results._validate_timings_meta(
+                self.write_json(self.dir / "bad" / "timings.meta.json", {**meta, "transport": SENTINEL}))
+        corpus_results._validate_timings_meta(self.write_json(
+            self.dir / "replay" / "timings.meta.json", {**meta, "replay": "compare", "adaptive_concurrency": True,
+                                                        "concurrency_min": 2, "concurrency_max": 24,
+                                                        "cells_skipped": 1}))
+        for bad in ({"replay": SENTINEL}, {"adaptive_concurrency": "yes"}, {"cells_skipped": -1},
+                    {"concurrency_max": 2.5}):
+            with self.assertRaises(corpus_results.CorpusResultsError):
+                corpus_results._validate_timings_meta(
+                    self.write_json(self.dir / "bad" / "timings.meta.json", {**meta, **bad}))
+        path = self.dir / "timings-batches.csv"
+        path.write_text("pass,first_record_index,calls,batch_ms,failures\n1,1,2,3.5,0\n1,3,1,1.25,1\n",
+                        encoding="utf-8")
+        corpus_results._validate_timings_batches(path)
+        for bad in ("pass,first_record_index,calls,batch_ms,failures\n1,1,2,3.5,SENTINEL\n",
+                    "pass,first_record_index,calls,batch_ms,note\n1,1,2,3.5,0\n"):
+            path.write_text(bad, encoding="utf-8")
+            with self.assertRaises(corpus_results.CorpusResultsError):
+                corpus_results._validate_timings_batches(path)
+
+    def test_timings_histograms_stage_and_merge_into_percentiles(self):
+        out_root = self.dir / "out"
+        for corpus, values in (("a", (1.0, 2.0)), ("b", (100.0, 200.0))):
+            ok = corpus_results.LatencyHistogram()
+            for value in values:
+                ok.record(value)
+            self.write_json(out_root / "corpus" / corpus / "nm" / "timings.hist.json",
+                            {"unit": "us", "sub_buckets": 64, "histograms": {"all": ok.to_json(), "ok": ok.to_json()}})
+        stage_root = self.dir / "stage-hist"
+        corpus_results.stage(str(out_root), str(stage_root))
+        table = corpus_results.percentiles(str(stage_root))
+        self.assertIn("| nm | a | 2 |", table)
+        # Merged over all four requests, p99 is the 200 ms one — not an average of corpus p99s.
+        merged_row = next(line for line in table.splitlines() if "all corpora" in line)
+        self.assertIn("| 4 |", merged_row)
+        self.assertAlmostEqual(float(merged_row.split("|")[6].split()[0]), 200.0, delta=2.5)
+
+        bad = self.write_json(out_root / "corpus" / "c" / "nm" / "timings.hist.json",
+                              {"unit": "us", "sub_buckets": 64, "histograms": {"all": ok.to_json(), SENTINEL: ok.to_json()}})
+        with self.assertRaises(corpus_results.CorpusResultsError) as caught:
+            corpus_results.stage(str(out_root), str(self.dir / "stage-bad"))
+        self.assertNotIn(SENTINEL, str(caught.exception))
+        bad.unlink()
+
     def test_manifest_is_validated_and_relativized(self):
         """The staged manifest must not leak runner-absolute paths, and garbage must not stage."""
         out_root = self.dir / "out"
         sanitized = corpus_results.sanitize_data(raw_summary())
         self.write_json(out_root / "corpus" / "a" / "nm" / "100" / "summary.json", sanitized)
         cell = out_root / "corpus" / "a" / "nm" / "100"
+        loo = out_root / "mix-loo" / "nm" / "100" / "eth_getLogs"
         (out_root / "summaries.manifest").write_text(
-            f"iso|a|nm|100={cell / 'jsonbench-summary.md'}\n", encoding="utf-8")
+            f"iso|a|nm|100={cell / 'jsonbench-summary.md'}\n"
+            f"loo|nm|100|eth_getLogs={loo / 'jsonbench-summary.md'}\n", encoding="utf-8")
 
         stage_root = self.dir / "stage-manifest"
         corpus_results.stage(str(out_root), str(stage_root))
         staged = (stage_root / "summaries.manifest").read_text(encoding="utf-8")
-        self.assertEqual(staged, "iso|a|nm|100=corpus/a/nm/100/jsonbench-summary.md\n")
+        self.assertEqual(staged, "iso|a|nm|100=corpus/a/nm/100/jsonbench-summary.md\n"
+                                 "loo|nm|100|eth_getLogs=mix-loo/nm/100/eth_getLogs/jsonbench-summary.md\n")
         self.assertNotIn(str(out_root), staged)
 
         (out_root / "summaries.manifest").write_text(
@@ -176,7 +232,8 @@ class CorpusResultsTests(unittest.TestCase):
         # whole artifact over an index nothing downstream reads would discard a multi-hour sweep.
         for tag, bad in (("escape", "iso|a|nm|100=/etc/passwd"),
                          ("shapeless", "not a manifest line"),
-                         ("arity", "iso|a|b|c|d|e=x/jsonbench-summary.md")):
+                         ("arity", "iso|a|b|c|d|e=x/jsonbench-summary.md"),
+                         ("loo arity", "loo|nm|100=x/jsonbench-summary.md")):
             (out_root / "summaries.manifest").write_text(bad + "\n", encoding="utf-8")
             stage2 = self.dir / f"stage-manifest-{tag}"
             corpus_results.stage(str(out_root), str(stage2))
@@ -199,6 +256,41 @@ class CorpusResultsTests(unittest.TestCase):
                 with self.assertRaises(corpus_results.CorpusResultsError):
                     corpus_results.stage(str(out_root), str(self.dir / "stage2"))
 
+    def test_noise_pairs_repeats_of_one_image_and_refreshes_by_key(self):
+        out_root = self.dir / "out"
+        for label, avg in (("nethermind_abc", 10.0), ("nethermind_abc_r2", 10.4), ("nethermind_abc_r3", 9.8),
+                           ("nethermind_other", 50.0)):
+            summary = corpus_results.sanitize_data(raw_summary(http_req_duration={"values": {
+                "avg": avg, "med": avg, "p(90)": 2.0, "p(95)": 3.0, "p(99)": 4.0, "max": 5.0}}))
+            self.write_json(out_root / "corpus" / "corpus-a" / label / "100" / "summary.json", summary)
+        previous = self.write_json(self.dir / "previous.json", {"unit": "percent", "noise": {
+            "corpus-a": {"100": {"aarch64": {"head": 1, "repeats": 2, "pairs": 1, "metrics": {}},
+                                 "x86_64": {"head": 1, "repeats": 2, "pairs": 1, "metrics": {}}}}}})
+        target = out_root / "noise.json"
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(corpus_results.main(["noise", str(out_root), "--out", str(target), "--arch", "x86_64",
+                                                  "--head", "24000000", "--merge", str(previous)]), 0)
+        calibration = json.loads(target.read_text(encoding="utf-8"))["noise"]["corpus-a"]["100"]
+        entry = calibration["x86_64"]
+        self.assertEqual((entry["head"], entry["repeats"], entry["pairs"]), (24000000, 3, 3))
+        # pairs in run order: +4%, -2% and 10.4 -> 9.8, the widest
+        self.assertEqual(entry["metrics"]["avg"]["max_abs_pct"], 5.769)
+        self.assertEqual(entry["metrics"]["p99"]["max_abs_pct"], 0.0)
+        self.assertEqual(calibration["aarch64"]["head"], 1)  # not re-measured, so kept
+        corpus_results.stage(str(out_root), str(self.dir / "stage"))
+        self.assertTrue((self.dir / "stage" / "noise.json").is_file())
+
+        entry["note"] = SENTINEL
+        target.write_text(json.dumps({"unit": "percent", "noise": {"corpus-a": {"100": {"x86_64": entry}}}}),
+                          encoding="utf-8")
+        with self.assertRaises(corpus_results.CorpusResultsError):
+            corpus_results.stage(str(out_root), str(self.dir / "stage2"))
+        single = self.dir / "single"
+        self.write_json(single / "corpus" / "corpus-a" / "nethermind" / "100" / "summary.json",
+                        corpus_results.sanitize_data(raw_summary()))
+        with self.assertRaises(corpus_results.CorpusResultsError):
+            corpus_results.measure_noise(str(single), "x86_64", 1)
+
     def test_stage_fails_on_empty_tree(self):
         out_root = self.dir / "empty"
         out_root.mkdir()
@@ -266,6 +358,33 @@ class CommentRenderingTests(unittest.TestCase):
         self.assertIn("| avg | 20.00 ms | 19.00 ms |", body)
         self.assertIn("| avg | 21.00 ms | 20.00 ms |", body)
 
+    def test_staged_timings_histograms_add_a_replay_latency_line(self):
+        self._cell("nethermind_master", 20.0, 100.0)
+        self._cell("nethermind", 20.0, 100.0)
+        for label, value in (("nethermind_master", 10.0), ("nethermind", 5.0)):
+            ok = corpus_results.LatencyHistogram()
+            ok.record(value)
+            (self.root / "corpus" / "corpus-a" / label / "timings.hist.json").write_text(json.dumps(
+                {"unit": "us", "sub_buckets": 64, "histograms": {"all": ok.to_json(), "ok": ok.to_json()}}),
+                encoding="utf-8")
+        body = corpus_results.comment(str(self.root), "nethermind_master", "nethermind")
+        self.assertIn("Per-record replay latency (ok calls) — p50 10.0", body)
+
+    def test_staged_noise_calibration_sets_the_band_per_slot_and_arch(self):
+        self._cell("nethermind_master", 20.0, 100.0)
+        self._cell("nethermind", 21.0, 103.0)        # avg +5%, p99 +3%
+        (self.root / "noise.json").write_text(json.dumps({"unit": "percent", "noise": {"corpus-a": {"100": {
+            "x86_64": {"head": 7, "repeats": 3, "pairs": 3, "metrics": {
+                "avg": {"mean_pct": 1.0, "stdev_pct": 2.0, "max_abs_pct": 6.0},
+                "p99": {"mean_pct": 0.0, "stdev_pct": 0.5, "max_abs_pct": 2.0}}}}}}}), encoding="utf-8")
+        body = corpus_results.comment(str(self.root), "nethermind_master", "nethermind", arch="x86_64")
+        self.assertIn("| avg | 20.00 ms | 21.00 ms | ⚪ +5.0% | ±6.0% |", body)
+        self.assertIn("| p99 | 100.00 ms | 103.00 ms | 🔴 +3.0% | ±2.0% |", body)
+        self.assertIn("3 repeats of one image (3 pairs) on x86_64 at head 7", body)
+        other = corpus_results.comment(str(self.root), "nethermind_master", "nethermind", arch="aarch64")
+        self.assertIn("| avg | 20.00 ms | 21.00 ms | 🔴 +5.0% | ±1.0% |", other)
+        self.assertIn("no A/A calibration for this corpus, rate and aarch64", other)
+
     def test_missing_client_does_not_crash(self):
         self._cell("nethermind_master", 20.0, 100.0)
         body = corpus_results.comment(str(self.root), "nethermind_master", "nethermind")
@@ -291,6 +410,84 @@ class CommentRenderingTests(unittest.TestCase):
         self.assertIn("output root does not exist", err.getvalue())
 
 
+
+class PairedComparisonTests(unittest.TestCase):
+    META = {"head": 100, "chain_id": 1, "block_hash": "0x" + "ab" * 32, "records": 600, "passes": 2,
+            "requests": 1200, "target_rps": 0, "achieved_rps": 90.0, "concurrency": 4,
+            "warmup_seconds": 240, "outcomes": {"ok": 1200}}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        rng = random.Random(7)
+        # Records differ by two orders of magnitude, as real eth_calls do; passes differ by ~2%.
+        self.latencies = [rng.lognormvariate(1.0, 1.0) for _ in range(self.META["records"])]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def matrix(self, name, factor=1.0, slow=(), meta=None, seed=0):
+        rng = random.Random(seed)
+        directory = self.dir / name
+        directory.mkdir()
+        lines = ["record_index,pass_1_ms,pass_1_status,pass_2_ms,pass_2_status"]
+        for index, latency in enumerate(self.latencies, start=1):
+            value = latency * factor * (1.5 if index in slow else 1.0)
+            cells = [f"{value * rng.uniform(0.98, 1.02):.3f},ok" for _ in range(2)]
+            lines.append(f"{index}," + ",".join(cells))
+        lines[3] = "3,,transport_failure,1.000,ok"  # record 3 has one failed pass; its ok one still pairs
+        (directory / "timings.csv").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        (directory / "timings.meta.json").write_text(json.dumps({**self.META, **(meta or {})}), encoding="utf-8")
+        return str(directory / "timings.csv")
+
+    def test_a_small_uniform_slowdown_is_significant_and_slow_records_are_listed(self):
+        result = corpus_results.paired_compare(self.matrix("master"), self.matrix("pr", 1.02, {11, 42}, seed=1),
+                                               resamples=300)
+        self.assertEqual(result["paired_records"], 600)
+        per_record = result["statistics"][0]
+        self.assertEqual((per_record["statistic"], per_record["verdict"]), ("per_record", "slower"))
+        self.assertGreater(per_record["ci_low"], 1.0)
+        self.assertEqual(result["regressed_indexes"], [42, 11])
+        body = corpus_results.render_paired(result)
+        self.assertIn("| per-record (geometric mean) |", body)
+        self.assertIn("Regressed records: 2", body)
+
+    def test_noise_alone_is_not_significant(self):
+        result = corpus_results.paired_compare(self.matrix("master"), self.matrix("rerun", seed=1), resamples=300)
+        self.assertEqual({row["verdict"] for row in result["statistics"][:2]}, {"no significant change"})
+        self.assertEqual(result["regressed_records"], 0)
+
+    def test_mismatched_metas_are_refused(self):
+        for name, meta in (("rate", {"target_rps": 50}), ("head", {"head": 101}), ("cold", {"warmup_seconds": 0}),
+                           ("origin", {"latency_origin": "scheduled"})):
+            with self.subTest(name=name), self.assertRaisesRegex(corpus_results.CorpusResultsError, "not comparable"):
+                corpus_results.paired_compare(self.matrix(f"master-{name}"), self.matrix(name, meta=meta))
+        # master's parity timings come from `baseline --timings`, a PR's from `compare --timings`.
+        result = corpus_results.paired_compare(self.matrix("from-baseline", meta={"replay": "baseline"}),
+                                               self.matrix("from-compare", meta={"replay": "compare"}, seed=1),
+                                               resamples=10)
+        self.assertEqual(result["paired_records"], 600)
+        with self.assertRaisesRegex(corpus_results.CorpusResultsError, "differ in replay"):
+            corpus_results.paired_compare(self.matrix("timings-run"), self.matrix("replayed", meta={"replay": "compare"}))
+        # Adaptive replays settle wherever their own node lets them, so only their flag must agree.
+        adaptive = {"adaptive_concurrency": True, "replay": "compare"}
+        corpus_results.paired_compare(self.matrix("adaptive-a", meta={**adaptive, "concurrency": 24}),
+                                      self.matrix("adaptive-b", meta={**adaptive, "concurrency": 40}), resamples=10)
+        with self.assertRaisesRegex(corpus_results.CorpusResultsError, "adaptive_concurrency"):
+            corpus_results.paired_compare(self.matrix("fixed", meta={"replay": "compare"}),
+                                          self.matrix("adaptive-c", meta={**adaptive, "concurrency": 4}))
+
+    def test_paired_cli_prints_the_table_and_writes_json(self):
+        out = self.dir / "paired.json"
+        argv = ["paired", "--baseline", self.matrix("master"), "--candidate", self.matrix("pr", seed=1),
+                "--resamples", "50", "--json", str(out)]
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            self.assertEqual(corpus_results.main(argv), 0)
+        self.assertIn("| statistic | master | PR | delta | interval | verdict |", stdout.getvalue())
+        self.assertEqual(json.loads(out.read_text(encoding="utf-8"))["resamples"], 50)
+
+
+
 if __name__ == "__main__":
     unittest.main()
 
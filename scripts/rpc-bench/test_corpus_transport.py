@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
+# SPDX-License-Identifier: LGPL-3.0-only
+
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import corpus_transport  # noqa: E402
+
+
+class RawHttpServer:
+    """HTTP/1.1 server that answers every request on a connection with a scripted raw response,
+    counting connections so keep-alive reuse is observable."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.connections = 0
+        self.server = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = next(int(line.split(b":", 1)[1]) for line in head.split(b"\r\n")
+                              if line.lower().startswith(b"content-length"))
+                body = await reader.readexactly(length)
+                writer.write(self.respond(body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+
+
+def fixed_length(body):
+    return b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+
+
+def chunked(body):
+    half = len(body) // 2
+    return (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"%x\r\n%s\r\n%x\r\n%s\r\n0\r\n\r\n" % (half, body[:half], len(body) - half, body[half:]))
+
+
+class HttpPoolTests(unittest.TestCase):
+    def exchange(self, respond, bodies, max_response_bytes=1024):
+        async def run():
+            async with RawHttpServer(respond) as server:
+                pool = corpus_transport.HttpPool(server.url, max_response_bytes, 5)
+                try:
+                    results = [await pool.fetch(*body) if isinstance(body, tuple) else await pool.fetch(body)
+                               for body in bodies]
+                finally:
+                    await pool.close()
+                return results, server.connections
+
+        return asyncio.run(run())
+
+    def test_keep_alive_reuses_one_connection(self):
+        results, connections = self.exchange(fixed_length, [b"a", b"bb", b"ccc"])
+        self.assertEqual(results, [(200, b"a"), (200, b"bb"), (200, b"ccc")])
+        self.assertEqual(connections, 1)
+
+    def test_body_parts_are_sent_as_one_request(self):
+        results, _ = self.exchange(fixed_length, [(memoryview(b"xxab")[2:], b"cd")])
+        self.assertEqual(results, [(200, b"abcd")])
+
+    def test_chunked_bodies_are_reassembled(self):
+        results, connections = self.exchange(chunked, [b"abcdef", b"xyz"])
+        self.assertEqual(results, [(200, b"abcdef"), (200, b"xyz")])
+        self.assertEqual(connections, 1)
+
+    def test_oversized_body_is_truncated_to_cap_plus_one_and_not_reused(self):
+        for respond in (fixed_length, chunked):
+            with self.subTest(respond=respond.__name__):
+                results, connections = self.exchange(respond, [b"x" * 40, b"ok"], max_response_bytes=16)
+                self.assertEqual(results[0], (200, b"x" * 17))
+                self.assertEqual(results[1], (200, b"ok"))
+                self.assertEqual(connections, 2)
+
+    def test_a_garbled_peer_is_a_transport_failure_not_an_exception(self):
+        results, _ = self.exchange(lambda body: b"not http at all\r\n\r\n", [b"a"])
+        self.assertEqual(results, [None])
+
+    def test_non_http_urls_are_rejected(self):
+        with self.assertRaises(ValueError):
+            corpus_transport.HttpPool("ftp://127.0.0.1/", 16, 5)
+
+
+
+class RawIpcServer:
+    """Unix-socket server answering every line on a connection with respond(line) plus a newline."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.connections = 0
+        self.server = None
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmp.name) / "node.ipc")
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readuntil(b"\n")
+                writer.write(self.respond(line[:-1]) + b"\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_unix_server(self.handle, self.path)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+        self.tmp.cleanup()
+
+    @property
+    def url(self):
+        return "ipc://" + self.path
+
+
+class IpcPoolTests(unittest.TestCase):
+    def exchange(self, respond, bodies, max_response_bytes=1024):
+        async def run():
+            async with RawIpcServer(respond) as server:
+                pool = corpus_transport.open_pool(server.url, max_response_bytes, 5)
+                self.assertIsInstance(pool, corpus_transport.IpcPool)
+                try:
+                    results = [await pool.fetch(*body) for body in bodies]
+                finally:
+                    await pool.close()
+                return results, server.connections
+
+        return asyncio.run(run())
+
+    def test_lines_are_exchanged_over_one_reused_connection(self):
+        results, connections = self.exchange(lambda line: line.upper(), [(b"ab",), (memoryview(b"xcd")[1:], b"e")])
+        self.assertEqual(results, [(200, b"AB"), (200, b"CDE")])
+        self.assertEqual(connections, 1)
+
+    def test_oversized_reply_is_truncated_to_cap_plus_one_and_not_reused(self):
+        results, connections = self.exchange(lambda line: line * 40 if line == b"x" else line,
+                                             [(b"x",), (b"ok",)], max_response_bytes=16)
+        self.assertEqual(results[0], (200, b"x" * 17))
+        self.assertEqual(results[1], (200, b"ok"))
+        self.assertEqual(connections, 2)
+
+    def test_a_missing_socket_is_a_transport_failure(self):
+        async def run():
+            pool = corpus_transport.open_pool("ipc:///nonexistent/node.ipc", 16, 5)
+            return await pool.fetch(b"a")
+
+        self.assertIsNone(asyncio.run(run()))
+        with self.assertRaises(ValueError):
+            corpus_transport.open_pool("ipc://", 16, 5)
+
+
+
+class RawWsServer:
+    """WebSocket server that collects `hold` requests per connection, then answers them in reverse
+    order, each with respond(request); counts connections."""
+
+    def __init__(self, respond, hold=1):
+        self.respond, self.hold = respond, hold
+        self.connections = 0
+        self.server = None
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+            key = next(line.split(b":", 1)[1].strip() for line in head.split(b"\r\n")
+                       if line.lower().startswith(b"sec-websocket-key"))
+            accept = base64.b64encode(hashlib.sha1(key + corpus_transport.WS_GUID).digest())
+            writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                         b"Connection: Upgrade\r\nSec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+            held = []
+            while True:
+                first, second = await reader.readexactly(2)
+                length = second & 0x7F
+                if length == 126:
+                    length = struct.unpack(">H", await reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack(">Q", await reader.readexactly(8))[0]
+                mask = await reader.readexactly(4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(length)))
+                held.append(payload)
+                if len(held) == self.hold:
+                    for request in reversed(held):
+                        reply = self.respond(request)
+                        size = bytes((len(reply),)) if len(reply) < 126 else b"\x7e" + struct.pack(">H", len(reply))
+                        writer.write(b"\x81" + size + reply)
+                    held = []
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/"
+
+
+def echo_result(request):
+    call = json.loads(request)
+    return json.dumps({"jsonrpc": "2.0", "result": call["params"], "id": call["id"]}).encode()
+
+
+class WsPoolTests(unittest.TestCase):
+    def exchange(self, respond, count, hold, connections=1, max_response_bytes=1024):
+        async def run():
+            async with RawWsServer(respond, hold) as server:
+                pool = corpus_transport.open_pool(server.url, max_response_bytes, 5, connections)
+                self.assertIsInstance(pool, corpus_transport.WsPool)
+                try:
+                    results = await asyncio.gather(*(
+                        pool.fetch(b'{"jsonrpc":"2.0","method":"m","params":"p%d","id":' % i, b"%d}" % i, ids=(i,))
+                        for i in range(count)))
+                finally:
+                    await pool.close()
+                return results, server.connections
+
+        return asyncio.run(run())
+
+    def test_pipelined_replies_are_matched_by_id_whatever_their_order(self):
+        results, connections = self.exchange(echo_result, count=6, hold=3, connections=2)
+        self.assertEqual([json.loads(raw)["result"] for _, raw in results], [f"p{i}" for i in range(6)])
+        self.assertEqual(connections, 2)
+
+    def test_replies_not_ending_in_their_id_are_parsed_to_route_them(self):
+        def id_first(request):
+            call = json.loads(request)
+            return json.dumps({"id": call["id"], "jsonrpc": "2.0", "result": call["params"]}).encode()
+
+        results, _ = self.exchange(id_first, count=4, hold=4)
+        self.assertEqual([json.loads(raw)["result"] for _, raw in results], [f"p{i}" for i in range(4)])
+
+    def test_oversized_reply_is_truncated_to_cap_plus_one_and_still_routed(self):
+        def large(request):
+            call = json.loads(request)
+            return json.dumps({"jsonrpc": "2.0", "result": "x" * 200, "id": call["id"]}).encode()
+
+        results, _ = self.exchange(large, count=2, hold=2, max_response_bytes=64)
+        self.assertEqual([len(raw) for _, raw in results], [65, 65])
+
+    def test_client_frames_are_masked_with_a_fresh_key_each(self):
+        body = (b'{"jsonrpc":"2.0","id":', b"7}")
+        frames = [corpus_transport._ws_frame(corpus_transport.WS_TEXT, body) for _ in range(2)]
+        self.assertNotEqual(frames[0][2:6], frames[1][2:6])
+        for frame in frames:
+            self.assertEqual(frame[:2], bytes((0x81, 0x80 | len(b"".join(body)))))
+            self.assertEqual(bytes(b ^ frame[2 + i % 4] for i, b in enumerate(frame[6:])), b"".join(body))
+
+    def test_a_refused_upgrade_is_a_transport_failure(self):
+        async def run():
+            async with RawHttpServer(fixed_length) as server:
+                pool = corpus_transport.open_pool(server.url.replace("http", "ws"), 16, 5)
+                try:
+                    return await pool.fetch(b"{}", ids=(1,))
+                finally:
+                    await pool.close()
+
+        self.assertIsNone(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    unittest.main()
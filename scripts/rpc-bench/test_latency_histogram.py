@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
+# SPDX-License-Identifier: LGPL-3.0-only
+
+import json
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import latency_histogram  # noqa: E402
+from latency_histogram import LatencyHistogram  # noqa: E402
+
+
+class LatencyHistogramTests(unittest.TestCase):
+    def test_percentiles_are_within_bucket_precision_of_the_exact_value(self):
+        generator = random.Random(7)
+        samples = [generator.lognormvariate(1.5, 1.2) for _ in range(20_000)]
+        histogram = LatencyHistogram()
+        for sample in samples:
+            histogram.record(sample)
+        samples.sort()
+        for share in (0.5, 0.9, 0.99, 0.999):
+            exact = samples[int(share * len(samples)) - 1]
+            self.assertAlmostEqual(histogram.percentile(share) / exact, 1.0, delta=0.012)
+        self.assertEqual(histogram.total, 20_000)
+
+    def test_merging_equals_recording_everything_into_one(self):
+        left, right, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in (0.0005, 0.3, 1.0, 7.5, 120.0):
+            left.record(value)
+            both.record(value)
+        for value in (0.3, 2.0, 5000.0):
+            right.record(value)
+            both.record(value)
+        combined = latency_histogram.merged([left, right])
+        self.assertEqual((combined.counts, combined.total), (both.counts, both.total))
+        self.assertEqual(combined.percentile(0.0), 0.0)  # sub-microsecond bucket
+        self.assertGreater(combined.percentile(1.0), 4900.0)
+
+    def test_json_round_trips_and_rejects_anything_else(self):
+        histogram = LatencyHistogram()
+        for value in (1.0, 1.0, 30.0):
+            histogram.record(value)
+        again = LatencyHistogram.from_json(json.loads(json.dumps(histogram.to_json())))
+        self.assertEqual(again.counts, histogram.counts)
+        for bad in ({"count": 3, "buckets": [[1, 3]], "extra": 1},
+                    {"count": 4, "buckets": [[1, 3]]},
+                    {"count": 3, "buckets": [[1, "3"]]},
+                    {"count": 3, "buckets": [[1, 1], [1, 2]]},
+                    {"count": 0, "buckets": [[1, 0]]},
+                    [[1, 3]]):
+            with self.subTest(bad=bad), self.assertRaises(ValueError):
+                LatencyHistogram.from_json(bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
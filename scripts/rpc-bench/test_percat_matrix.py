@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: 2026 Demerzel Solutions Limited
+# SPDX-License-Identifier: LGPL-3.0-only
+
+import contextlib
+import csv
+import importlib.util
+import io
+import math
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPT_PATH = Path(__file__).with_name("percat-matrix.py")
+SPECIFICATION = importlib.util.spec_from_file_location("percat_matrix", SCRIPT_PATH)
+if SPECIFICATION is None or SPECIFICATION.loader is None:
+    raise RuntimeError(f"Unable to load {SCRIPT_PATH}")
+MATRIX = importlib.util.module_from_spec(SPECIFICATION)
+SPECIFICATION.loader.exec_module(MATRIX)
+
+LAM, SIG, KAP = 2000.0, 0.05, 0.002
+
+
+def usl_cell(n, p99_ratio=3.0):
+    """(throughput r/s, mean ms, p99 ms) of a node that follows the USL exactly at n requests in flight."""
+    throughput = LAM * n / (1 + SIG * (n - 1) + KAP * n * (n - 1))
+    mean_ms = n / throughput * 1000.0
+    return throughput, mean_ms, mean_ms * p99_ratio
+
+
+def summary_md(throughput, mean_ms, p99_ms, methods=()):
+    """A jsonbench-summary.md as run-jsonbench.sh writes it; methods are (name, avg, p90, p99) rows."""
+    text = (f"| latency avg (ms) | {mean_ms:.4f} |\n| latency p50 (ms) | {mean_ms:.4f} |\n"
+            f"| latency p90 (ms) | {p99_ms / 2:.4f} |\n| latency p99 (ms) | {p99_ms:.4f} |\n"
+            f"| throughput (req/s) | {throughput:.4f} |\n| checks passed | 100% |\n")
+    if methods:
+        text += ("\n### Per method (http_req_duration, ms)\n\n| method | avg | p50 | p90 | p95 | p99 | max |\n"
+                 "|---|---:|---:|---:|---:|---:|---:|\n")
+        text += "".join(f"| {name} | {avg} | {avg} | {p90} | {p90} | {p99} | {p99} |\n" for name, avg, p90, p99 in methods)
+    return text
+
+
+def run_matrix(args):
+    argv = sys.argv
+    sys.argv = ["percat-matrix.py", *args]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            MATRIX.main()
+    finally:
+        sys.argv = argv
+    return out.getvalue()
+
+
+class CapacityModelTests(unittest.TestCase):
+    def test_fit_recovers_the_coefficients_of_an_exact_usl_node(self):
+        fit = MATRIX.usl_fit([usl_cell(n) for n in (1, 4, 10, 20, 40)])
+        self.assertAlmostEqual(fit["lam"], LAM, delta=LAM * 1e-3)
+        self.assertAlmostEqual(fit["sig"], SIG, delta=1e-4)
+        self.assertAlmostEqual(fit["kap"], KAP, delta=1e-6)
+        peak_n = math.sqrt((1 - SIG) / KAP)
+        self.assertAlmostEqual(fit["peak_n"], peak_n, delta=0.05)
+        self.assertAlmostEqual(fit["peak_rps"], usl_cell(peak_n)[0], delta=1.0)
+        # knee: mean latency doubled over one request in flight
+        self.assertAlmostEqual(fit["knee_rps"] * MATRIX.usl_mean_ms(fit, fit["knee_n"]) / 1000.0, fit["knee_n"], delta=1e-6)
+        self.assertAlmostEqual(MATRIX.usl_mean_ms(fit, fit["knee_n"]), 2 * MATRIX.usl_mean_ms(fit, 1), delta=1e-6)
+        # capacity at a p99 target is the throughput where the modeled p99 meets it, capped at the peak
+        target = 3.0 * usl_cell(10)[1]
+        self.assertAlmostEqual(MATRIX.capacity_at(fit, target), usl_cell(10)[0], delta=1.0)
+        self.assertAlmostEqual(MATRIX.capacity_at(fit, 1e9), fit["peak_rps"], delta=1e-6)
+        self.assertEqual(MATRIX.capacity_at(fit, 0.01), 0.0)
+
+    def test_negative_costs_are_not_reported_and_too_few_cells_fit_nothing(self):
+        # Latency falling with load (a cache warming across cells) would fit negative contention.
+        fit = MATRIX.usl_fit([(100.0, 5.0, 10.0), (250.0, 4.8, 9.0), (500.0, 4.6, 9.5)])
+        self.assertGreaterEqual(fit["sig"], 0.0)
+        self.assertGreaterEqual(fit["kap"], 0.0)
+        self.assertEqual(fit["peak_rps"], math.inf)
+        self.assertIsNone(MATRIX.usl_fit([(100.0, 5.0, 10.0)]))
+
+    def test_report_prints_a_row_per_client_and_scenario_and_writes_curves(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            args = []
+            for n, rps in ((2, "100"), (10, "250"), (30, "500")):
+                cell = usl_cell(n)
+                mixed = root / f"mix-{rps}.md"
+                mixed.write_text(summary_md(*cell), encoding="utf-8")
+                isolated = root / f"iso-{rps}.md"
+                isolated.write_text(summary_md(cell[0] / 2, cell[1], cell[2]), encoding="utf-8")
+                args += [f"mix|nethermind|{rps}={mixed}", f"iso|eth_call|nethermind|{rps}={isolated}"]
+            curves = root / "curves.csv"
+            body = run_matrix(["--target-p99-ms=50", f"--curves={curves}", *args])
+            self.assertIn("capacity at p99 <= 50 ms", body)
+            self.assertIn("| nethermind | MIXED | all | 3 | 2000 | 0.0500 | 0.002000 |", body)
+            self.assertIn("| nethermind | ISOLATED | eth_call | 3 |", body)
+            with curves.open(encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 2 * MATRIX.CURVE_POINTS)
+            self.assertEqual({(r["mode"], r["scenario"]) for r in rows}, {("MIXED", "all"), ("ISOLATED", "eth_call")})
+
+    def test_a_client_that_keeps_up_at_every_rate_reports_its_limits_past_the_sweep(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            args = []
+            for rps in ("100", "250", "500"):
+                flat = root / f"mix-{rps}.md"
+                flat.write_text(summary_md(float(rps), 2.0, 6.0), encoding="utf-8")
+                args.append(f"mix|nethermind|{rps}={flat}")
+            fit = MATRIX.usl_fit([(float(rps), 2.0, 6.0) for rps in (100, 250, 500)])
+            self.assertEqual((fit["sig"], fit["kap"], MATRIX.capacity_at(fit, 100.0)), (0.0, 0.0, math.inf))
+            body = run_matrix(args)
+            self.assertIn("| 500 | 0.0000 | 0.000000 | " + " | ".join(["not reached within sweep (max 500 rps)"] * 3)
+                          + " |", body)
+            self.assertNotIn("inf", body.split("## Capacity model")[1])
+
+
+class InterferenceTests(unittest.TestCase):
+    def test_scenarios_rank_by_inflation_and_leave_one_out_names_the_driver(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+
+            def cell(name, text):
+                path = root / f"{name}.md"
+                path.write_text(text, encoding="utf-8")
+                return path
+
+            mixed = [("WETH balance eth_call", 4.0, 10, 40), ("eth_blockNumber", 1.0, 2, 3), ("eth_getLogs", 9.0, 20, 60)]
+            args = [
+                f"mix|nethermind|100={cell('mix', summary_md(100, 3, 50, mixed))}",
+                # config basenames: one matches its call exactly, one by suffix after a separator
+                f"iso|curated-WETH-balance-eth_call|nethermind|100={cell('iso-a', summary_md(100, 2.0, 10))}",
+                f"iso|eth_blockNumber|nethermind|100={cell('iso-b', summary_md(100, 1.0, 3))}",
+                # without eth_getLogs the eth_call p99 halves; without eth_blockNumber it barely moves
+                f"loo|nethermind|100|eth_getLogs="
+                f"{cell('loo-a', summary_md(100, 2, 20, [('WETH balance eth_call', 3.0, 8, 20), mixed[1]]))}",
+                f"loo|nethermind|100|eth_blockNumber="
+                f"{cell('loo-b', summary_md(100, 3, 50, [('WETH balance eth_call', 4.0, 10, 38), mixed[2]]))}",
+            ]
+            body = run_matrix(args).split("## Interference")[1]
+            rows = [line for line in body.splitlines() if line.startswith("| ") and "scenario" not in line]
+            self.assertTrue(rows[0].startswith("| curated-WETH-balance-eth_call | nethermind@100 | 10 -> 40 | 4.00 |"))
+            self.assertIn("| 50% | eth_getLogs +100%, eth_blockNumber +5% |", rows[0])
+            self.assertTrue(rows[1].startswith("| eth_blockNumber | nethermind@100 | 3 -> 3 | 1.00 |"))
+            self.assertEqual(MATRIX.match_call("other-scenario", {"eth_call": {}}), None)
+
+
+if __name__ == "__main__":
+    unittest.main()